@@ -0,0 +1,522 @@
+import base64
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+from urllib.parse import parse_qs, urlsplit
+
+
+RESPONSES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "responses")
+
+
+def load_responses(name: str) -> dict:
+    """Load the recorded responses of an upstream API, see the responses folder"""
+    with open(os.path.join(RESPONSES_DIR, f"{name}.json")) as file:
+        return json.load(file)
+
+
+def fake_hash(*parts) -> str:
+    """Deterministic 64 hex chars hash, the same parts always give the same hash"""
+    return hashlib.sha256(":".join(str(part) for part in parts).encode()).hexdigest()
+
+
+class RecordedBackend():
+    """
+    Replays the recorded responses of an upstream API. Blocks are generated from the
+    recorded block for any height up to the head, each one with TXS_PER_BLOCK copies
+    of the recorded transaction, so every chain can be explored as a real one
+    """
+
+    # Name of the recorded responses file
+    NAME : str = ""
+
+    # Seconds between two blocks, only used for the block timestamps
+    BLOCK_TIME : int = 10
+
+    #Can be overridden by the caller
+    HEAD : int = 1000000
+    TXS_PER_BLOCK : int = 20
+
+
+    def __init__(self, head: int = None, txs_per_block: int = None):
+        self.head = head or self.HEAD
+        self.txs_per_block = txs_per_block if txs_per_block is not None else self.TXS_PER_BLOCK
+        self.responses = load_responses(self.NAME)
+
+
+    def handle(self, method: str, path: str, query: dict, body: bytes) -> Tuple[int, object]:
+        """
+        Answer a request
+
+        Args:
+            method: the HTTP method
+            path: the request path, without the query string
+            query: the query string parameters, one value per parameter
+            body: the request body
+
+        Returns:
+            The HTTP status and the JSON payload
+        """
+        raise NotImplementedError
+
+
+    def not_found(self, path: str) -> Tuple[int, dict]:
+        return 404, { "error" : f"Not found: {path}" }
+
+
+    def parse_height(self, block_id: str) -> int:
+        """Height of a block id, None when it is not a known block"""
+        if block_id == "latest":
+            return self.head
+        if block_id.isdigit() and int(block_id) <= self.head:
+            return int(block_id)
+        return None
+
+
+    def timestamp(self, height: int) -> int:
+        return 1654041600 - (self.head - height) * self.BLOCK_TIME
+
+
+class EthBackend(RecordedBackend):
+    """Ethereum JSON-RPC (Infura), single and batch calls"""
+
+    NAME = "eth"
+    BLOCK_TIME = 12
+
+
+    def handle(self, method, path, query, body):
+        payload = json.loads(body)
+        if isinstance(payload, list):
+            return 200, [self.call(request) for request in payload]
+        return 200, self.call(payload)
+
+
+    def call(self, request: dict) -> dict:
+        method, params = request["method"], request.get("params", [])
+        result = None
+        if method == "eth_blockNumber":
+            result = hex(self.head)
+        elif method == "eth_chainId":
+            result = "0x1"
+        elif method in ("eth_getBlockByNumber", "eth_getBlockByHash"):
+            result = self.block(params[0], params[1])
+        elif method == "eth_getTransactionByHash":
+            result = self.transaction(params[0])
+        elif method == "eth_getBalance":
+            result = self.responses["balance"]
+        else:
+            return { "jsonrpc" : "2.0", "id" : request.get("id"),
+                     "error" : { "code" : -32601, "message" : f"the method {method} does not exist" } }
+        return { "jsonrpc" : "2.0", "id" : request.get("id"), "result" : result }
+
+
+    def block_hash(self, height: int) -> str:
+        return "0x" + fake_hash("eth", "block", height)
+
+
+    def block(self, block_id: str, full_transactions: bool) -> dict:
+        if block_id == "latest":
+            height = self.head
+        elif isinstance(block_id, str) and block_id.startswith("0x") and len(block_id) == 66:
+            height = next((height for height in range(self.head, -1, -1) if self.block_hash(height) == block_id), None)
+        else:
+            height = int(block_id, 16)
+        if height is None or height > self.head:
+            return None
+
+        block = copy.deepcopy(self.responses["block"])
+        block["number"] = hex(height)
+        block["hash"] = self.block_hash(height)
+        block["parentHash"] = self.block_hash(height - 1)
+        block["timestamp"] = hex(self.timestamp(height))
+        hashes = ["0x" + fake_hash("eth", "tx", height, index) for index in range(self.txs_per_block)]
+        block["transactions"] = [self.transaction(tx_hash, height, index) for index, tx_hash in enumerate(hashes)] \
+                                if full_transactions else hashes
+        return block
+
+
+    def transaction(self, tx_hash: str, height: int = None, index: int = 0) -> dict:
+        transaction = copy.deepcopy(self.responses["transaction"])
+        transaction["hash"] = tx_hash
+        if height is not None:
+            transaction["blockNumber"] = hex(height)
+            transaction["blockHash"] = self.block_hash(height)
+            transaction["transactionIndex"] = hex(index)
+        return transaction
+
+
+class BtcBackend(RecordedBackend):
+    """blockchain.info, the explorer of the cryptos Bitcoin backend"""
+
+    NAME = "btc"
+    BLOCK_TIME = 600
+    HEAD = 740000
+
+
+    def handle(self, method, path, query, body):
+        parts = path.strip("/").split("/")
+        if parts == ["latestblock"]:
+            latest = copy.deepcopy(self.responses["latestblock"])
+            latest.update(height = self.head, block_index = self.head, hash = self.block_hash(self.head))
+            return 200, latest
+        if len(parts) == 2 and parts[0] == "block-height" and self.parse_height(parts[1]) is not None:
+            return 200, { "blocks" : [self.block(int(parts[1]))] }
+        if len(parts) == 2 and parts[0] == "rawblock":
+            height = next((height for height in range(self.head, max(self.head - 1000, 0), -1) if self.block_hash(height) == parts[1]), None)
+            return (200, self.block(height)) if height is not None else self.not_found(path)
+        if len(parts) == 2 and parts[0] == "rawtx":
+            return 200, self.transaction(parts[1])
+        if len(parts) == 2 and parts[0] == "address":
+            address = copy.deepcopy(self.responses["address"])
+            address["address"] = parts[1]
+            return 200, address
+        return self.not_found(path)
+
+
+    def block_hash(self, height: int) -> str:
+        return "00000000" + fake_hash("btc", "block", height)[8:]
+
+
+    def block(self, height: int) -> dict:
+        block = copy.deepcopy(self.responses["block"])
+        block.update(height = height, block_index = height, time = self.timestamp(height),
+                     hash = self.block_hash(height), prev_block = self.block_hash(height - 1))
+        # The explorer returns the full transactions of the block
+        block["tx"] = [self.transaction(fake_hash("btc", "tx", height, index), height) for index in range(self.txs_per_block)]
+        block["n_tx"] = len(block["tx"])
+        return block
+
+
+    def transaction(self, tx_hash: str, height: int = None) -> dict:
+        transaction = copy.deepcopy(self.responses["transaction"])
+        transaction["hash"] = tx_hash
+        if height is not None:
+            transaction.update(block_height = height, block_index = height, time = self.timestamp(height))
+        return transaction
+
+
+class BlockfrostBackend(RecordedBackend):
+    """Blockfrost Cardano API"""
+
+    NAME = "ada"
+    BLOCK_TIME = 20
+    HEAD = 7300000
+
+
+    def handle(self, method, path, query, body):
+        parts = path.strip("/").split("/")
+        if parts[0] == "v0":
+            parts = parts[1:]
+
+        if len(parts) in (2, 3) and parts[0] == "blocks":
+            height = self.parse_height(parts[1]) if len(parts[1]) != 64 else self.find_height(parts[1])
+            if height is None:
+                return self.not_found(path)
+            if len(parts) == 2:
+                return 200, self.block(height)
+            if parts[2] == "txs":
+                return 200, self.block_transactions(height, query)
+            if parts[2] in ("previous", "next"):
+                return 200, self.blocks_around(height, parts[2], query)
+        if len(parts) in (2, 3) and parts[0] == "txs":
+            if len(parts) == 2:
+                transaction = copy.deepcopy(self.responses["transaction"])
+                transaction["hash"] = parts[1]
+                return 200, transaction
+            if parts[2] == "utxos":
+                utxos = copy.deepcopy(self.responses["utxos"])
+                utxos["hash"] = parts[1]
+                return 200, utxos
+        if len(parts) == 2 and parts[0] == "addresses":
+            address = copy.deepcopy(self.responses["address"])
+            address["address"] = parts[1]
+            return 200, address
+        return self.not_found(path)
+
+
+    def block_hash(self, height: int) -> str:
+        return fake_hash("ada", "block", height)
+
+
+    def find_height(self, block_hash: str) -> int:
+        return next((height for height in range(self.head, max(self.head - 1000, 0), -1) if self.block_hash(height) == block_hash), None)
+
+
+    def block(self, height: int) -> dict:
+        block = copy.deepcopy(self.responses["block"])
+        block.update(height = height, time = self.timestamp(height), hash = self.block_hash(height),
+                     previous_block = self.block_hash(height - 1), tx_count = self.txs_per_block,
+                     confirmations = self.head - height,
+                     next_block = self.block_hash(height + 1) if height < self.head else None)
+        return block
+
+
+    def block_transactions(self, height: int, query: dict) -> list:
+        # Paginated as the real API, 100 hashes per page by default
+        count = int(query.get("count", 100))
+        page = int(query.get("page", 1))
+        hashes = [fake_hash("ada", "tx", height, index) for index in range(self.txs_per_block)]
+        if query.get("order") == "desc":
+            hashes.reverse()
+        return hashes[(page - 1) * count : page * count]
+
+
+    def blocks_around(self, height: int, direction: str, query: dict) -> list:
+        # Listed oldest first, the page closest to the block comes first
+        count = int(query.get("count", 100))
+        page = int(query.get("page", 1))
+        if direction == "previous":
+            heights = range(max(height - page * count, 0), max(height - (page - 1) * count, 0))
+        else:
+            heights = range(min(height + 1 + (page - 1) * count, self.head + 1), min(height + 1 + page * count, self.head + 1))
+        return [self.block(block_height) for block_height in heights]
+
+
+class AlgodBackend(RecordedBackend):
+    """Algorand node (algod) API"""
+
+    NAME = "algo"
+    BLOCK_TIME = 4
+    HEAD = 21000000
+
+
+    def handle(self, method, path, query, body):
+        parts = path.strip("/").split("/")
+        if parts[0] == "v2":
+            parts = parts[1:]
+
+        if parts == ["status"]:
+            status = copy.deepcopy(self.responses["status"])
+            status["last-round"] = self.head
+            status["next-version-round"] = self.head + 1
+            return 200, status
+        if len(parts) == 2 and parts[0] == "blocks" and self.parse_height(parts[1]) is not None:
+            block = copy.deepcopy(self.responses["block"])
+            block["block"].update(rnd = int(parts[1]), ts = self.timestamp(int(parts[1])),
+                                  prev = "blk-" + base64.b32encode(self.block_hash(int(parts[1]) - 1)).decode().rstrip("="))
+            return 200, block
+        if len(parts) == 2 and parts[0] == "accounts":
+            account = copy.deepcopy(self.responses["account"])
+            account.update(address = parts[1], round = self.head)
+            return 200, account
+        return self.not_found(path)
+
+
+    def block_hash(self, height: int) -> bytes:
+        return bytes.fromhex(fake_hash("algo", "block", height))
+
+
+class IndexerBackend(AlgodBackend):
+    """Algorand indexer API, served on its own address"""
+
+    # Rounds searched at most by a range query, the generated chain is not meant to be scanned
+    MAX_ROUNDS : int = 1000
+
+    def handle(self, method, path, query, body):
+        parts = path.strip("/").split("/")
+        if parts[0] == "v2":
+            parts = parts[1:]
+
+        if parts == ["transactions"]:
+            # Searched by round or round range, in pages of limit transactions
+            min_round = int(query.get("round", query.get("min-round", 0)))
+            max_round = min(int(query.get("round", query.get("max-round", self.head))), self.head)
+            start, limit = int(query.get("next") or 0), int(query.get("limit", 1000))
+            keys = [(height, index) for height in range(max(min_round, max_round - self.MAX_ROUNDS + 1), max_round + 1)
+                                    for index in range(self.txs_per_block)][start:start + limit]
+            transactions = [self.transaction(self.transaction_id(height, index), height) for height, index in keys]
+            return 200, { "current-round" : self.head, "next-token" : str(start + len(keys)), "transactions" : transactions }
+        if parts == ["block-headers"]:
+            min_round = int(query.get("min-round", 0))
+            max_round = min(int(query.get("max-round", self.head)), self.head)
+            start, limit = int(query.get("next") or 0), int(query.get("limit", 1000))
+            heights = list(range(max(min_round, max_round - self.MAX_ROUNDS + 1), max_round + 1))[start:start + limit]
+            return 200, { "current-round" : self.head, "next-token" : str(start + len(heights)),
+                          "blocks" : [self.block_header(height) for height in heights] }
+        if len(parts) == 2 and parts[0] == "transactions":
+            return 200, { "current-round" : self.head, "transaction" : self.transaction(parts[1]) }
+        return self.not_found(path)
+
+
+    def block_header(self, height: int) -> dict:
+        return {
+            "round" : height,
+            "timestamp" : self.timestamp(height),
+            "previous-block-hash" : base64.b64encode(self.block_hash(height - 1)).decode(),
+            "genesis-id" : "mainnet-v1.0",
+        }
+
+
+    def transaction_id(self, height: int, index: int) -> str:
+        return base64.b32encode(bytes.fromhex(fake_hash("algo", "tx", height, index))).decode()[:52]
+
+
+    def transaction(self, tx_id: str, height: int = None) -> dict:
+        transaction = copy.deepcopy(self.responses["transaction"])
+        transaction["id"] = tx_id
+        if height is not None:
+            transaction.update({ "confirmed-round" : height, "round-time" : self.timestamp(height) })
+        return transaction
+
+
+class TerraBackend(RecordedBackend):
+    """Terra LCD API"""
+
+    NAME = "luna"
+    BLOCK_TIME = 6
+    HEAD = 7500000
+
+
+    def handle(self, method, path, query, body):
+        if path.startswith("/cosmos/base/tendermint/v1beta1/blocks/"):
+            height = self.parse_height(path.rsplit("/", 1)[1])
+            if height is None:
+                return self.not_found(path)
+            return 200, self.block(height)
+        if path.startswith("/cosmos/tx/v1beta1/txs/"):
+            tx_response = copy.deepcopy(self.responses["tx_response"])
+            tx_response["txhash"] = path.rsplit("/", 1)[1]
+            return 200, { "tx" : tx_response["tx"], "tx_response" : tx_response }
+        if path == "/cosmos/tx/v1beta1/txs":
+            # Search of the transactions of a height, by pages
+            height = self.parse_height(query.get("events", "").replace("tx.height=", ""))
+            if height is None:
+                return 200, { "txs" : [], "tx_responses" : [], "pagination" : { "next_key" : None, "total" : "0" } }
+            offset, limit = int(query.get("pagination.offset", 0)), int(query.get("pagination.limit", 100))
+            tx_responses = [self.tx_response(height, index) for index in range(offset, min(offset + limit, self.txs_per_block))]
+            return 200, { "txs" : [tx_response["tx"] for tx_response in tx_responses], "tx_responses" : tx_responses,
+                          "pagination" : { "next_key" : None, "total" : str(self.txs_per_block) } }
+        if path.startswith("/cosmos/bank/v1beta1/balances/"):
+            return 200, self.responses["balance"]
+        return self.not_found(path)
+
+
+    def block_hash(self, height: int) -> str:
+        return base64.b64encode(bytes.fromhex(fake_hash("luna", "block", height))).decode()
+
+
+    def block(self, height: int) -> dict:
+        block = copy.deepcopy(self.responses["block"])
+        block["block_id"]["hash"] = self.block_hash(height)
+        header = block["block"]["header"]
+        header["height"] = str(height)
+        header["time"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.timestamp(height)))
+        header["last_block_id"]["hash"] = self.block_hash(height - 1)
+        # The transactions are hashed by the client, any bytes make a valid transaction
+        block["block"]["data"]["txs"] = [base64.b64encode(self.tx_bytes(height, index)).decode() for index in range(self.txs_per_block)]
+        return block
+
+
+    def tx_bytes(self, height: int, index: int) -> bytes:
+        return f"{self.responses['tx']}:{height}:{index}".encode()
+
+
+    def tx_response(self, height: int, index: int) -> dict:
+        tx_response = copy.deepcopy(self.responses["tx_response"])
+        # Hashed as the client hashes the transactions of the block
+        tx_response["txhash"] = hashlib.sha256(self.tx_bytes(height, index)).hexdigest().upper()
+        tx_response["height"] = str(height)
+        return tx_response
+
+
+class CoinMarketCapBackend(RecordedBackend):
+    """CoinMarketCap latest quotes API"""
+
+    NAME = "coinmarketcap"
+
+
+    def handle(self, method, path, query, body):
+        quotes = copy.deepcopy(self.responses["quotes"])
+        symbols = query.get("symbol", "").split(",")
+        quotes["data"] = { symbol : data for symbol, data in quotes["data"].items() if symbol in symbols }
+        return 200, quotes
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The concurrent callers open many connections at once, the default backlog of 5 drops them
+    request_queue_size = 1024
+
+
+class FakeServer():
+    """
+    Local HTTP server answering with a recorded backend, every request is delayed
+    by the injected latency to stand in for the network round trip
+    """
+
+    def __init__(self, backend: RecordedBackend, latency: float = 0):
+        """
+        Args:
+            backend: the recorded backend answering the requests
+            latency: seconds every request is delayed by
+        """
+        self.backend = backend
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = _HTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._thread = None
+
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+
+    def start(self) -> str:
+        """Start serving on a background thread and return the server url"""
+        self._thread = threading.Thread(target = self._server.serve_forever, args = (0.05,), name = f"fake-{self.backend.NAME}", daemon = True)
+        self._thread.start()
+        return self.url
+
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+    def _count(self):
+        with self._lock:
+            self.requests += 1
+
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                self._answer(b"")
+
+            def do_POST(self):
+                self._answer(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+
+            def _answer(self, body: bytes):
+                server._count()
+                if server.latency:
+                    time.sleep(server.latency)
+
+                url = urlsplit(self.path)
+                query = { key : values[-1] for key, values in parse_qs(url.query).items() }
+                try:
+                    status, payload = server.backend.handle(self.command, url.path, query, body)
+                except Exception as err:
+                    status, payload = 500, { "error" : str(err) }
+
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,263 @@
+"""
+Benchmarks the providers against local servers replaying recorded responses, so the
+numbers do not depend on the network nor on API keys
+
+    poetry run python -m benchmarks.run_benchmarks --latency 20 --concurrency 1 4 16
+
+Every operation is called --requests times per concurrency level, the throughput and
+the p50/p99 latencies are reported per blockchain and operation
+"""
+import argparse
+import json
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+import cryptos.explorers.blockchain
+
+from benchmarks.fake_server import (AlgodBackend, BlockfrostBackend, BtcBackend, CoinMarketCapBackend, EthBackend,
+                                    FakeServer, IndexerBackend, TerraBackend)
+from multichain_explorer.src.models.blockchains import Blockchains
+from multichain_explorer.src.providers.ada.ada_provider import AdaProvider
+from multichain_explorer.src.providers.algo.algo_provider import AlgoProvider
+from multichain_explorer.src.providers.eth.eth_provider import EthProvider
+from multichain_explorer.src.providers.luna.luna_provider import LunaProvider
+from multichain_explorer.src.providers.provider import ProviderInterface
+from multichain_explorer.src.providers.provider_factory import BlockchainProvider
+from multichain_explorer.src.services.coinmarketcap_service import CoinMarketCapService
+from multichain_explorer.src.services.request_scheduler import RequestScheduler
+
+
+OPERATIONS = ["get_blocks", "get_transactions", "search_resource", "get_summary"]
+
+
+# Search texts replayed by search_resource: a block, an address and a transaction of every chain
+SEARCH_TEXTS : Dict[Blockchains, List[str]] = {
+    Blockchains.ETH : ["1000000",
+                       "0xDFd5293D8e347dFe59E90eFd55b2956a1343963d",
+                       "0x9a72dba1ff86ab68eb9e5074134b993d0eda143be6420bc73aab5c1f99b66c92"],
+    Blockchains.BTC : ["740000",
+                       "1A1zP1eP5QGefi2DMPTfTL5SLmv7DivfNa",
+                       "f4184fc596403b9d638783cf57adfe4c75c605f6356fbc91338530e9831e9e16"],
+    Blockchains.ADA : ["7300000",
+                       "addr1qx2fxv2umyhttkxyxp8x0dlpdt3k6cwng5pxj3jhsydzer3n0d3vllmyqwsx5wktcd8cc3sq835lu7drv2xwl2wywfgse35a3x",
+                       "1e043f100dce12d107f679685acd2fc0610e10f72a92d412794c9773d11d8477"],
+    Blockchains.ALGO : ["21000000",
+                        "VCMJKWOY5P5P7SKMZFFOCEROPJCZOTIJMNIYNUCKH7LRO45JMJP6UYBIJA",
+                        "QJ4XDEVL7KZNDF4SXKH4EUBOPCQ3IRU2QPOHOAOZFPDZGGSDXHNQ"],
+    Blockchains.LUNA : ["7500000",
+                        "terra1dcegyrekltswvyy0xy69ydgxn9x8x32zdtapd8",
+                        "D7B3A0F6C8E5A4B1F2E3D4C5B6A7980112233445566778899AABBCCDDEEFF001"],
+}
+
+
+class FakeUpstreams():
+    """Starts a recorded backend server per upstream API and points the providers at them"""
+
+    def __init__(self, latency: float = 0, txs_per_block: int = None):
+        """
+        Args:
+            latency: seconds every upstream request is delayed by
+            txs_per_block: transactions in every generated block
+        """
+        self.servers = {
+            "eth"           : FakeServer(EthBackend(txs_per_block = txs_per_block), latency),
+            "btc"           : FakeServer(BtcBackend(txs_per_block = txs_per_block), latency),
+            "ada"           : FakeServer(BlockfrostBackend(txs_per_block = txs_per_block), latency),
+            "algod"         : FakeServer(AlgodBackend(txs_per_block = txs_per_block), latency),
+            "indexer"       : FakeServer(IndexerBackend(txs_per_block = txs_per_block), latency),
+            "luna"          : FakeServer(TerraBackend(txs_per_block = txs_per_block), latency),
+            "coinmarketcap" : FakeServer(CoinMarketCapBackend(), latency),
+        }
+        self._settings = []
+
+
+    def start(self):
+        urls = { name : server.start() for name, server in self.servers.items() }
+
+        self._set(EthProvider, "INFURA_URL", urls["eth"])
+        self._set(AdaProvider, "BLOCKFROST_PROJECT_ID", "benchmark")
+        self._set(AdaProvider, "BLOCKFROST_URL", urls["ada"])
+        self._set(AlgoProvider, "ALGOD_TOKEN", "benchmark")
+        self._set(AlgoProvider, "ALGOD_ADDRESS", urls["algod"])
+        self._set(AlgoProvider, "INDEXER_ADDRESS", urls["indexer"])
+        self._set(LunaProvider, "TERRA_CHAIN_ID", "columbus-5")
+        self._set(LunaProvider, "TERRA_URL", urls["luna"])
+        self._set(CoinMarketCapService, "COINMARKETCAP_API_URL", urls["coinmarketcap"])
+        self._set(CoinMarketCapService, "COINMARKETCAP_API_KEY", "benchmark")
+        # The cryptos Bitcoin backend has no setting for its explorer url
+        self._set(cryptos.explorers.blockchain, "get_url", lambda coin_symbol: urls["btc"])
+        # The recorded backends are not rate limited
+        self._set(RequestScheduler, "LIMITS", {})
+
+
+    def stop(self):
+        BlockchainProvider.close()
+        for target, name, value in reversed(self._settings):
+            setattr(target, name, value)
+        self._settings = []
+        for server in self.servers.values():
+            server.stop()
+
+
+    def get_requests(self) -> int:
+        """Number of upstream requests served so far"""
+        return sum(server.requests for server in self.servers.values())
+
+
+    def _set(self, target, name: str, value):
+        self._settings.append((target, name, getattr(target, name)))
+        setattr(target, name, value)
+
+
+    def __enter__(self):
+        self.start()
+        return self
+
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+def get_operation(blockchain: Blockchains, operation: str, num_blocks: int, num_tx: int) -> Callable[[ProviderInterface, int], object]:
+    """The call benchmarked for an operation, given the provider and the call index"""
+    search_texts = SEARCH_TEXTS[blockchain]
+    operations = {
+        "get_blocks" : lambda provider, index: provider.get_blocks(num_blocks),
+        "get_transactions" : lambda provider, index: provider.get_transactions(num_tx),
+        "search_resource" : lambda provider, index: provider.search_resource(search_texts[index % len(search_texts)]),
+        "get_summary" : lambda provider, index: provider.get_summary(),
+    }
+    return operations[operation]
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Nearest rank percentile of the values"""
+    if len(values) == 0:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+def measure(call: Callable[[int], object], requests: int, concurrency: int) -> dict:
+    """
+    Run a call requests times on concurrency threads
+
+    Returns:
+        A dict with the requests, errors, throughput (calls per second) and the
+        p50/p99 latencies in seconds
+    """
+    def timed(index: int):
+        start = time.perf_counter()
+        try:
+            call(index)
+            error = None
+        except Exception as err:
+            error = str(err) or type(err).__name__
+        return time.perf_counter() - start, error
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers = concurrency) as executor:
+        results = list(executor.map(timed, range(requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = [latency for latency, error in results]
+    errors = [error for latency, error in results if error is not None]
+    return {
+        "requests" : requests,
+        "errors" : len(errors),
+        "firstError" : errors[0] if errors else None,
+        "throughput" : requests / elapsed if elapsed > 0 else None,
+        "p50" : percentile(latencies, 50),
+        "p99" : percentile(latencies, 99),
+    }
+
+
+def run_benchmarks(blockchains: List[Blockchains] = None,
+                   operations: List[str] = None,
+                   concurrency: List[int] = (1, 4, 16),
+                   requests: int = 50,
+                   latency: float = 0.02,
+                   num_blocks: int = 10,
+                   num_tx: int = 10,
+                   txs_per_block: int = 20) -> List[dict]:
+    """
+    Benchmark the providers against the recorded backends
+
+    Args:
+        blockchains: the blockchains to benchmark, defaults to all of them
+        operations: the provider methods to benchmark, defaults to OPERATIONS
+        concurrency: the numbers of concurrent callers to benchmark with
+        requests: calls per blockchain, operation and concurrency level
+        latency: seconds every upstream request is delayed by
+        num_blocks: blocks requested by get_blocks
+        num_tx: transactions requested by get_transactions
+        txs_per_block: transactions in every generated block
+
+    Returns:
+        A list of results, one per blockchain, operation and concurrency level, with
+        the measure fields plus blockchain, operation, concurrency and upstreamRequests
+    """
+    blockchains = blockchains or Blockchains.get_available_blockchains()
+    operations = operations or OPERATIONS
+
+    results = []
+    with FakeUpstreams(latency, txs_per_block) as upstreams:
+        for blockchain in blockchains:
+            provider = BlockchainProvider.get_instance(blockchain)
+            for operation in operations:
+                call = get_operation(blockchain, operation, num_blocks, num_tx)
+                for callers in concurrency:
+                    # Every run starts with cold quotes
+                    CoinMarketCapService._quotesCache.clear()
+                    upstream_requests = upstreams.get_requests()
+                    result = measure(lambda index: call(provider, index), requests, callers)
+                    result.update(blockchain = blockchain.value, operation = operation, concurrency = callers,
+                                  upstreamRequests = upstreams.get_requests() - upstream_requests)
+                    results.append(result)
+    return results
+
+
+def print_results(results: List[dict]):
+    print(f"{'chain':<6}{'operation':<18}{'callers':>8}{'calls/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'upstream':>10}{'errors':>8}")
+    for result in results:
+        throughput = f"{result['throughput']:.1f}" if result["throughput"] is not None else "-"
+        print(f"{result['blockchain']:<6}{result['operation']:<18}{result['concurrency']:>8}{throughput:>10}"
+              f"{result['p50'] * 1000:>10.1f}{result['p99'] * 1000:>10.1f}{result['upstreamRequests']:>10}{result['errors']:>8}")
+        if result["firstError"] is not None:
+            print(f"      first error: {result['firstError']}")
+
+
+def main(args: List[str] = None):
+    parser = argparse.ArgumentParser(description = "Benchmark the providers against recorded upstream responses")
+    parser.add_argument("--chains", nargs = "+", choices = [blockchain.value for blockchain in Blockchains.get_available_blockchains()],
+                        help = "blockchains to benchmark, all of them by default")
+    parser.add_argument("--operations", nargs = "+", choices = OPERATIONS, help = "operations to benchmark, all of them by default")
+    parser.add_argument("--concurrency", nargs = "+", type = int, default = [1, 4, 16], help = "numbers of concurrent callers")
+    parser.add_argument("--requests", type = int, default = 50, help = "calls per chain, operation and concurrency level")
+    parser.add_argument("--latency", type = float, default = 20, help = "milliseconds every upstream request is delayed by")
+    parser.add_argument("--num-blocks", type = int, default = 10, help = "blocks requested by get_blocks")
+    parser.add_argument("--num-tx", type = int, default = 10, help = "transactions requested by get_transactions")
+    parser.add_argument("--txs-per-block", type = int, default = 20, help = "transactions in every generated block")
+    parser.add_argument("--json", help = "also write the results to this JSON file")
+    options = parser.parse_args(args)
+
+    results = run_benchmarks(blockchains = [Blockchains(chain) for chain in options.chains] if options.chains else None,
+                             operations = options.operations,
+                             concurrency = options.concurrency,
+                             requests = options.requests,
+                             latency = options.latency / 1000,
+                             num_blocks = options.num_blocks,
+                             num_tx = options.num_tx,
+                             txs_per_block = options.txs_per_block)
+    print_results(results)
+
+    if options.json:
+        with open(options.json, "w") as file:
+            json.dump(results, file, indent = 2)
+
+
+if __name__ == "__main__":
+    main()
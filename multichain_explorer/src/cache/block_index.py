@@ -0,0 +1,48 @@
+import math
+from typing import Optional
+from multichain_explorer.src.cache.ttl_cache import TTLCache
+
+
+class BlockIndex():
+    """
+    Thread safe height <-> hash index of the blocks of a chain, so a block fetched by
+    one key can be found again by the other one without asking the blockchain
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        """
+        Args:
+            max_entries: blocks indexed, the oldest ones are dropped when exceeded
+        """
+        # A hash always identifies the same block, a height can be reorganized near the tip
+        self._hashes = TTLCache(ttl = math.inf, max_entries = max_entries)
+        self._heights = TTLCache(ttl = math.inf, max_entries = max_entries)
+
+
+    def add(self, height: int, block_hash: str, ttl: float = None):
+        """
+        Index a block
+
+        Args:
+            height: the block height
+            block_hash: the block hash
+            ttl: seconds the height is resolved to this hash, forever if not set
+        """
+        self._hashes.set(height, block_hash, ttl)
+        self._heights.set(block_hash, height)
+
+
+    def get_hash(self, height: int) -> Optional[str]:
+        """Hash of the block at a height, None when not indexed"""
+        return self._hashes.get(height)
+
+
+    def get_height(self, block_hash: str) -> Optional[int]:
+        """Height of the block with a hash, None when not indexed"""
+        return self._heights.get(block_hash)
+
+
+    def clear(self):
+        """Remove every block from the index"""
+        self._hashes.clear()
+        self._heights.clear()
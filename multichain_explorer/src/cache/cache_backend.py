@@ -0,0 +1,53 @@
+import abc
+from typing import Any, Hashable
+
+
+class CacheBackendInterface(metaclass=abc.ABCMeta):
+    @classmethod
+    def __subclasshook__(cls, subclass):
+        return (hasattr(subclass, 'get') and
+                callable(subclass.get) and
+                hasattr(subclass, 'set') and
+                callable(subclass.set) and
+                hasattr(subclass, 'delete') and
+                callable(subclass.delete) and
+                hasattr(subclass, 'clear') and
+                callable(subclass.clear) or
+                NotImplemented)
+
+    @abc.abstractmethod
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value from the cache
+
+        Args:
+            key: the key of the entry
+            default: returned when the entry is missing
+
+        Returns:
+            The cached value or the default
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def set(self, key: Hashable, value: Any):
+        """Store a value in the cache, evicting the least recently used entries if needed
+
+        Args:
+            key: the key of the entry
+            value: the value to store
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def delete(self, key: Hashable):
+        """Remove an entry from the cache
+
+        Args:
+            key: the key of the entry
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def clear(self):
+        """Remove every entry from the cache"""
+        raise NotImplementedError
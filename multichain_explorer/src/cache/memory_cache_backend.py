@@ -0,0 +1,67 @@
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable
+from multichain_explorer.src.cache.cache_backend import CacheBackendInterface
+
+
+class MemoryCacheBackend(CacheBackendInterface):
+    """
+    In-memory LRU cache limited by a memory budget
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Args:
+            max_bytes: memory budget of the cached values (their pickled size)
+        """
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+
+            self._entries.move_to_end(key)
+            return entry[0]
+
+
+    def set(self, key: Hashable, value: Any):
+        entry_size = len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        if entry_size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (value, entry_size)
+            self.size += entry_size
+
+            # Evict the least recently used entries until the budget is met
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._remove(key)
+
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
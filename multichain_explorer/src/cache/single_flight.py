@@ -0,0 +1,62 @@
+import threading
+from typing import Any, Callable, Hashable
+
+
+class _Call():
+    """A call in flight, shared by all the callers of the same key"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight():
+    """
+    De-duplicates concurrent calls: while a call for a key is in flight,
+    other callers of the same key wait for it and share its result
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """
+        Run func, or wait for the call already in flight for the same key
+
+        Args:
+            key: identifies the call
+            func: the function to run when no call is in flight
+
+        Returns:
+            The result of the call
+
+        Raises:
+            The exception raised by the call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except Exception as err:
+            call.error = err
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
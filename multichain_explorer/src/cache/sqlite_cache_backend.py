@@ -0,0 +1,100 @@
+import pickle
+import sqlite3
+import threading
+from typing import Any, Hashable
+from multichain_explorer.src.cache.cache_backend import CacheBackendInterface
+
+
+class SqliteCacheBackend(CacheBackendInterface):
+    """
+    On-disk LRU cache stored in a SQLite database and limited by a size budget
+
+    Values are pickled, so the database must not be shared with untrusted writers
+    """
+
+    def __init__(self, path: str, max_bytes: int = 512 * 1024 * 1024):
+        """
+        Args:
+            path: path of the SQLite database file
+            max_bytes: size budget of the cached values (their pickled size)
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread = False)
+
+        with self._lock, self._connection:
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS cache (
+                    key         TEXT PRIMARY KEY,
+                    value       BLOB NOT NULL,
+                    size        INTEGER NOT NULL,
+                    last_access INTEGER NOT NULL
+                )""")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS cache_last_access ON cache (last_access)")
+            self.size, self._clock = self._connection.execute(
+                "SELECT COALESCE(SUM(size), 0), COALESCE(MAX(last_access), 0) FROM cache").fetchone()
+
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        db_key = repr(key)
+        with self._lock, self._connection:
+            row = self._connection.execute("SELECT value FROM cache WHERE key = ?", (db_key,)).fetchone()
+            if row is None:
+                return default
+
+            self._connection.execute("UPDATE cache SET last_access = ? WHERE key = ?", (self._tick(), db_key))
+        return pickle.loads(row[0])
+
+
+    def set(self, key: Hashable, value: Any):
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_bytes:
+            return
+
+        db_key = repr(key)
+        with self._lock, self._connection:
+            self._remove(db_key)
+            self._connection.execute("INSERT INTO cache (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                                     (db_key, data, len(data), self._tick()))
+            self.size += len(data)
+
+            # Evict the least recently used entries until the budget is met
+            while self.size > self.max_bytes:
+                oldest = self._connection.execute("SELECT key FROM cache ORDER BY last_access LIMIT 1").fetchone()
+                self._remove(oldest[0])
+
+
+    def delete(self, key: Hashable):
+        with self._lock, self._connection:
+            self._remove(repr(key))
+
+
+    def clear(self):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM cache")
+            self.size = 0
+
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._connection.close()
+
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+
+    def _tick(self) -> int:
+        """Logical clock ordering the accesses, immune to the resolution of the system clock"""
+        self._clock += 1
+        return self._clock
+
+
+    def _remove(self, db_key: str):
+        row = self._connection.execute("SELECT size FROM cache WHERE key = ?", (db_key,)).fetchone()
+        if row is not None:
+            self._connection.execute("DELETE FROM cache WHERE key = ?", (db_key,))
+            self.size -= row[0]
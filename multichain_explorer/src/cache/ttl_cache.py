@@ -0,0 +1,94 @@
+import threading
+import time
+from typing import Any, Hashable
+
+
+class TTLCache():
+    """
+    Thread safe in-process cache whose entries expire after a time to live
+    """
+
+    def __init__(self, ttl: float = 60, max_entries: int = 10000):
+        """
+        Args:
+            ttl: default time to live of the entries, in seconds
+            max_entries: expired entries are purged when this size is reached,
+                         the oldest entries are dropped if it is still exceeded
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a value from the cache
+
+        Args:
+            key: the key of the entry
+            default: returned when the entry is missing or expired
+
+        Returns:
+            The cached value or the default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            return value
+
+
+    def set(self, key: Hashable, value: Any, ttl: float = None):
+        """
+        Store a value in the cache
+
+        Args:
+            key: the key of the entry
+            value: the value to store
+            ttl: time to live of this entry in seconds, defaults to the cache ttl
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+
+        with self._lock:
+            if len(self._entries) >= self.max_entries and key not in self._entries:
+                self._purge()
+            self._entries[key] = (expires_at, value)
+
+
+    def delete(self, key: Hashable):
+        """Remove an entry from the cache"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+    def clear(self):
+        """Remove every entry from the cache"""
+        with self._lock:
+            self._entries.clear()
+
+
+    def __contains__(self, key: Hashable) -> bool:
+        sentinel = object()
+        return self.get(key, sentinel) is not sentinel
+
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+    def _purge(self):
+        """Drop the expired entries, and the oldest ones if the cache is still full"""
+        now = time.monotonic()
+        expired = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+
+        # Dicts keep insertion order, so the first keys are the oldest ones
+        while len(self._entries) >= self.max_entries:
+            del self._entries[next(iter(self._entries))]
@@ -0,0 +1,195 @@
+import copy
+import functools
+import inspect
+import time
+from contextvars import ContextVar
+from typing import Callable, List
+from multichain_explorer.src.metrics.metrics_backend import MetricsBackendInterface
+from multichain_explorer.src.models.blockchains import Blockchains
+from multichain_explorer.src.services.client_proxy import ClientProxy
+
+
+# HTTP [bytes sent, bytes received, requests] of the upstream call running in the current thread or task
+_traffic : ContextVar = ContextVar("upstream_traffic", default = None)
+
+
+class Instrumentation():
+    """
+    Records every call to the methods of a provider, and every call the provider makes
+    to its upstream clients (SDK clients, HTTP sessions), into a metrics backend.
+
+    The provider instance is instrumented in place, so the calls a provider makes to its
+    own methods (eg.: get_blocks calling get_block_by_id) are recorded as well
+    """
+
+    # Provider methods recorded, as ProviderInterface and AsyncProviderInterface
+    METHODS : tuple = ("get_summary", "fetch_latest_block_number", "get_latest_block_number",
+                       "get_blocks", "get_block_by_id", "get_block_transactions",
+                       "get_transactions", "get_transaction_by_id",
+                       "get_address", "get_addresses", "search_resource")
+
+    # Provider attributes holding an upstream client, and the prefix of the recorded endpoints
+    CLIENTS : dict = {
+        "provider" : "",
+        "fetchService" : "http",
+        "indexerFetchService" : "indexer.http",
+    }
+
+
+    def __init__(self, backend: MetricsBackendInterface, blockchain_id: Blockchains):
+        """
+        Args:
+            backend: where the metrics are recorded
+            blockchain_id: the blockchain of the instrumented providers
+        """
+        self.backend = backend
+        self.blockchain_id = blockchain_id
+
+
+    def attach(self, provider):
+        """
+        Instrument a provider, sync or async
+
+        Args:
+            provider: the provider instance to instrument
+        """
+        provider.instrumentation = self
+
+        for method_name in self.METHODS:
+            method = getattr(provider, method_name, None)
+            if method is not None:
+                setattr(provider, method_name, self.wrap_method(method, method_name))
+
+        for attribute, prefix in self.CLIENTS.items():
+            # Clients built on demand (eg.: LunaProvider.provider) are wrapped by the provider itself
+            if isinstance(getattr(type(provider), attribute, None), property):
+                continue
+            client = getattr(provider, attribute, None)
+            if client is not None:
+                setattr(provider, attribute, self.wrap_client(client, prefix))
+
+        # The quotes service is shared by the class, the instance gets its own instrumented copy
+        service = getattr(provider, "coinMarketCapService", None)
+        if service is not None:
+            service = copy.copy(service)
+            service.fetchService = self.wrap_client(service.fetchService, "coinMarketCap")
+            provider.coinMarketCapService = service
+
+
+    def wrap_client(self, client, prefix: str = "") -> "InstrumentedClient":
+        """
+        Wrap an upstream client, every method called on it is recorded as an upstream call
+
+        Args:
+            client: the upstream client
+            prefix: prefix of the recorded endpoints
+        """
+        return InstrumentedClient(client, self, prefix)
+
+
+    def wrap_method(self, method: Callable, name: str) -> Callable:
+        """Wrap a provider method recording its calls, coroutines are measured until awaited"""
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            except Exception as err:
+                self.backend.record_call(self.blockchain_id.value, name, time.perf_counter() - start, type(err).__name__)
+                raise
+            if inspect.isawaitable(result):
+                return self._await_call(result, name, start)
+            self.backend.record_call(self.blockchain_id.value, name, time.perf_counter() - start)
+            return result
+        return wrapper
+
+
+    def wrap_upstream(self, call: Callable, endpoint: str) -> Callable:
+        """Wrap an upstream client method recording its calls and HTTP traffic, coroutines are measured until awaited"""
+        @functools.wraps(call)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            token = _traffic.set([0, 0, 0])
+            try:
+                result = call(*args, **kwargs)
+            except Exception as err:
+                self._record_upstream(endpoint, time.perf_counter() - start, type(err).__name__, token)
+                raise
+            if inspect.isawaitable(result):
+                _traffic.reset(token)
+                return self._await_upstream(result, endpoint, start)
+            self._record_upstream(endpoint, time.perf_counter() - start, None, token)
+            return result
+        return wrapper
+
+
+    async def _await_call(self, awaitable, name: str, start: float):
+        error = None
+        try:
+            return await awaitable
+        except Exception as err:
+            error = type(err).__name__
+            raise
+        finally:
+            self.backend.record_call(self.blockchain_id.value, name, time.perf_counter() - start, error)
+
+
+    async def _await_upstream(self, awaitable, endpoint: str, start: float):
+        token = _traffic.set([0, 0, 0])
+        error = None
+        try:
+            return await awaitable
+        except Exception as err:
+            error = type(err).__name__
+            raise
+        finally:
+            self._record_upstream(endpoint, time.perf_counter() - start, error, token)
+
+
+    @staticmethod
+    def count_traffic(bytes_sent: int, bytes_received: int):
+        """
+        Count the HTTP traffic of a request in the upstream call running in the current
+        thread or task, called by the HTTP sessions of the FetchService and AsyncFetchService
+
+        Args:
+            bytes_sent: size of the request body
+            bytes_received: size of the response body
+        """
+        traffic : List[int] = _traffic.get()
+        if traffic is not None:
+            traffic[0] += bytes_sent
+            traffic[1] += bytes_received
+            traffic[2] += 1
+
+
+    def _record_upstream(self, endpoint: str, duration: float, error: str, token):
+        bytes_sent, bytes_received, requests = _traffic.get()
+        _traffic.reset(token)
+        if requests == 0:
+            # Sent through a transport that is not observed (eg.: urllib, the requests module functions)
+            bytes_sent = bytes_received = None
+        self.backend.record_upstream(self.blockchain_id.value, endpoint, duration, error, bytes_sent, bytes_received)
+
+        # The traffic of nested upstream calls is counted in the enclosing one too
+        parent = _traffic.get()
+        if parent is not None and requests > 0:
+            parent[0] += bytes_sent
+            parent[1] += bytes_received
+            parent[2] += requests
+
+
+class InstrumentedClient(ClientProxy):
+    """Proxy of an upstream client recording every call to the upstream, see ClientProxy"""
+
+    def __init__(self, client, instrumentation: Instrumentation, prefix: str = ""):
+        super().__init__(client, prefix)
+        object.__setattr__(self, "_instrumentation", instrumentation)
+
+
+    def wrap_call(self, call: Callable, endpoint: str) -> Callable:
+        return self._instrumentation.wrap_upstream(call, endpoint)
+
+
+    def wrap_sub_client(self, client, prefix: str) -> "InstrumentedClient":
+        return InstrumentedClient(client, self._instrumentation, prefix)
@@ -0,0 +1,38 @@
+import abc
+
+
+class MetricsBackendInterface(metaclass=abc.ABCMeta):
+    @classmethod
+    def __subclasshook__(cls, subclass):
+        return (hasattr(subclass, 'record_call') and
+                callable(subclass.record_call) and
+                hasattr(subclass, 'record_upstream') and
+                callable(subclass.record_upstream) or
+                NotImplemented)
+
+    @abc.abstractmethod
+    def record_call(self, blockchain: str, method: str, duration: float, error: str = None):
+        """Record a call to a provider method
+
+        Args:
+            blockchain: the blockchain id of the provider (eg.: ETH)
+            method: the provider method (eg.: get_blocks)
+            duration: seconds the call took
+            error: the exception type name when the call failed
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def record_upstream(self, blockchain: str, endpoint: str, duration: float, error: str = None,
+                        bytes_sent: int = None, bytes_received: int = None):
+        """Record a call to an upstream client
+
+        Args:
+            blockchain: the blockchain id of the provider making the call
+            endpoint: the client method called (eg.: eth.get_block, indexer.search_transactions)
+            duration: seconds the call took
+            error: the exception type name when the call failed
+            bytes_sent: HTTP bytes sent by the call, None when the client transport is not observed
+            bytes_received: HTTP bytes received by the call, None when the client transport is not observed
+        """
+        raise NotImplementedError
@@ -0,0 +1,15 @@
+from multichain_explorer.src.metrics.metrics_backend import MetricsBackendInterface
+
+
+class NoopMetricsBackend(MetricsBackendInterface):
+    """
+    Discards every metric, the providers are not instrumented at all with this backend
+    """
+
+    def record_call(self, blockchain: str, method: str, duration: float, error: str = None):
+        pass
+
+
+    def record_upstream(self, blockchain: str, endpoint: str, duration: float, error: str = None,
+                        bytes_sent: int = None, bytes_received: int = None):
+        pass
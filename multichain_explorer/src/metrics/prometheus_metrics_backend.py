@@ -0,0 +1,153 @@
+import threading
+from typing import Dict, List, Tuple
+from multichain_explorer.src.metrics.metrics_backend import MetricsBackendInterface
+
+
+class Histogram():
+    """Counts of the observed values per bucket, with their sum and count"""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+
+    def observe(self, value: float):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+
+    def get_cumulative_counts(self) -> List[int]:
+        """Counts of the values lower or equal than every bucket bound, as Prometheus buckets"""
+        cumulative, total = [], 0
+        for count in self.counts:
+            total += count
+            cumulative.append(total)
+        return cumulative
+
+
+class PrometheusMetricsBackend(MetricsBackendInterface):
+    """
+    Keeps the metrics in memory and exports them in the Prometheus text format,
+    to be served by the caller (eg.: on a /metrics endpoint)
+    """
+
+    # Upper bounds of the latency histogram buckets, in seconds
+    BUCKETS : Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    # Prefix of every metric name
+    NAMESPACE : str = "multichain_explorer"
+
+
+    def __init__(self, buckets: Tuple[float, ...] = None):
+        """
+        Args:
+            buckets: overrides the upper bounds of the latency histogram buckets
+        """
+        self.buckets = tuple(sorted(buckets or self.BUCKETS))
+
+        self._calls : Dict[tuple, Histogram] = {}
+        self._call_errors : Dict[tuple, int] = {}
+        self._upstream : Dict[tuple, Histogram] = {}
+        self._upstream_errors : Dict[tuple, int] = {}
+        self._bytes_sent : Dict[tuple, int] = {}
+        self._bytes_received : Dict[tuple, int] = {}
+        self._lock = threading.Lock()
+
+
+    def record_call(self, blockchain: str, method: str, duration: float, error: str = None):
+        key = (blockchain, method)
+        with self._lock:
+            self._observe(self._calls, key, duration)
+            if error is not None:
+                self._increment(self._call_errors, key + (error,), 1)
+
+
+    def record_upstream(self, blockchain: str, endpoint: str, duration: float, error: str = None,
+                        bytes_sent: int = None, bytes_received: int = None):
+        key = (blockchain, endpoint)
+        with self._lock:
+            self._observe(self._upstream, key, duration)
+            if error is not None:
+                self._increment(self._upstream_errors, key + (error,), 1)
+            if bytes_sent is not None:
+                self._increment(self._bytes_sent, key, bytes_sent)
+            if bytes_received is not None:
+                self._increment(self._bytes_received, key, bytes_received)
+
+
+    def export(self) -> str:
+        """
+        Export the metrics in the Prometheus text exposition format
+
+        Returns:
+            The metrics as text, the calls are counted by the _count series of the histograms
+        """
+        lines = []
+        with self._lock:
+            self._export_histogram(lines, "provider_call_duration_seconds", "Duration of the provider method calls",
+                                   ("blockchain", "method"), self._calls)
+            self._export_counter(lines, "provider_call_errors_total", "Provider method calls that raised an error",
+                                 ("blockchain", "method", "error"), self._call_errors)
+            self._export_histogram(lines, "upstream_request_duration_seconds", "Duration of the upstream client calls",
+                                   ("blockchain", "endpoint"), self._upstream)
+            self._export_counter(lines, "upstream_errors_total", "Upstream client calls that raised an error",
+                                 ("blockchain", "endpoint", "error"), self._upstream_errors)
+            self._export_counter(lines, "upstream_sent_bytes_total", "HTTP bytes sent by the upstream client calls",
+                                 ("blockchain", "endpoint"), self._bytes_sent)
+            self._export_counter(lines, "upstream_received_bytes_total", "HTTP bytes received by the upstream client calls",
+                                 ("blockchain", "endpoint"), self._bytes_received)
+        return "\n".join(lines) + "\n"
+
+
+    def clear(self):
+        """Reset every metric"""
+        with self._lock:
+            for metric in (self._calls, self._call_errors, self._upstream,
+                           self._upstream_errors, self._bytes_sent, self._bytes_received):
+                metric.clear()
+
+
+    def _observe(self, histograms: Dict[tuple, Histogram], key: tuple, value: float):
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram(self.buckets)
+        histogram.observe(value)
+
+
+    def _increment(self, counters: Dict[tuple, int], key: tuple, value: int):
+        counters[key] = counters.get(key, 0) + value
+
+
+    def _export_histogram(self, lines: List[str], name: str, help: str, labels: tuple, histograms: Dict[tuple, Histogram]):
+        name = f"{self.NAMESPACE}_{name}"
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} histogram")
+        for key, histogram in sorted(histograms.items()):
+            for bound, count in zip(self.buckets, histogram.get_cumulative_counts()):
+                lines.append(f"{name}_bucket{self._format_labels(labels + ('le',), key + (self._format_value(bound),))} {count}")
+            lines.append(f"{name}_bucket{self._format_labels(labels + ('le',), key + ('+Inf',))} {histogram.count}")
+            lines.append(f"{name}_sum{self._format_labels(labels, key)} {self._format_value(histogram.sum)}")
+            lines.append(f"{name}_count{self._format_labels(labels, key)} {histogram.count}")
+
+
+    def _export_counter(self, lines: List[str], name: str, help: str, labels: tuple, counters: Dict[tuple, int]):
+        name = f"{self.NAMESPACE}_{name}"
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} counter")
+        for key, value in sorted(counters.items()):
+            lines.append(f"{name}{self._format_labels(labels, key)} {value}")
+
+
+    def _format_labels(self, labels: tuple, values: tuple) -> str:
+        escaped = (str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n") for value in values)
+        return "{" + ",".join(f'{label}="{value}"' for label, value in zip(labels, escaped)) + "}"
+
+
+    def _format_value(self, value: float) -> str:
+        return repr(float(value))
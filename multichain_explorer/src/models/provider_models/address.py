@@ -1,8 +1,9 @@
 from dataclasses import dataclass
+from typing import Any
+from multichain_explorer.src.models.provider_models.provider_model import ProviderModel
 
-@dataclass
-class Address:
+@dataclass(frozen = True, slots = True)
+class Address(ProviderModel):
     """Class that holds address data returned by the provider"""
     address: str
-    balance: str
-    
\ No newline at end of file
+    balance: Any
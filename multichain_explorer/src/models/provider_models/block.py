@@ -1,11 +1,18 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, ClassVar, Dict, Optional
+from multichain_explorer.src.models.provider_models.provider_model import ProviderModel
+from multichain_explorer.src.models.provider_models.raw_data import RawData
 
-@dataclass
-class Block:
+@dataclass(frozen = True, slots = True)
+class Block(ProviderModel):
     """Class that holds block data returned by the provider"""
-    id: str
+    id: int
     miner: str
-    difficulty: str
-    timestamp: str
-    raw_data: Optional[str] = "None"
\ No newline at end of file
+    difficulty: Any
+    timestamp: Any
+    hash: Optional[str]
+    parent_hash: Optional[str]
+    raw_data: Optional[RawData] = None
+
+    KEYS : ClassVar[Dict[str, str]] = { "parent_hash" : "parentHash", "raw_data" : "rawData" }
+    OPTIONAL : ClassVar[tuple] = ("raw_data",)
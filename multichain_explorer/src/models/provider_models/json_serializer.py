@@ -0,0 +1,51 @@
+import json
+import re
+import secrets
+from decimal import Decimal
+from multichain_explorer.src.models.provider_models.provider_model import ProviderModel
+from multichain_explorer.src.models.provider_models.raw_data import RawData
+
+
+def _to_json_value(value):
+    """JSON value of the types the json module can't encode"""
+    if isinstance(value, ProviderModel):
+        # The raw data is left as it is, to be passed through
+        return { value.KEYS.get(name, name) : getattr(value, name) for name in value.__slots__
+                 if getattr(value, name) is not None or name not in value.OPTIONAL }
+    if isinstance(value, Decimal):
+        # Balances (eg.: ETH in ether) keep their precision
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def to_json(data) -> str:
+    """
+    Serialize the data returned by the providers (models, lists and dicts of them) to JSON
+
+    The raw data of the blocks and transactions is not decoded, its upstream JSON is
+    written as it is in place of a placeholder
+
+    Args:
+        data: the data to serialize
+
+    Returns:
+        The JSON string, the models use the keys of their to_dict
+    """
+    raw_data = []
+    # Placeholder unique to the call, so no string of the data can be taken for it
+    marker = f"\u0000{secrets.token_hex(8)}:"
+
+    def default(value):
+        if isinstance(value, RawData):
+            raw_data.append(value)
+            return f"{marker}{len(raw_data) - 1}"
+        return _to_json_value(value)
+
+    encoded = json.JSONEncoder(separators = (",", ":"), default = default).encode(data)
+    if len(raw_data) == 0:
+        return encoded
+
+    encoded_marker = json.dumps(marker)[1:-1]
+    return re.sub(f'"{re.escape(encoded_marker)}(\\d+)"', lambda match: raw_data[int(match.group(1))].to_json(), encoded)
@@ -0,0 +1,62 @@
+from typing import ClassVar, Dict, Optional
+from multichain_explorer.src.models.provider_models.raw_data import RawData
+
+
+class ProviderModel():
+    """
+    Base of the data returned by the providers. The models are slotted and frozen
+    dataclasses, so a block or transaction holds no per-instance dict and can be
+    shared by the caches and the callers
+    """
+    __slots__ = ()
+
+    # Key of the fields in to_dict, for the ones not named as their key
+    KEYS : ClassVar[Dict[str, str]] = {}
+
+    # Fields left out of to_dict when not set
+    OPTIONAL : ClassVar[tuple] = ()
+
+
+    def to_dict(self) -> dict:
+        """The model as a dict, with the keys documented by the provider interface and the raw data decoded"""
+        keys = self.KEYS
+        data = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if value is None and name in self.OPTIONAL:
+                continue
+            if isinstance(value, ProviderModel):
+                value = value.to_dict()
+            elif isinstance(value, RawData):
+                value = value.value
+            elif isinstance(value, tuple):
+                value = [item.to_dict() if isinstance(item, ProviderModel) else item for item in value]
+            data[keys.get(name, name)] = value
+        return data
+
+
+    def _get_field(self, key: str) -> Optional[str]:
+        """Name of the field of a dict key, None when the model has no such key"""
+        for name, name_key in self.KEYS.items():
+            if name_key == key:
+                return name
+        return key if key in self.__slots__ and key not in self.KEYS else None
+
+
+    def __getitem__(self, key: str):
+        """Read a field by its dict key (eg.: block["parentHash"]), as the providers returned dicts before"""
+        name = self._get_field(key)
+        if name is None:
+            raise KeyError(key)
+        value = getattr(self, name)
+        return value.value if isinstance(value, RawData) else value
+
+
+    def __contains__(self, key: str) -> bool:
+        """Whether the dict of the model has a key (eg.: "error" in block is False)"""
+        name = self._get_field(key)
+        return name is not None and (name not in self.OPTIONAL or getattr(self, name) is not None)
+
+
+    # Not iterable, __getitem__ would otherwise make the models look like sequences
+    __iter__ = None
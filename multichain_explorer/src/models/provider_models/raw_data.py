@@ -0,0 +1,64 @@
+import json
+from typing import Callable
+
+
+class RawData():
+    """
+    Raw data of a block or transaction, as given by the upstream API: the bytes of its
+    JSON response, or the object decoded by the upstream client. Nothing is copied or
+    converted when the data is built, the payload is decoded the first time its value
+    is read, and the JSON bytes are passed as they are to the serialized responses
+    """
+    __slots__ = ("_payload", "_encode", "_value", "_decoded")
+
+
+    def __init__(self, payload, encode: Callable = None):
+        """
+        Args:
+            payload: the JSON bytes (or str) of the upstream response, or the object decoded by the upstream client
+            encode: function giving the JSON text of upstream objects the json module can't encode
+                    (eg.: Web3.toJSON for web3 AttributeDicts)
+        """
+        self._payload = payload
+        self._encode = encode
+        self._value = None
+        self._decoded = False
+
+
+    @property
+    def value(self):
+        """The raw data as plain JSON values (dicts, lists, str, numbers), decoded on first read"""
+        if not self._decoded:
+            if isinstance(self._payload, (bytes, bytearray, str)):
+                self._value = json.loads(self._payload)
+            elif self._encode is not None:
+                self._value = json.loads(self._encode(self._payload))
+            else:
+                self._value = self._payload
+            self._decoded = True
+        return self._value
+
+
+    def to_json(self) -> str:
+        """The raw data as JSON, the upstream JSON as it was received when available"""
+        if isinstance(self._payload, str):
+            return self._payload
+        if isinstance(self._payload, (bytes, bytearray)):
+            return self._payload.decode()
+        if self._encode is not None:
+            return self._encode(self._payload)
+        return json.dumps(self._payload, separators = (",", ":"))
+
+
+    def __reduce__(self):
+        # Pickled as its JSON (eg.: by the cache backends), so it stays undecoded and
+        # neither the upstream object nor its encode function have to be picklable
+        return (RawData, (self.to_json(),))
+
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, RawData) and self.value == other.value
+
+
+    def __repr__(self) -> str:
+        return f"RawData({type(self._payload).__name__})"
@@ -1,9 +1,13 @@
 from dataclasses import dataclass
+from typing import ClassVar, Dict
+from multichain_explorer.src.models.provider_models.provider_model import ProviderModel
 
-@dataclass
-class Summary:
+@dataclass(frozen = True, slots = True)
+class Summary(ProviderModel):
     """Class that holds summary data of a blockchain returned by the provider"""
     name: str
-    price: str
-    market_cap: str
-    total_supply: str
\ No newline at end of file
+    price: float
+    market_cap: float
+    total_supply: float
+
+    KEYS : ClassVar[Dict[str, str]] = { "market_cap" : "marketCap", "total_supply" : "totalSupply" }
@@ -1,13 +1,20 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, ClassVar, Dict, Optional
+from multichain_explorer.src.models.provider_models.provider_model import ProviderModel
+from multichain_explorer.src.models.provider_models.raw_data import RawData
 
-@dataclass
-class Transaction:
+@dataclass(frozen = True, slots = True)
+class Transaction(ProviderModel):
     """Class that holds transaction data returned by the provider"""
     id: str
-    address_from: str
-    address_to: str
-    value: str
-    block: str
-    raw_data: Optional[str] = None
-    
\ No newline at end of file
+    address_from: Optional[str]
+    address_to: Optional[str]
+    value: Any
+    block: Optional[int]
+    block_hash: Optional[str] = None
+    # Every transfer of the transaction, on chains whose transactions can hold several (eg.: Terra messages)
+    transfers: Optional[tuple] = None
+    raw_data: Optional[RawData] = None
+
+    KEYS : ClassVar[Dict[str, str]] = { "address_from" : "from", "address_to" : "to", "block_hash" : "blockHash", "raw_data" : "rawData" }
+    OPTIONAL : ClassVar[tuple] = ("transfers", "raw_data")
@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+from typing import Any, ClassVar, Dict
+from multichain_explorer.src.models.provider_models.provider_model import ProviderModel
+
+@dataclass(frozen = True, slots = True)
+class Transfer(ProviderModel):
+    """Class that holds a transfer of funds made by a transaction"""
+    address_from: str
+    address_to: str
+    value: Any
+
+    KEYS : ClassVar[Dict[str, str]] = { "address_from" : "from", "address_to" : "to" }
@@ -1,5 +1,8 @@
 class ProviderOptions():
     raw: bool
+    max_concurrency: int
 
-    def __init__(self, raw = False):
+    def __init__(self, raw = False, max_concurrency = None):
         self.raw = raw
+        # Maximum number of upstream calls in flight, None uses the ConcurrentService default
+        self.max_concurrency = max_concurrency
@@ -0,0 +1,6 @@
+from enum import IntEnum
+
+class RequestPriority(IntEnum):
+    """Priority of the upstream requests waiting for their rate limit, the lowest value goes first"""
+    interactive = 0
+    background = 1
@@ -0,0 +1,181 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List
+from web3.exceptions import BlockNotFound, TransactionNotFound
+from multichain_explorer.src.cache.ttl_cache import TTLCache
+from multichain_explorer.src.models.blockchains import Blockchains
+from multichain_explorer.src.models.provider_options import ProviderOptions
+from multichain_explorer.src.models.resource_types import Resource
+from multichain_explorer.src.providers.not_found_error import NotFoundError
+from multichain_explorer.src.providers.provider import ProviderInterface
+from multichain_explorer.src.providers.provider_factory import BlockchainProvider
+from multichain_explorer.src.services.request_scheduler import RequestScheduler
+from multichain_explorer.src.validators.search_classifier import SearchClassifier
+
+
+class MultichainExplorer():
+    """
+    Entry point exploring several blockchains at once, every chain and every
+    query is run in parallel so a call takes as long as the slowest chain
+    """
+
+    #Can be overridden by the caller, in seconds
+    DEADLINE: float = 10
+
+    # Seconds a search that found nothing on a chain is not retried on it
+    NEGATIVE_TTL: float = 30
+
+    # Upstream answers meaning the searched resource does not exist
+    NOT_FOUND_STATUSES: tuple = (400, 404)
+
+    classifier : SearchClassifier = SearchClassifier()
+
+    def __init__(self,
+                 blockchains: List[Blockchains] = None,
+                 provider_factory: Callable[[Blockchains], ProviderInterface] = BlockchainProvider.get_instance,
+                 deadline: float = None):
+        self.blockchains = blockchains or Blockchains.get_available_blockchains()
+        self.provider_factory = provider_factory
+        self.deadline = deadline or self.DEADLINE
+        self._misses = TTLCache(ttl = self.NEGATIVE_TTL)
+
+
+    def overview(self, num_blocks = 10, num_tx = 10, options = ProviderOptions(), deadline: float = None) -> Dict[str, dict]:
+        """
+        Get the summary, the latest blocks and the latest transactions of every blockchain
+
+        Args:
+            num_blocks: number of latest blocks per blockchain
+            num_tx: number of latest transactions per blockchain
+            options: the provider options passed to every query
+            deadline: maximum time in seconds for the whole overview, defaults to the explorer setting
+
+        Returns:
+            A dict keyed by blockchain id, each one containing:
+                - summary, blocks, transactions: the query results, None when the query failed
+                - errors: a dict with the error message of each failed query
+                - timings: a dict with the duration in seconds of each finished query
+            Queries still running when the deadline is reached are reported as errors
+            and their results are discarded
+        """
+        deadline = deadline or self.deadline
+        queries = {
+            "summary" : lambda provider: provider.get_summary(),
+            "blocks" : lambda provider: provider.get_blocks(num_blocks, options),
+            "transactions" : lambda provider: provider.get_transactions(num_tx, options)
+        }
+
+        overview = {}
+        for blockchain in self.blockchains:
+            overview[blockchain.value] = { "summary" : None, "blocks" : None, "transactions" : None,
+                                           "errors" : {}, "timings" : {} }
+
+        def run(blockchain: Blockchains, query: str):
+            start = time.perf_counter()
+            try:
+                return queries[query](self.provider_factory(blockchain)), None, time.perf_counter() - start
+            except Exception as err:
+                return None, str(err) or type(err).__name__, time.perf_counter() - start
+
+        executor = ThreadPoolExecutor(max_workers = len(self.blockchains) * len(queries))
+        futures = {}
+        for blockchain in self.blockchains:
+            for query in queries:
+                futures[executor.submit(run, blockchain, query)] = (blockchain, query)
+
+        done, not_done = wait(futures, timeout = deadline)
+
+        # Late calls keep running on their threads, but the overview does not wait for them
+        executor.shutdown(wait = False, cancel_futures = True)
+
+        for future in done:
+            blockchain, query = futures[future]
+            data, error, elapsed = future.result()
+            overview[blockchain.value][query] = data
+            overview[blockchain.value]["timings"][query] = elapsed
+            if error is not None:
+                overview[blockchain.value]["errors"][query] = error
+        for future in not_done:
+            blockchain, query = futures[future]
+            overview[blockchain.value]["errors"][query] = f"Deadline of {deadline}s exceeded"
+
+        return overview
+
+
+    def search(self, search_text: str, all_hits = False, deadline: float = None) -> List[dict]:
+        """
+        Search a block, address or transaction on every blockchain it could belong to
+
+        The text is classified once for all the chains, then every candidate is looked
+        up concurrently. Candidates that found nothing recently are not looked up again,
+        lookups failing for other reasons (eg.: throttled or timed out) are retried on the next search
+
+        Args:
+            search_text: the text to search for
+            all_hits: return every hit instead of the first one, the results of the remaining
+                      lookups are discarded as soon as the first hit arrives when not set
+            deadline: maximum time in seconds for the search, defaults to the explorer setting
+
+        Returns:
+            A list of hits, empty if nothing was found, with the following structure:
+            {
+                "blockchain" : blockchain id,
+                "type"       : type ("block", "address" or "transaction"),
+                "data"       : dict with block, address or transaction data
+            }
+        """
+        search_text = search_text.strip()
+        deadline = deadline or self.deadline
+        candidates = [(blockchain, resource) for blockchain, resource in self.classifier.classify(search_text)
+                      if blockchain in self.blockchains and self._misses.get((blockchain, resource, search_text)) is None]
+        if len(candidates) == 0:
+            return []
+
+        def lookup(blockchain: Blockchains, resource: Resource):
+            try:
+                provider = self.provider_factory(blockchain)
+                match resource:
+                    case Resource.block:
+                        data = provider.get_block_by_id(search_text)
+                    case Resource.address:
+                        data = provider.get_address(search_text)
+                    case Resource.transaction:
+                        data = provider.get_transaction_by_id(search_text)
+            except Exception as err:
+                if not self._is_not_found(err):
+                    return None
+                data = None
+
+            if data is None:
+                self._misses.set((blockchain, resource, search_text), True)
+                return None
+            return { "blockchain" : blockchain.value, "type" : resource.value, "data" : data }
+
+        hits = []
+        executor = ThreadPoolExecutor(max_workers = len(candidates))
+        pending = [executor.submit(lookup, blockchain, resource) for blockchain, resource in candidates]
+        end = time.monotonic() + deadline
+        while pending and (all_hits or len(hits) == 0):
+            done, not_done = wait(pending, timeout = max(0, end - time.monotonic()), return_when = FIRST_COMPLETED)
+            if len(done) == 0:
+                break
+            hits.extend(future.result() for future in done if future.result() is not None)
+            pending = list(not_done)
+
+        # Every lookup is already running, the results of the losing ones are discarded
+        executor.shutdown(wait = False)
+
+        # Keep the hits in the order of the candidates, whatever the completion order
+        order = [(blockchain.value, resource.value) for blockchain, resource in candidates]
+        hits.sort(key = lambda hit: order.index((hit["blockchain"], hit["type"])))
+        return hits if all_hits else hits[:1]
+
+
+    def _is_not_found(self, err: Exception) -> bool:
+        """Whether a lookup error means the resource does not exist on the chain, rather than a failed request"""
+        status = RequestScheduler.get_status(err)
+        if status is not None:
+            return status in self.NOT_FOUND_STATUSES
+        # The providers raise NotFoundError when nothing matches, web3 its own not found errors. Other errors
+        # (eg.: web3 ValueError for the JSON-RPC rate limit and server errors) are failed requests
+        return isinstance(err, (NotFoundError, BlockNotFound, TransactionNotFound))
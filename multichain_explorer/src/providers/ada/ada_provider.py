@@ -1,126 +1,221 @@
 
+import json
+import math
 from multichain_explorer.src.models.blockchains import Blockchains
 from multichain_explorer.src.services.coinmarketcap_service import CoinMarketCapService
+from multichain_explorer.src.services.concurrent_service import ConcurrentService
+from multichain_explorer.src.services.request_scheduler import ScheduledClient
 from multichain_explorer.src.validators.ada.ada_validator import AdaValidator
 from multichain_explorer.src.validators.validator import ValidatorInterface
 from multichain_explorer.src.models.provider_options import ProviderOptions
+from multichain_explorer.src.models.provider_models.address import Address
+from multichain_explorer.src.models.provider_models.block import Block
+from multichain_explorer.src.models.provider_models.raw_data import RawData
+from multichain_explorer.src.models.provider_models.summary import Summary
+from multichain_explorer.src.models.provider_models.transaction import Transaction
 from multichain_explorer.src.providers.provider import ProviderInterface
-from blockfrost import BlockFrostApi, ApiError
+from multichain_explorer.src.providers.not_found_error import NotFoundError
+from blockfrost import BlockFrostApi
 
 class AdaProvider(ProviderInterface):
     
     #Must be set externally by the caller
     BLOCKFROST_PROJECT_ID : str = ""
 
+    #Can be overridden by the caller, the Blockfrost mainnet API when not set
+    BLOCKFROST_URL : str = None
+
+    # Settings the provider instances are pooled by
+    SETTINGS : tuple = ("BLOCKFROST_PROJECT_ID", "BLOCKFROST_URL")
+
+    # Maximum number of items in a page of the Blockfrost listings
+    PAGE_SIZE : int = 100
+
+    # Maximum number of blocks before the tip read to find the latest transaction, Cardano blocks can be empty
+    MAX_WALK_BACK_BLOCKS : int = 10
+
     validator: ValidatorInterface = AdaValidator()
     coinMarketCapService : CoinMarketCapService = CoinMarketCapService()
+    concurrentService : ConcurrentService = ConcurrentService()
 
 
     def __init__(self):
-        self.provider = BlockFrostApi(project_id = self.BLOCKFROST_PROJECT_ID)
+        self.provider = ScheduledClient(BlockFrostApi(project_id = self.BLOCKFROST_PROJECT_ID, base_url = self.BLOCKFROST_URL),
+                                        "blockfrost")
 
 
     def get_summary(self):
-        data = CoinMarketCapService().fetchData(Blockchains.ADA.value)
-        cryptoData = data['data'][Blockchains.ADA.value]
-        currency = "USD"
-
-        summary = {
-            "name" : cryptoData['name'],
-            "price" : cryptoData['quote'][currency]['price'],
-            "marketCap" : cryptoData['quote'][currency]['market_cap'],
-            "totalSupply" : cryptoData['total_supply']
-        }
+        # Served from the batched, cached quotes of all the chains
+        cryptoData = self.coinMarketCapService.fetch_quote(Blockchains.ADA.value)
+        currency = self.coinMarketCapService.currency
+
+        summary = Summary(
+            name = cryptoData['name'],
+            price = cryptoData['quote'][currency]['price'],
+            market_cap = cryptoData['quote'][currency]['market_cap'],
+            total_supply = cryptoData['total_supply']
+        )
         return summary
 
 
+    def fetch_latest_block_number(self) -> int:
+        """Fetches the number of the latest ADA block"""
+        return self.provider.block_latest().height
+
+
     def get_blocks(self, num_blocks = 10, options = ProviderOptions()):
-        latest_block_number = self.provider.block_latest().height
-        latest_blocks = []
-
-        for block_number in range(latest_block_number, 
-                                latest_block_number - num_blocks, 
-                                -1):
-            block_data = self.get_block_by_id(block_number)
-            latest_blocks.append(block_data)
-        
-        return latest_blocks
+        if self.rollingWindow is not None:
+            blocks = self.rollingWindow.get_blocks(num_blocks, options)
+            if blocks is not None:
+                return blocks
+
+        if num_blocks <= 0:
+            return []
+
+        latest_block = self.get_block_by_id('latest', options)
+        num_previous = min(num_blocks - 1, latest_block.id)
+
+        def get_page(page: int) -> list:
+            # The blocks before the tip are listed oldest first, PAGE_SIZE blocks per page
+            blocks = self.provider.blocks_previous(latest_block.hash, count = self.PAGE_SIZE, page = page)
+            return [self._get_block_data(block, options) for block in reversed(blocks)]
+
+        def get_page_errors(page: int, err: Exception) -> list:
+            # A failed page is reported in place of its blocks
+            first_block_number = latest_block.id - 1 - (page - 1) * self.PAGE_SIZE
+            return [{ "id" : block_number, "error" : str(err) }
+                    for block_number in range(first_block_number, max(first_block_number - self.PAGE_SIZE, -1), -1)]
+
+        # Pages are fetched concurrently
+        pages = self.concurrentService.map_ordered(
+                    get_page,
+                    range(1, math.ceil(num_previous / self.PAGE_SIZE) + 1),
+                    on_error = get_page_errors,
+                    max_concurrency = options.max_concurrency
+                )
+        return [latest_block] + [block for page in pages for block in page][:num_previous]
 
 
     def get_block_by_id(self, block_id = 'latest', options = ProviderOptions()):
-        try:
-            if block_id == 'latest':
-                block = self.provider.block_latest()
-            else:
-                block = self.provider.block(block_id)
-
-            block_data = {
-                "id" : block.height,
-                "miner" : block.slot_leader,
-                "difficulty" : "-",
-                "timestamp" : block.time,
-                "block_hash" : block.hash
-            }
-
-            if options.raw:
-                    block_data["rawData"] = {}
-            
-        except ApiError as e:
-            print(e)
+        if block_id == 'latest' and self.headTracker is not None:
+            return self.headTracker.get_latest_block(options)
+
+        # Errors are raised, so get_blocks reports them and the scheduler sees the throttled requests
+        if block_id == 'latest':
+            block = self.provider.block_latest()
+        else:
+            block = self.provider.block(block_id)
+
+        return self._get_block_data(block, options)
+
 
-        return block_data
+    def _get_block_data(self, block, options = ProviderOptions()) -> Block:
+        """Builds the block data from a Blockfrost block (shared with the async provider)"""
+        return Block(
+            id = block.height,
+            miner = block.slot_leader,
+            difficulty = "-",
+            timestamp = block.time,
+            hash = block.hash,
+            parent_hash = block.previous_block,
+            raw_data = RawData(block, self._encode_namespace) if options.raw else None
+        )
+
+
+    @staticmethod
+    def _encode_namespace(namespace) -> str:
+        """JSON of a Blockfrost response object, with its nested objects"""
+        return json.dumps(namespace, default = vars)
 
 
     def get_transactions(self, num_tx = 10, options = ProviderOptions()):
         """Returns a list of transactions, default number of transactions is 10"""
-        try:
-            block_transactions = self.provider.block_latest_transactions()
-            latest_transactions = []
+        if self.rollingWindow is not None:
+            transactions = self.rollingWindow.get_transactions(num_tx, options)
+            if transactions is not None:
+                return transactions
 
-            # Get the last num_tx transactions from block (default is 10)
-            for transaction_id in block_transactions[-num_tx:]:
-                #Convert id from binary hex to string
-                transaction_data = self.get_transaction_by_id(transaction_id)
-                latest_transactions.append(transaction_data)
+        latest_block = self.get_block_by_id('latest')
+        if num_tx <= self.PAGE_SIZE:
+            # Newest first, so a single page holds the last num_tx transactions
+            block_transactions = list(reversed(self.provider.block_transactions(latest_block.hash, count = num_tx, order = "desc")))
+        else:
+            block_transactions = self.provider.block_transactions(latest_block.hash, gather_pages = True)
 
-        except ValueError as err:
-            # Log exception
-            raise
-        return latest_transactions
+        # Get the last num_tx transactions from block (default is 10)
+        return self._get_block_transactions_data(latest_block, block_transactions[-num_tx:], options)
+
+
+    def get_block_transactions(self, block_id, options = ProviderOptions()):
+        """Get all the transactions of a Cardano block"""
+        block = self.get_block_by_id(block_id)
+        block_transactions = self.provider.block_transactions(block.hash, gather_pages = True)
+        return self._get_block_transactions_data(block, block_transactions, options)
 
 
+    def _get_block_transactions_data(self, block: dict, block_transactions: list, options = ProviderOptions()) -> list:
+        """
+        Builds the data of transactions of a known block, only their utxos are fetched (concurrently),
+        the rest of the transaction data is taken from the block
+        """
+        return self.concurrentService.map_ordered(
+                    lambda transaction_id: self._get_utxos_data(self.provider.transaction_utxos(transaction_id), block.id, block.hash, options),
+                    block_transactions,
+                    max_concurrency = options.max_concurrency
+                )
+
 
     def get_transaction_by_id(self, tx_id = 'latest', options = ProviderOptions()):
         """Get a Cardano transaction by id"""
 
         if tx_id == 'latest':
-            tx_id = self.provider.block_latest_transactions()[0]
+            # The newest transaction, walking back from the tip block over the empty blocks
+            block = self.get_block_by_id('latest')
+            for _ in range(self.MAX_WALK_BACK_BLOCKS + 1):
+                block_transactions = self.provider.block_transactions(block.hash, count = 1, order = "desc")
+                if block_transactions:
+                    return self._get_block_transactions_data(block, block_transactions, options)[0]
+                if block.parent_hash is None:
+                    break
+                block = self.get_block_by_id(block.parent_hash)
+            raise NotFoundError(f"No transaction in the latest {self.MAX_WALK_BACK_BLOCKS + 1} blocks")
         
         transaction = self.provider.transaction(tx_id)
         tx_utxos = self.provider.transaction_utxos(tx_id)
 
-        transaction_data = {
-            "id"    : transaction.hash, #tx_id,
-            "from"  : tx_utxos.inputs[0].address, 
-            "to"    : tx_utxos.outputs[0].address,
-            "value" : tx_utxos.outputs[0].amount[0].quantity, 
-            "block" : transaction.block_height,
-            "block_hash" : transaction.block
-        }
+        return self._get_transaction_data(transaction, tx_utxos, options)
+
+
+    def _get_transaction_data(self, transaction, tx_utxos, options = ProviderOptions()) -> Transaction:
+        """Builds the transaction data from a Blockfrost transaction and its utxos (shared with the async provider)"""
+        return self._get_utxos_data(tx_utxos, transaction.block_height, transaction.block, options)
 
-        return transaction_data
+
+    def _get_utxos_data(self, tx_utxos, block_height: int, block_hash: str, options = ProviderOptions()) -> Transaction:
+        """Builds the transaction data from the utxos of a transaction and its block (shared with the async provider)"""
+        return Transaction(
+            id = tx_utxos.hash,
+            address_from = tx_utxos.inputs[0].address,
+            address_to = tx_utxos.outputs[0].address,
+            value = tx_utxos.outputs[0].amount[0].quantity,
+            block = block_height,
+            block_hash = block_hash,
+            raw_data = RawData(tx_utxos, self._encode_namespace) if options.raw else None
+        )
 
 
     def get_address(self, address_id):
         try:
             address_info = self.provider.address(address_id)
-            return {
-                "address"   : address_id,
-                "balance"   : address_info.amount[0].quantity
-            }
+            return self._get_address_data(address_id, address_info)
         except Exception as err:
             raise
 
+
+    def _get_address_data(self, address_id, address_info) -> Address:
+        """Builds the address data from a Blockfrost address (shared with the async provider)"""
+        return Address(address = address_id, balance = address_info.amount[0].quantity)
+
     
     def search_resource(self, search_text):
         if self.validator.is_block(search_text):
@@ -133,4 +228,4 @@ class AdaProvider(ProviderInterface):
             transaction = self.get_transaction_by_id(search_text)
             return { "type" : "transaction", "data" : transaction }
             
-        raise
\ No newline at end of file
+        raise NotFoundError(f"No block, address or transaction matches {search_text}")
\ No newline at end of file
@@ -0,0 +1,165 @@
+import asyncio
+import math
+from blockfrost.config import ApiUrls
+from blockfrost.utils import convert_json_to_object
+from multichain_explorer.src.models.blockchains import Blockchains
+from multichain_explorer.src.services.async_coinmarketcap_service import AsyncCoinMarketCapService
+from multichain_explorer.src.services.async_fetch_service import AsyncFetchService
+from multichain_explorer.src.services.concurrent_service import ConcurrentService
+from multichain_explorer.src.services.request_scheduler import ScheduledClient
+from multichain_explorer.src.validators.ada.ada_validator import AdaValidator
+from multichain_explorer.src.validators.validator import ValidatorInterface
+from multichain_explorer.src.models.provider_options import ProviderOptions
+from multichain_explorer.src.models.provider_models.summary import Summary
+from multichain_explorer.src.providers.async_provider import AsyncProviderInterface
+from multichain_explorer.src.providers.ada.ada_provider import AdaProvider
+from multichain_explorer.src.providers.not_found_error import NotFoundError
+
+
+class AsyncAdaProvider(AsyncProviderInterface):
+    """
+    Asynchronous Cardano provider calling the Blockfrost REST API,
+    configured through the AdaProvider settings
+    """
+
+    BLOCKFROST_API_URL : str = f"{ApiUrls.mainnet.value}/v0"
+
+    PAGE_SIZE : int = AdaProvider.PAGE_SIZE
+    MAX_WALK_BACK_BLOCKS : int = AdaProvider.MAX_WALK_BACK_BLOCKS
+
+    validator: ValidatorInterface = AdaValidator()
+    coinMarketCapService : AsyncCoinMarketCapService = AsyncCoinMarketCapService()
+    concurrentService : ConcurrentService = ConcurrentService()
+
+    # The data is built as in the sync provider
+    _get_block_data = AdaProvider._get_block_data
+    _get_transaction_data = AdaProvider._get_transaction_data
+    _get_utxos_data = AdaProvider._get_utxos_data
+    _encode_namespace = staticmethod(AdaProvider._encode_namespace)
+    _get_address_data = AdaProvider._get_address_data
+
+
+    def __init__(self):
+        self.fetchService = ScheduledClient(AsyncFetchService.get_shared(), "blockfrost", asynchronous = True)
+
+
+    async def _get(self, path: str, parameters = None):
+        """Call a Blockfrost endpoint, the response is converted to objects as the Blockfrost SDK does"""
+        data = await self.fetchService.fetch_json(f"{self.BLOCKFROST_API_URL}{path}",
+                                                  parameters,
+                                                  { "project_id" : AdaProvider.BLOCKFROST_PROJECT_ID })
+        return convert_json_to_object(data)
+
+
+    async def get_summary(self):
+        # Served from the batched, cached quotes of all the chains
+        cryptoData = await self.coinMarketCapService.fetch_quote(Blockchains.ADA.value)
+        currency = self.coinMarketCapService.currency
+
+        summary = Summary(
+            name = cryptoData['name'],
+            price = cryptoData['quote'][currency]['price'],
+            market_cap = cryptoData['quote'][currency]['market_cap'],
+            total_supply = cryptoData['total_supply']
+        )
+        return summary
+
+
+    async def get_latest_block_number(self) -> int:
+        """Returns the number of the latest ADA block"""
+        return (await self._get("/blocks/latest")).height
+
+
+    async def get_blocks(self, num_blocks = 10, options = ProviderOptions()):
+        if num_blocks <= 0:
+            return []
+
+        latest_block = await self.get_block_by_id('latest', options)
+        num_previous = min(num_blocks - 1, latest_block.id)
+
+        async def get_page(page: int) -> list:
+            # The blocks before the tip are listed oldest first, PAGE_SIZE blocks per page
+            blocks = await self._get(f"/blocks/{latest_block['hash']}/previous", { "count" : self.PAGE_SIZE, "page" : page })
+            return [self._get_block_data(block, options) for block in reversed(blocks)]
+
+        def get_page_errors(page: int, err: Exception) -> list:
+            # A failed page is reported in place of its blocks
+            first_block_number = latest_block.id - 1 - (page - 1) * self.PAGE_SIZE
+            return [{ "id" : block_number, "error" : str(err) }
+                    for block_number in range(first_block_number, max(first_block_number - self.PAGE_SIZE, -1), -1)]
+
+        # Pages are fetched concurrently
+        pages = await self.concurrentService.gather_ordered(
+                    get_page,
+                    range(1, math.ceil(num_previous / self.PAGE_SIZE) + 1),
+                    on_error = get_page_errors,
+                    max_concurrency = options.max_concurrency
+                )
+        return [latest_block] + [block for page in pages for block in page][:num_previous]
+
+
+    async def get_block_by_id(self, block_id = 'latest', options = ProviderOptions()):
+        block = await self._get(f"/blocks/{block_id}")
+        return self._get_block_data(block, options)
+
+
+    async def get_transactions(self, num_tx = 10, options = ProviderOptions()):
+        """Returns a list of transactions, default number of transactions is 10"""
+        latest_block = await self.get_block_by_id('latest')
+        # Newest first, so a single page holds the last num_tx transactions
+        block_transactions = await self._get(f"/blocks/{latest_block['hash']}/txs",
+                                             { "count" : min(num_tx, self.PAGE_SIZE), "order" : "desc" })
+
+        # Only the utxos are fetched, the rest of the transaction data is taken from the block
+        return await self.concurrentService.gather_ordered(
+                    lambda transaction_id: self._get_block_transaction_data(latest_block, transaction_id, options),
+                    list(reversed(block_transactions)),
+                    max_concurrency = options.max_concurrency
+                )
+
+
+    async def _get_block_transaction_data(self, block: dict, transaction_id: str, options = ProviderOptions()) -> dict:
+        tx_utxos = await self._get(f"/txs/{transaction_id}/utxos")
+        return self._get_utxos_data(tx_utxos, block.id, block.hash, options)
+
+
+    async def get_transaction_by_id(self, tx_id = 'latest', options = ProviderOptions()):
+        """Get a Cardano transaction by id"""
+        if tx_id == 'latest':
+            # The newest transaction, walking back from the tip block over the empty blocks as the sync provider
+            block = await self.get_block_by_id('latest')
+            for _ in range(self.MAX_WALK_BACK_BLOCKS + 1):
+                block_transactions = await self._get(f"/blocks/{block.hash}/txs", { "count" : 1, "order" : "desc" })
+                if block_transactions:
+                    return await self._get_block_transaction_data(block, block_transactions[0], options)
+                if block.parent_hash is None:
+                    break
+                block = await self.get_block_by_id(block.parent_hash)
+            raise NotFoundError(f"No transaction in the latest {self.MAX_WALK_BACK_BLOCKS + 1} blocks")
+
+        transaction, tx_utxos = await asyncio.gather(self._get(f"/txs/{tx_id}"),
+                                                     self._get(f"/txs/{tx_id}/utxos"))
+        return self._get_transaction_data(transaction, tx_utxos, options)
+
+
+    async def get_address(self, address_id):
+        address_info = await self._get(f"/addresses/{address_id}")
+        return self._get_address_data(address_id, address_info)
+
+
+    async def search_resource(self, search_text):
+        if self.validator.is_block(search_text):
+            block = await self.get_block_by_id(search_text)
+            return { "type" : "block", "data" : block }
+        if self.validator.is_address(search_text):
+            address = await self.get_address(search_text)
+            return { "type" : "address", "data" : address }
+        if self.validator.is_transaction(search_text):
+            transaction = await self.get_transaction_by_id(search_text)
+            return { "type" : "transaction", "data" : transaction }
+
+        raise NotFoundError(f"No block, address or transaction matches {search_text}")
+
+
+    async def close(self):
+        await self.fetchService.close()
@@ -1,11 +1,22 @@
 
 from multichain_explorer.src.models.blockchains import Blockchains
 from multichain_explorer.src.services.coinmarketcap_service import CoinMarketCapService
+from multichain_explorer.src.services.concurrent_service import ConcurrentService
+from multichain_explorer.src.services.request_scheduler import RequestScheduler, ScheduledClient
 from multichain_explorer.src.validators.algo.algo_validator import AlgoValidator
 from multichain_explorer.src.validators.validator import ValidatorInterface
 from multichain_explorer.src.models.provider_options import ProviderOptions
+from multichain_explorer.src.models.provider_models.address import Address
+from multichain_explorer.src.models.provider_models.block import Block
+from multichain_explorer.src.models.provider_models.raw_data import RawData
+from multichain_explorer.src.models.provider_models.summary import Summary
+from multichain_explorer.src.models.provider_models.transaction import Transaction
 from multichain_explorer.src.providers.provider import ProviderInterface
+from multichain_explorer.src.providers.not_found_error import NotFoundError
 
+import base64
+from typing import List
+from algosdk.error import IndexerHTTPError
 from algosdk.v2client import algod
 from algosdk.v2client import indexer
 
@@ -17,131 +28,259 @@ class AlgoProvider(ProviderInterface):
     ALGOD_ADDRESS : str   = ""
     INDEXER_ADDRESS : str = ""
 
+    # Settings the provider instances are pooled by
+    SETTINGS : tuple = ("ALGOD_TOKEN", "ALGOD_ADDRESS", "INDEXER_ADDRESS")
+
+    # Maximum number of rounds before the tip read to fill the latest transactions
+    MAX_WALK_BACK_ROUNDS : int = 10
+
+    # Results per indexer search request, the following pages are read with the next-token
+    SEARCH_PAGE_SIZE : int = 1000
+
     validator: ValidatorInterface = AlgoValidator()
     coinMarketCapService : CoinMarketCapService = CoinMarketCapService()
+    concurrentService : ConcurrentService = ConcurrentService()
+
+    # Addresses of the indexers without the block headers search (before 3.x), not probed again
+    _indexersWithoutBlockHeaders : set = set()
 
 
     def __init__(self):
         headers = { "X-API-Key": self.ALGOD_TOKEN }
-        self.provider = algod.AlgodClient(self.ALGOD_TOKEN, self.ALGOD_ADDRESS, headers)
-        self.provider.indexer = indexer.IndexerClient(self.ALGOD_TOKEN, self.INDEXER_ADDRESS, headers)
+        # algod and the indexer are rate limited apart
+        self.provider = ScheduledClient(algod.AlgodClient(self.ALGOD_TOKEN, self.ALGOD_ADDRESS, headers), "algod")
+        self.provider.indexer = ScheduledClient(indexer.IndexerClient(self.ALGOD_TOKEN, self.INDEXER_ADDRESS, headers), "indexer")
 
 
     def get_summary(self):
-        data = CoinMarketCapService().fetchData(Blockchains.ALGO.value)
-        cryptoData = data['data'][Blockchains.ALGO.value]
-        currency = "USD"
-
-        summary = {
-            "name" : cryptoData['name'],
-            "price" : cryptoData['quote'][currency]['price'],
-            "marketCap" : cryptoData['quote'][currency]['market_cap'],
-            "totalSupply" : cryptoData['total_supply']
-        }
+        # Served from the batched, cached quotes of all the chains
+        cryptoData = self.coinMarketCapService.fetch_quote(Blockchains.ALGO.value)
+        currency = self.coinMarketCapService.currency
+
+        summary = Summary(
+            name = cryptoData['name'],
+            price = cryptoData['quote'][currency]['price'],
+            market_cap = cryptoData['quote'][currency]['market_cap'],
+            total_supply = cryptoData['total_supply']
+        )
         return summary
 
 
-    def get_blocks(self, num_blocks = 10, options = ProviderOptions()):
-        latest_block_number = self.provider.status()['last-round']
-        latest_blocks = []
+    def fetch_latest_block_number(self) -> int:
+        """Fetches the number of the latest ALGO block"""
+        return self.provider.status()['last-round']
 
-        for block_number in range(latest_block_number, 
-                                latest_block_number - num_blocks, 
-                                -1):
-            block_data = self.get_block_by_id(block_number)
-            latest_blocks.append(block_data)
-        
-        return latest_blocks
+
+    def get_blocks(self, num_blocks = 10, options = ProviderOptions()):
+        if self.rollingWindow is not None:
+            blocks = self.rollingWindow.get_blocks(num_blocks, options)
+            if blocks is not None:
+                return blocks
+
+        latest_block_number = self.get_latest_block_number()
+
+        block_numbers = range(latest_block_number, 
+                              max(latest_block_number - num_blocks, -1),
+                              -1)
+        if len(block_numbers) == 0:
+            return []
+
+        # The whole range is read from the indexer block headers in a single search
+        headers = {}
+        if self.INDEXER_ADDRESS not in self._indexersWithoutBlockHeaders:
+            try:
+                headers = { header['round'] : header
+                            for header in self._search_block_headers(block_numbers[-1], block_numbers[0]) }
+            except IndexerHTTPError as err:
+                # Indexers before 3.x have no block headers search, the other errors are raised
+                if not self._is_not_found(err):
+                    raise
+                self._indexersWithoutBlockHeaders.add(self.INDEXER_ADDRESS)
+
+        # Rounds the indexer has not reached yet are fetched from algod concurrently,
+        # a failed block is reported in its place
+        missing = [block_number for block_number in block_numbers if block_number not in headers]
+        fetched = dict(zip(missing, self.concurrentService.map_ordered(
+                    lambda block_number: self.get_block_by_id(block_number, options),
+                    missing,
+                    on_error = lambda block_number, err: { "id" : block_number, "error" : str(err) },
+                    max_concurrency = options.max_concurrency
+                )))
+
+        return [self._get_block_header_data(headers[block_number], options) if block_number in headers
+                else fetched[block_number]
+                for block_number in block_numbers]
 
 
     def get_block_by_id(self, block_id = 'latest', options = ProviderOptions()):
-        try:
-            if block_id == 'latest':
-                status = self.provider.status()
-                last_round = status.get("last-round")
-                block = self.provider.block_info(last_round)
+        # Errors are raised, so get_blocks reports them and the scheduler sees the throttled requests
+        if block_id == 'latest':
+            if self.headTracker is not None:
+                return self.headTracker.get_latest_block(options)
+            block = self.provider.block_info(self.get_latest_block_number())
+        else:
+            block_id = int(block_id) #Cast to int
+            block = self.provider.block_info(block_id)
+
+        return self._get_block_data(block, options)
+
+
+    def _get_block_data(self, block, options = ProviderOptions()) -> Block:
+        """Builds the block data from an algod block (shared with the async provider)"""
+        return Block(
+            id = block['block']['rnd'],
+            miner = "-",
+            difficulty = "-",
+            timestamp = block['block']['ts'],
+            hash = None, # not part of the block, rounds are final once produced
+            parent_hash = block['block'].get('prev'),
+            raw_data = RawData(block) if options.raw else None
+        )
+
+
+    def _get_block_header_data(self, header, options = ProviderOptions()) -> Block:
+        """Builds the block data from an indexer block header, as _get_block_data does from an algod block"""
+        previous_hash = header.get('previous-block-hash')
+        return Block(
+            id = header['round'],
+            miner = "-",
+            difficulty = "-",
+            timestamp = header['timestamp'],
+            hash = None, # not part of the block, rounds are final once produced
+            # base64 in the indexer, algod gives it as blk- and the unpadded base32
+            parent_hash = "blk-" + base64.b32encode(base64.b64decode(previous_hash)).decode().rstrip("=")
+                          if previous_hash else None,
+            raw_data = RawData(header) if options.raw else None
+        )
+
+
+    @staticmethod
+    def _is_not_found(err: IndexerHTTPError) -> bool:
+        """Whether an indexer error is a 404, read from the message on the SDK versions without status code"""
+        status = RequestScheduler.get_status(err)
+        if status is not None:
+            return status == 404
+        return "not found" in str(err).lower()
+
+
+    def _search_block_headers(self, min_round: int, max_round: int) -> List[dict]:
+        """Read the headers of a range of rounds from the indexer, following the next-token pages"""
+        headers = []
+        next_page = None
+        while True:
+            parameters = { "min-round" : min_round, "max-round" : max_round, "limit" : self.SEARCH_PAGE_SIZE }
+            if next_page:
+                parameters["next"] = next_page
+            page = self.provider.indexer.indexer_request("GET", "/block-headers", parameters)
+            headers.extend(page.get('blocks', []))
+
+            next_page = page.get('next-token')
+            if not next_page or len(page.get('blocks', [])) < self.SEARCH_PAGE_SIZE:
+                return headers
+
+
+    def _search_transactions(self, min_round: int, max_round: int) -> List[dict]:
+        """
+        Read the transactions of a range of rounds from the indexer, following the next-token pages
+
+        Returns:
+            The indexer transactions, in the order of the chain
+        """
+        transactions = []
+        next_page = None
+        while True:
+            if min_round == max_round:
+                page = self.provider.indexer.search_transactions(block = min_round, limit = self.SEARCH_PAGE_SIZE, next_page = next_page)
             else:
-                block_id = int(block_id) #Cast to int
-                block = self.provider.block_info(block_id)
+                page = self.provider.indexer.search_transactions(min_round = min_round, max_round = max_round,
+                                                                 limit = self.SEARCH_PAGE_SIZE, next_page = next_page)
+            transactions.extend(page['transactions'])
 
-            block_data = {
-                "id" : block['block']['rnd'],
-                "miner" : "-",
-                "difficulty" : "-",
-                "timestamp": block['block']['ts']
-            }
+            next_page = page.get('next-token')
+            if not next_page or len(page['transactions']) < self.SEARCH_PAGE_SIZE:
+                return transactions
 
-            if options.raw:
-                    block_data["rawData"] = {}
 
-            return block_data
-        except Exception as e:
-            print(e)
+    def get_transactions(self, num_tx = 10, options = ProviderOptions()):
+        """
+        Returns a list of transactions, default number of transactions is 10
 
+        The transactions are read from the tip round, walking back to the previous rounds
+        (up to MAX_WALK_BACK_ROUNDS) when the tip round has fewer than num_tx transactions.
+        Every walk back searches twice as many rounds as the previous one
+        """
+        if self.rollingWindow is not None:
+            transactions = self.rollingWindow.get_transactions(num_tx, options)
+            if transactions is not None:
+                return transactions
 
-    def get_transactions(self, num_tx = 10, options = ProviderOptions()):
-        """Returns a list of transactions, default number of transactions is 10"""
-        try:
-            last_round = self.provider.status()['last-round']
-            #Get latest transactions
-            block_transactions = self.provider.indexer.search_transactions(block=last_round)['transactions']
-            latest_transactions = []
-
-            # Get the last num_tx transactions from block (default is 10)
-            for transaction in block_transactions[-num_tx:]:
-                #Convert id from binary hex to string
-                transaction_data = self.get_transaction_by_id(transaction['id'])
-                latest_transactions.append(transaction_data)
-
-        except ValueError as err:
-            # Log exception
-            raise
-        return latest_transactions
+        last_round = self.get_latest_block_number()
+        block_transactions = self._search_transactions(last_round, last_round)
+
+        oldest_round = last_round
+        span = 1
+        while len(block_transactions) < num_tx and oldest_round > 0 and last_round - oldest_round + 1 < self.MAX_WALK_BACK_ROUNDS:
+            max_round = oldest_round - 1
+            oldest_round = max(max_round - span + 1, last_round - self.MAX_WALK_BACK_ROUNDS + 1, 0)
+            block_transactions = self._search_transactions(oldest_round, max_round) + block_transactions
+            span *= 2
+
+        # The search results already hold the whole transactions, get the last num_tx (default is 10)
+        return [self._get_transaction_data(transaction, options) for transaction in block_transactions[-num_tx:]]
+
+
+    def get_block_transactions(self, block_id, options = ProviderOptions()):
+        """Get all the transactions of an Algorand round"""
+        block_transactions = self._search_transactions(int(block_id), int(block_id))
+
+        # The search results already hold the whole transactions
+        return [self._get_transaction_data(transaction, options) for transaction in block_transactions]
 
 
     def get_transaction_by_id(self, tx_id = 'latest', options = ProviderOptions()):
         """Get an Algorand transaction by id"""
 
         if tx_id == 'latest':
-            last_round = self.provider.status()['last-round']
-            #Get latest transaction id
-            tx_id = self.provider.indexer.search_transactions(block=last_round)['transactions'][-1]['id']
-        
+            # The search results already hold the whole transactions
+            last_round = self.get_latest_block_number()
+            return self._get_transaction_data(self._search_transactions(last_round, last_round)[-1], options)
+
         transaction = self.provider.indexer.transaction(tx_id)
+        return self._get_transaction_data(transaction['transaction'], options)
+
+
+    def _get_transaction_data(self, transaction, options = ProviderOptions()) -> Transaction:
+        """Builds the transaction data from an indexer transaction (shared with the async provider)"""
 
         #Get receiver based on transaction type
         receiver = '-'
         value = 0
-        tx_type = transaction['transaction']['tx-type']
+        tx_type = transaction['tx-type']
 
         if tx_type == 'pay':
-            tx_type_details = transaction['transaction']['payment-transaction']
+            tx_type_details = transaction['payment-transaction']
             receiver = tx_type_details['receiver']
             value = tx_type_details['amount']
         elif tx_type == 'axfer':
-            tx_type_details = transaction['transaction']['asset-transfer-transaction']
+            tx_type_details = transaction['asset-transfer-transaction']
             receiver = tx_type_details['receiver']
             value = tx_type_details['amount']
 
-        transaction_data = {
-            "id"         : transaction['transaction']['id'],
-            "from"       : transaction['transaction']['sender'],
-            "to"         : receiver,
-            "value"      : value, 
-            "block"      : transaction['transaction']['confirmed-round'],
-        }
-
-        return transaction_data
+        return Transaction(
+            id = transaction['id'],
+            address_from = transaction['sender'],
+            address_to = receiver,
+            value = value,
+            block = transaction['confirmed-round'],
+            raw_data = RawData(transaction) if options.raw else None
+        )
 
 
     def get_address(self, address_id):
         """Get the info of an Algorand account"""
         try:
             account_info = self.provider.account_info(address_id)
-            return {
-                "address" : address_id,
-                "balance" : account_info.get("amount")
-            }
+            return Address(address = address_id, balance = account_info.get("amount"))
         except Exception as err:
             raise
 
@@ -157,4 +296,4 @@ class AlgoProvider(ProviderInterface):
             transaction = self.get_transaction_by_id(search_text)
             return { "type" : "transaction", "data" : transaction }
             
-        raise
\ No newline at end of file
+        raise NotFoundError(f"No block, address or transaction matches {search_text}")
\ No newline at end of file
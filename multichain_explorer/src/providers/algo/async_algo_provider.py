@@ -0,0 +1,133 @@
+from multichain_explorer.src.models.blockchains import Blockchains
+from multichain_explorer.src.services.async_coinmarketcap_service import AsyncCoinMarketCapService
+from multichain_explorer.src.services.async_fetch_service import AsyncFetchService
+from multichain_explorer.src.services.concurrent_service import ConcurrentService
+from multichain_explorer.src.services.request_scheduler import ScheduledClient
+from multichain_explorer.src.validators.algo.algo_validator import AlgoValidator
+from multichain_explorer.src.validators.validator import ValidatorInterface
+from multichain_explorer.src.models.provider_options import ProviderOptions
+from multichain_explorer.src.models.provider_models.address import Address
+from multichain_explorer.src.models.provider_models.summary import Summary
+from multichain_explorer.src.providers.async_provider import AsyncProviderInterface
+from multichain_explorer.src.providers.algo.algo_provider import AlgoProvider
+from multichain_explorer.src.providers.not_found_error import NotFoundError
+
+
+class AsyncAlgoProvider(AsyncProviderInterface):
+    """
+    Asynchronous Algorand provider calling the algod and indexer REST APIs,
+    configured through the AlgoProvider settings
+    """
+
+    validator: ValidatorInterface = AlgoValidator()
+    coinMarketCapService : AsyncCoinMarketCapService = AsyncCoinMarketCapService()
+    concurrentService : ConcurrentService = ConcurrentService()
+
+    # The data is built as in the sync provider
+    _get_block_data = AlgoProvider._get_block_data
+    _get_transaction_data = AlgoProvider._get_transaction_data
+
+
+    def __init__(self):
+        # algod and the indexer are rate limited apart
+        self.fetchService = ScheduledClient(AsyncFetchService.get_shared(), "algod", asynchronous = True)
+        self.indexerFetchService = ScheduledClient(AsyncFetchService.get_shared(), "indexer", asynchronous = True)
+
+
+    async def _algod(self, path: str, parameters = None):
+        """Call an algod endpoint, with the same headers as the algosdk client"""
+        headers = { "X-API-Key": AlgoProvider.ALGOD_TOKEN, "X-Algo-API-Token": AlgoProvider.ALGOD_TOKEN }
+        return await self.fetchService.fetch_json(f"{AlgoProvider.ALGOD_ADDRESS}{path}", parameters, headers)
+
+
+    async def _indexer(self, path: str, parameters = None):
+        """Call an indexer endpoint, with the same headers as the algosdk client"""
+        headers = { "X-API-Key": AlgoProvider.ALGOD_TOKEN, "X-Indexer-API-Token": AlgoProvider.ALGOD_TOKEN }
+        return await self.indexerFetchService.fetch_json(f"{AlgoProvider.INDEXER_ADDRESS}{path}", parameters, headers)
+
+
+    async def get_summary(self):
+        # Served from the batched, cached quotes of all the chains
+        cryptoData = await self.coinMarketCapService.fetch_quote(Blockchains.ALGO.value)
+        currency = self.coinMarketCapService.currency
+
+        summary = Summary(
+            name = cryptoData['name'],
+            price = cryptoData['quote'][currency]['price'],
+            market_cap = cryptoData['quote'][currency]['market_cap'],
+            total_supply = cryptoData['total_supply']
+        )
+        return summary
+
+
+    async def get_latest_block_number(self) -> int:
+        """Returns the number of the latest ALGO block"""
+        return (await self._algod("/v2/status"))['last-round']
+
+
+    async def get_blocks(self, num_blocks = 10, options = ProviderOptions()):
+        latest_block_number = await self.get_latest_block_number()
+
+        block_numbers = range(latest_block_number,
+                              latest_block_number - num_blocks,
+                              -1)
+
+        # Blocks are fetched concurrently, a failed block is reported in its place
+        return await self.concurrentService.gather_ordered(
+                    lambda block_number: self.get_block_by_id(block_number, options),
+                    block_numbers,
+                    on_error = lambda block_number, err: { "id" : block_number, "error" : str(err) },
+                    max_concurrency = options.max_concurrency
+                )
+
+
+    async def get_block_by_id(self, block_id = 'latest', options = ProviderOptions()):
+        if block_id == 'latest':
+            block_id = await self.get_latest_block_number()
+
+        block = await self._algod(f"/v2/blocks/{int(block_id)}", { "format" : "json" })
+        return self._get_block_data(block, options)
+
+
+    async def get_transactions(self, num_tx = 10, options = ProviderOptions()):
+        """Returns a list of transactions, default number of transactions is 10"""
+        last_round = await self.get_latest_block_number()
+        block_transactions = (await self._indexer("/v2/transactions", { "round" : last_round }))['transactions']
+
+        # The search results already hold the whole transactions
+        return [self._get_transaction_data(transaction, options) for transaction in block_transactions[-num_tx:]]
+
+
+    async def get_transaction_by_id(self, tx_id = 'latest', options = ProviderOptions()):
+        """Get an Algorand transaction by id"""
+        if tx_id == 'latest':
+            last_round = await self.get_latest_block_number()
+            transactions = (await self._indexer("/v2/transactions", { "round" : last_round }))['transactions']
+            return self._get_transaction_data(transactions[-1], options)
+
+        transaction = await self._indexer(f"/v2/transactions/{tx_id}")
+        return self._get_transaction_data(transaction['transaction'], options)
+
+
+    async def get_address(self, address_id):
+        """Get the info of an Algorand account"""
+        account_info = await self._algod(f"/v2/accounts/{address_id}")
+        return Address(address = address_id, balance = account_info.get("amount"))
+
+
+    async def search_resource(self, search_text):
+        if self.validator.is_block(search_text):
+            block = await self.get_block_by_id(search_text)
+            return { "type" : "block", "data" : block }
+        if self.validator.is_address(search_text):
+            address = await self.get_address(search_text)
+            return { "type" : "address", "data" : address }
+        if self.validator.is_transaction(search_text):
+            transaction = await self.get_transaction_by_id(search_text)
+            return { "type" : "transaction", "data" : transaction }
+
+        raise NotFoundError(f"No block, address or transaction matches {search_text}")
+
+
+    async def close(self):
+        await self.fetchService.close()
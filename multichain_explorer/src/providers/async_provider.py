@@ -0,0 +1,161 @@
+import abc
+from multichain_explorer.src.models.provider_options import ProviderOptions
+
+class AsyncProviderInterface(metaclass=abc.ABCMeta):
+    """
+    Asynchronous counterpart of ProviderInterface, every method is a coroutine
+    returning the same data as its synchronous version
+    """
+
+    # Set by an attached Instrumentation, the calls to the provider and its clients are then recorded
+    instrumentation = None
+
+    @classmethod
+    def __subclasshook__(cls, subclass):
+        return (hasattr(subclass, 'get_summary') and
+                callable(subclass.get_summary) and
+                hasattr(subclass, 'get_latest_block_number') and
+                callable(subclass.get_latest_block_number) and
+                hasattr(subclass, 'get_blocks') and
+                callable(subclass.get_blocks) and
+                hasattr(subclass, 'get_block_by_id') and
+                callable(subclass.get_block_by_id) and
+                hasattr(subclass, 'get_transactions') and
+                callable(subclass.get_transactions) and
+                hasattr(subclass, 'get_transaction_by_id') and
+                callable(subclass.get_transaction_by_id) and
+                hasattr(subclass, 'get_address') and
+                callable(subclass.get_address) and
+                hasattr(subclass, 'search_resource') and
+                callable(subclass.search_resource) and
+                hasattr(subclass, 'close') and
+                callable(subclass.close) or
+                NotImplemented)
+
+    @abc.abstractmethod
+    async def get_summary(self):
+        """
+        Get a summary of the blockchain
+
+        Returns:
+            A Summary with the summary data of the blockchain, see ProviderInterface.get_summary
+
+        Raises:
+            NotImplementedError if the method is not implemented
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_latest_block_number(self) -> int:
+        """ Get the number (height) of the latest block
+
+        Returns:
+            The latest block number as an int
+
+        Raises:
+            NotImplementedError if the method is not implemented
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_blocks(self, num_blocks: int, options: ProviderOptions):
+        """ Get a list of blocks
+
+        Args:
+            num_blocks: number of blocks to return
+            options: ProviderOptions object
+
+        Returns:
+            The list of blocks, see ProviderInterface.get_blocks
+
+        Raises:
+            NotImplementedError if the method is not implemented
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_block_by_id(self, block_id: str, options: ProviderOptions):
+        """ Get a block by id
+
+        Args:
+            block_id: id of the block
+            options: ProviderOptions object
+
+        Returns:
+            A Block with the block data, see ProviderInterface.get_block_by_id
+
+        Raises:
+            NotImplementedError if the method is not implemented
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_transactions(self, num_tx: int, options: ProviderOptions):
+        """Get a list of transactions
+
+        Args:
+            num_tx: number of transactions to return
+            options: ProviderOptions object
+
+        Returns:
+            A list of transactions
+
+        Raises:
+            NotImplementedError if the method is not implemented
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_transaction_by_id(self, tx_id: str, options: ProviderOptions):
+        """Get a transaction by id
+
+        Args:
+            tx_id: id of the transaction
+            options: ProviderOptions object
+
+        Returns:
+            A Transaction with the transaction data, see ProviderInterface.get_transaction_by_id
+
+        Raises:
+            NotImplementedError if the method is not implemented
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_address(self, address_id):
+        """Returns an address by its address identifier
+
+        Args:
+            address_id: address identifier
+
+        Returns:
+            An Address with the address data, see ProviderInterface.get_address
+
+        Raises:
+            NotImplementedError if the method is not implemented
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def search_resource(self, search_text):
+        """Search for a resource (block, address or transaction) by search_text
+
+        Args:
+            search_text: the text to search for
+
+        Returns:
+            A dict containing the resource data, see ProviderInterface.search_resource
+
+        Raises:
+            NotImplementedError if the method is not implemented
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def close(self):
+        """Release the connections held by the provider
+
+        Raises:
+            NotImplementedError if the method is not implemented
+        """
+        raise NotImplementedError
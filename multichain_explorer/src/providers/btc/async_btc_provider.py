@@ -0,0 +1,144 @@
+from multichain_explorer.src.models.blockchains import Blockchains
+from multichain_explorer.src.services.async_coinmarketcap_service import AsyncCoinMarketCapService
+from multichain_explorer.src.services.async_fetch_service import AsyncFetchService
+from multichain_explorer.src.services.concurrent_service import ConcurrentService
+from multichain_explorer.src.services.request_scheduler import ScheduledClient
+from multichain_explorer.src.validators.btc.btc_validator import BtcValidator
+from multichain_explorer.src.validators.validator import ValidatorInterface
+from multichain_explorer.src.models.provider_options import ProviderOptions
+from multichain_explorer.src.models.provider_models.address import Address
+from multichain_explorer.src.models.provider_models.summary import Summary
+from multichain_explorer.src.providers.async_provider import AsyncProviderInterface
+from multichain_explorer.src.providers.btc.btc_provider import BtcProvider
+from multichain_explorer.src.providers.not_found_error import NotFoundError
+
+
+class AsyncBtcProvider(AsyncProviderInterface):
+    """
+    Asynchronous Bitcoin provider calling the blockchain.info API,
+    the explorer used by the cryptos backend of BtcProvider
+    """
+
+    BLOCKCHAIN_INFO_URL : str = "https://blockchain.info"
+
+    validator : ValidatorInterface = BtcValidator()
+    coinMarketCapService : AsyncCoinMarketCapService = AsyncCoinMarketCapService()
+    concurrentService : ConcurrentService = ConcurrentService()
+
+    # The data is built as in the sync provider
+    count_leading_zeroes = BtcProvider.count_leading_zeroes
+    _get_block_data = BtcProvider._get_block_data
+    _get_transaction_data = BtcProvider._get_transaction_data
+
+
+    def __init__(self):
+        self.fetchService = ScheduledClient(AsyncFetchService.get_shared(), "blockchain.info", asynchronous = True)
+
+
+    async def _get(self, path: str, parameters = None):
+        return await self.fetchService.fetch_json(f"{self.BLOCKCHAIN_INFO_URL}{path}", parameters)
+
+
+    async def _get_block_info(self, height: int) -> dict:
+        """Get the block of a height, shaped as cryptos' block_info"""
+        blocks = (await self._get(f"/block-height/{height}", { "format" : "json" }))['blocks']
+        data = [block for block in blocks if block['main_chain']][0]
+        return {
+            'version': data['ver'],
+            'hash': data['hash'],
+            'prevhash': data['prev_block'],
+            'timestamp': data['time'],
+            'merkle_root': data['mrkl_root'],
+            'bits': data['bits'],
+            'nonce': data['nonce'],
+            'tx_hashes': [t['hash'] for t in data['tx']],
+            # The explorer returns the whole transactions of the block
+            'transactions': [self._get_transaction_data(t['hash'], t) for t in data['tx']]
+        }
+
+
+    async def get_summary(self):
+        # Served from the batched, cached quotes of all the chains
+        cryptoData = await self.coinMarketCapService.fetch_quote(Blockchains.BTC.value)
+        currency = self.coinMarketCapService.currency
+
+        summary = Summary(
+            name = cryptoData['name'],
+            price = cryptoData['quote'][currency]['price'],
+            market_cap = cryptoData['quote'][currency]['market_cap'],
+            total_supply = cryptoData['total_supply']
+        )
+        return summary
+
+
+    async def get_latest_block_number(self) -> int:
+        """Returns the number of the latest BTC block"""
+        return (await self._get("/latestblock"))['height']
+
+
+    async def get_blocks(self, num_blocks = 10, options = ProviderOptions()):
+        """ Returns a list of BTC block data, default number of blocks is 10 """
+        latest_block_number = await self.get_latest_block_number()
+
+        block_numbers = range(latest_block_number,
+                              latest_block_number - num_blocks,
+                              -1)
+
+        # Blocks are fetched concurrently, a failed block is reported in its place
+        return await self.concurrentService.gather_ordered(
+                    lambda block_number: self.get_block_by_id(block_number, options),
+                    block_numbers,
+                    on_error = lambda block_number, err: { "id" : block_number, "error" : str(err) },
+                    max_concurrency = options.max_concurrency
+                )
+
+
+    async def get_block_by_id(self, block_id = 'latest', options = ProviderOptions()):
+        if block_id == 'latest':
+            block_id = await self.get_latest_block_number()
+        else:
+            block_id = int(block_id) #Cast to int
+
+        block = await self._get_block_info(block_id)
+        return self._get_block_data(block_id, block, options)
+
+
+    async def get_transactions(self, num_tx = 10, options = ProviderOptions()):
+        """Returns a list of transactions, default number of transactions is 10"""
+        block_height = await self.get_latest_block_number()
+        # Get the last num_tx transactions from block (default is 10), hydrated along with the block
+        return (await self._get_block_info(block_height))['transactions'][-num_tx:]
+
+
+    async def get_transaction_by_id(self, tx_id = 'latest', options = ProviderOptions()):
+        """Get a Bitcoin transaction by id"""
+        if tx_id == 'latest':
+            block_height = await self.get_latest_block_number()
+            return (await self._get_block_info(block_height))['transactions'][-1]
+
+        tx = await self._get(f"/rawtx/{tx_id}", { "format" : "json" })
+        return self._get_transaction_data(tx_id, tx, options)
+
+
+    async def get_address(self, address_id):
+        """Get the info of a Bitcoin address"""
+        history = await self._get(f"/address/{address_id}", { "format" : "json" })
+        return Address(address = address_id, balance = history['final_balance']) # balance in satoshis
+
+
+    async def search_resource(self, search_text):
+        if self.validator.is_block(search_text):
+            block = await self.get_block_by_id(search_text)
+            return { "type" : "block", "data" : block }
+        if self.validator.is_address(search_text):
+            address = await self.get_address(search_text)
+            return { "type" : "address", "data" : address }
+        if self.validator.is_transaction(search_text):
+            transaction = await self.get_transaction_by_id(search_text)
+            return { "type" : "transaction", "data" : transaction }
+
+        raise NotFoundError(f"No block, address or transaction matches {search_text}")
+
+
+    async def close(self):
+        await self.fetchService.close()
@@ -1,126 +1,249 @@
+import dataclasses
+import functools
+import json
+import math
 from cryptos import *
+from cryptos.explorers import blockchain
+from multichain_explorer.src.cache.block_index import BlockIndex
+from multichain_explorer.src.cache.ttl_cache import TTLCache
 from multichain_explorer.src.models.blockchains import Blockchains
 from multichain_explorer.src.services.coinmarketcap_service import CoinMarketCapService
+from multichain_explorer.src.services.concurrent_service import ConcurrentService
+from multichain_explorer.src.services.fetch_service import FetchService
+from multichain_explorer.src.services.request_scheduler import ScheduledClient
 from multichain_explorer.src.validators.btc.btc_validator import BtcValidator
 from multichain_explorer.src.validators.validator import ValidatorInterface
 from multichain_explorer.src.models.provider_options import ProviderOptions
+from multichain_explorer.src.models.provider_models.address import Address
+from multichain_explorer.src.models.provider_models.block import Block
+from multichain_explorer.src.models.provider_models.raw_data import RawData
+from multichain_explorer.src.models.provider_models.summary import Summary
+from multichain_explorer.src.models.provider_models.transaction import Transaction
 from multichain_explorer.src.providers.provider import ProviderInterface
+from multichain_explorer.src.providers.not_found_error import NotFoundError
 
 
 class BtcProvider(ProviderInterface):
     
-    provider = Bitcoin()
+    # Settings the provider instances are pooled by
+    SETTINGS : tuple = ()
+
+    # Blocks kept in memory with the data of all their transactions, served by height or hash
+    BLOCK_CACHE_SIZE : int = 64
+
+    # Raw blocks, as sent by the explorer, kept in memory for the raw data of the blocks and their transactions
+    RAW_BLOCK_CACHE_SIZE : int = 4
+
+    # Maximum number of addresses in a single balance request
+    MAX_BALANCE_ADDRESSES : int = 100
+
+    # Blocks under the tip before their height is indexed for good, shallower ones can be reorganized
+    REORG_DEPTH : int = 6
+
+    # Seconds the height of a block shallower than REORG_DEPTH is resolved to its hash
+    TIP_INDEX_TTL : float = 60
+
+    provider = ScheduledClient(Bitcoin(), "blockchain.info")
     validator : ValidatorInterface = BtcValidator()
     coinMarketCapService : CoinMarketCapService = CoinMarketCapService()
+    concurrentService : ConcurrentService = ConcurrentService()
 
 
     def __init__(self):
-       pass
+        # The explorer serves whole blocks, with their transactions, in a single request
+        self.fetchService = ScheduledClient(FetchService.get_shared(), "blockchain.info")
+        self.blockIndex = BlockIndex()
+        self._blocks = TTLCache(ttl = math.inf, max_entries = self.BLOCK_CACHE_SIZE)
+        self._raw_blocks = TTLCache(ttl = math.inf, max_entries = self.RAW_BLOCK_CACHE_SIZE)
+        self._highest_block_number = 0
 
 
     def get_summary(self):
-        data = CoinMarketCapService().fetchData(Blockchains.BTC.value)
-        cryptoData = data['data'][Blockchains.BTC.value]
-        currency = "USD"
-
-        summary = {
-            "name" : cryptoData['name'],
-            "price" : cryptoData['quote'][currency]['price'],
-            "marketCap" : cryptoData['quote'][currency]['market_cap'],
-            "totalSupply" : cryptoData['total_supply']
-        }
+        # Served from the batched, cached quotes of all the chains
+        cryptoData = self.coinMarketCapService.fetch_quote(Blockchains.BTC.value)
+        currency = self.coinMarketCapService.currency
+
+        summary = Summary(
+            name = cryptoData['name'],
+            price = cryptoData['quote'][currency]['price'],
+            market_cap = cryptoData['quote'][currency]['market_cap'],
+            total_supply = cryptoData['total_supply']
+        )
         return summary
 
 
+    def fetch_latest_block_number(self) -> int:
+        """Fetches the number of the latest BTC block"""
+        block_number = self.provider.current_block_height()
+        self._highest_block_number = max(self._highest_block_number, block_number)
+        return block_number
+
+
     def get_blocks(self, num_blocks = 10, options = ProviderOptions()):
         """ Returns a list of BTC block data, default number of blocks is 10 """
 
-        latest_block_number = self.provider.current_block_height()
-        latest_blocks = []
+        if self.rollingWindow is not None:
+            blocks = self.rollingWindow.get_blocks(num_blocks, options)
+            if blocks is not None:
+                return blocks
 
-        for block_number in range(latest_block_number, 
-                                latest_block_number - num_blocks, 
-                                -1):
-            block_data = self.get_block_by_id(block_number)
-            latest_blocks.append(block_data)
+        latest_block_number = self.get_latest_block_number()
 
-        return latest_blocks
+        block_numbers = range(latest_block_number, 
+                              latest_block_number - num_blocks, 
+                              -1)
+
+        # Blocks are fetched concurrently, a failed block is reported in its place
+        return self.concurrentService.map_ordered(
+                    lambda block_number: self.get_block_by_id(block_number, options),
+                    block_numbers,
+                    on_error = lambda block_number, err: { "id" : block_number, "error" : str(err) },
+                    max_concurrency = options.max_concurrency
+                )
 
 
     def get_block_by_id(self, block_id = 'latest', options = ProviderOptions()):
-        #If id is a number cast to int
-        try:
-            if block_id == 'latest':
-                block_id = self.provider.current_block_height()
-            else:
-                block_id = int(block_id) #Cast to int
-                
-            block = self.provider.block_info(block_id)
-            block_data = {
-                "id" : block_id,
-                "miner" : "-",
-                "difficulty" : str( self.count_leading_zeroes(block['hash']) ) + " (target)",
-                "timestamp": block['timestamp'],
-            }
-
-            if options.raw:
-                #TODO - Pass real raw block data in the rawData field 
-                #block_data["rawData"] = block
-                block_data["rawData"] = {}
-
-        except ValueError as err:
-            # Log exception
-            raise
+        """Get a Bitcoin block by height or hash"""
+        if block_id == 'latest':
+            if self.headTracker is not None:
+                return self.headTracker.get_latest_block(options)
+            block_id = self.get_latest_block_number()
+
+        block = self._get_hydrated_block(block_id)
+        # The raw block is not kept with the hydrated blocks, it is fetched as sent by the explorer when requested
+        raw_block = self._get_raw_block(block['hash']) if options.raw else None
+        return self._get_block_data(block['height'], block, options, raw_block)
+
+
+    def _get_raw_block(self, block_hash: str) -> RawData:
+        """JSON of a block, with all its transactions, as sent by the explorer, fetched once and decoded only when read"""
+        raw_block = self._raw_blocks.get(block_hash)
+        if raw_block is None:
+            explorer_url = blockchain.get_url(self.provider.coin_symbol)
+            raw_block = RawData(self.fetchService.fetch_raw(f"{explorer_url}/rawblock/{block_hash}", { "format" : "json" }, None))
+            self._raw_blocks.set(block_hash, raw_block)
+        return raw_block
+
+
+    def _get_hydrated_block(self, block_id) -> dict:
+        """
+        Get a block with the data of all its transactions, from a single explorer request
+
+        Blocks already fetched are served from memory, by hash or by height through the block index
+
+        Args:
+            block_id: the block height, or its hash
+
+        Returns:
+            The block shaped as cryptos' block_info, plus its height and its transactions data
+        """
+        is_hash = isinstance(block_id, str) and not block_id.isdigit()
+        block_hash = block_id if is_hash else self.blockIndex.get_hash(int(block_id))
+        block = self._blocks.get(block_hash) if block_hash is not None else None
+        if block is not None:
+            return block
+
+        explorer_url = blockchain.get_url(self.provider.coin_symbol)
+        if is_hash:
+            data = self.fetchService.fetch_json(f"{explorer_url}/rawblock/{block_id}", { "format" : "json" }, None)
+        else:
+            blocks = self.fetchService.fetch_json(f"{explorer_url}/block-height/{int(block_id)}", { "format" : "json" }, None)['blocks']
+            data = [block for block in blocks if block['main_chain']][0]
+
+        # Only the data built from the block is kept, not the whole explorer response
+        block = {
+            'height': data['height'],
+            'hash': data['hash'],
+            'prevhash': data['prev_block'],
+            'timestamp': data['time'],
+            'tx_hashes': [transaction['hash'] for transaction in data['tx']],
+            'transactions': [self._get_transaction_data(transaction['hash'], transaction) for transaction in data['tx']],
+        }
 
-        return block_data
+        self._highest_block_number = max(self._highest_block_number, block['height'])
+        is_final = block['height'] <= self._highest_block_number - self.REORG_DEPTH
+        self.blockIndex.add(block['height'], block['hash'], None if is_final else self.TIP_INDEX_TTL)
+        self._blocks.set(block['hash'], block)
+        return block
+
+
+    def _get_block_data(self, block_id: int, block: dict, options = ProviderOptions(), raw_block: RawData = None) -> Block:
+        """
+        Builds the block data from a cryptos block info (shared with the async provider)
+
+        The raw data is the explorer block as received when given, the block info otherwise
+        """
+        return Block(
+            id = block_id,
+            miner = "-",
+            difficulty = str( self.count_leading_zeroes(block['hash']) ) + " (target)",
+            timestamp = block['timestamp'],
+            hash = block['hash'],
+            parent_hash = block['prevhash'],
+            raw_data = (raw_block if raw_block is not None else RawData(block)) if options.raw else None
+        )
 
 
     def count_leading_zeroes(self, text : str):
-       #Count leading zeroes in a string
-        match = re.match(r'^0+', text)
-        return 0 if match is None else len(match.group())
+        #Count leading zeroes in a string
+        return len(text) - len(text.lstrip('0'))
 
 
     def get_transactions(self, num_tx = 10, options = ProviderOptions()):
         """Returns a list of transactions, default number of transactions is 10"""
-        try:
-            block_height = self.provider.current_block_height()
-            #Get latest transactions
-            block_transactions = self.provider.block_info(block_height)['tx_hashes']
+        if self.rollingWindow is not None:
+            transactions = self.rollingWindow.get_transactions(num_tx, options)
+            if transactions is not None:
+                return transactions
 
-            latest_transactions = []
+        # Get the last num_tx transactions from block (default is 10), hydrated along with the block
+        block = self._get_hydrated_block(self.get_latest_block_number())
+        return self._get_block_transactions_data(block, options)[-num_tx:]
 
-            # Get the last num_tx transactions from block (default is 10)
-            for transaction_id in block_transactions[-num_tx:]:
-                #Convert id from binary hex to string
-                transaction_data = self.get_transaction_by_id(transaction_id)
-                latest_transactions.append(transaction_data)
 
-        except ValueError as err:
-            # Log exception
-            raise
-        return latest_transactions
+    def get_block_transactions(self, block_id, options = ProviderOptions()):
+        """Get all the transactions of a Bitcoin block"""
+        return self._get_block_transactions_data(self._get_hydrated_block(block_id), options)
+
+
+    def _get_block_transactions_data(self, block: dict, options = ProviderOptions()) -> list:
+        """The transactions of a hydrated block, their raw data taken from the raw block when requested"""
+        if not options.raw:
+            return block['transactions']
+
+        # The raw block is decoded only when the raw data of one of its transactions is read
+        raw_block = self._get_raw_block(block['hash'])
+        return [dataclasses.replace(transaction, raw_data = RawData(raw_block, functools.partial(self._encode_raw_transaction, index = index)))
+                for index, transaction in enumerate(block['transactions'])]
+
+
+    @staticmethod
+    def _encode_raw_transaction(raw_block: RawData, index: int) -> str:
+        """JSON of a transaction of a raw block"""
+        return json.dumps(raw_block.value['tx'][index], separators = (",", ":"))
 
 
     def get_transaction_by_id(self, tx_id = 'latest', options = ProviderOptions()):
         """Get an Algorand transaction by id"""
 
         if tx_id == 'latest':
-            block_height = self.provider.current_block_height()
-            #Get latest transaction id
-            tx_id = self.provider.block_info(block_height)['tx_hashes'][-1]
+            return self._get_block_transactions_data(self._get_hydrated_block(self.get_latest_block_number()), options)[-1]
         
         tx = self.provider.fetchtx(tx_id)
+        return self._get_transaction_data(tx_id, tx, options)
 
-        transaction_data = {
-            "id"         : tx_id,
-            "from"       : tx['inputs'][0]['prev_out']['addr'],
-            "to"         : tx['out'][0]['addr'],
-            "value"      : tx['out'][0]['value'],  # value in satoshis
-            "block"      : tx['block_index']
-        }
 
-        return transaction_data
+    def _get_transaction_data(self, tx_id: str, tx: dict, options = ProviderOptions()) -> Transaction:
+        """Builds the transaction data from a blockchain.info transaction (shared with the async provider)"""
+        # Coinbase inputs have no previous output, data outputs (OP_RETURN) no address
+        return Transaction(
+            id = tx_id,
+            address_from = tx['inputs'][0].get('prev_out', {}).get('addr', '-'),
+            address_to = tx['out'][0].get('addr', '-'),
+            value = tx['out'][0]['value'],  # value in satoshis
+            block = tx['block_index'],
+            raw_data = RawData(tx) if options.raw else None
+        )
 
 
     def get_address(self, address_id):
@@ -130,13 +253,41 @@ class BtcProvider(ProviderInterface):
             history = self.provider.history(address_id)
             balance = history['final_balance'] # balance in satoshis
 
-            return {
-                "address" : address_id,
-                "balance" : balance
-            }
+            return Address(address = address_id, balance = balance)
         except Exception as err:
             raise
 
+
+    def get_addresses(self, address_ids, options = ProviderOptions()):
+        """Get the info of several Bitcoin addresses, in balance requests of at most MAX_BALANCE_ADDRESSES addresses"""
+        explorer_url = blockchain.get_url(self.provider.coin_symbol)
+        # An invalid address fails a whole request, they are reported without being sent
+        valid_ids = [address_id for address_id in dict.fromkeys(address_ids) if self.validator.is_address(address_id)]
+        batch_starts = range(0, len(valid_ids), self.MAX_BALANCE_ADDRESSES)
+
+        def send(batch_start: int) -> dict:
+            batch = valid_ids[batch_start:batch_start + self.MAX_BALANCE_ADDRESSES]
+            return self.fetchService.fetch_json(f"{explorer_url}/balance", { "active" : "|".join(batch) }, None)
+
+        def send_errors(batch_start: int, err: Exception) -> dict:
+            # A failed request is reported in place of each of its addresses
+            return { address_id : err for address_id in valid_ids[batch_start:batch_start + self.MAX_BALANCE_ADDRESSES] }
+
+        balances = {}
+        for batch in self.concurrentService.map_ordered(send, batch_starts, on_error = send_errors, max_concurrency = options.max_concurrency):
+            balances.update(batch)
+
+        addresses = []
+        for address_id in address_ids:
+            balance = balances.get(address_id)
+            if balance is None:
+                addresses.append({ "address" : address_id, "error" : f"No balance returned for {address_id}" })
+            elif isinstance(balance, Exception):
+                addresses.append({ "address" : address_id, "error" : str(balance) })
+            else:
+                addresses.append(Address(address = address_id, balance = balance['final_balance'])) # balance in satoshis
+        return addresses
+
     
     def search_resource(self, search_text):
         if self.validator.is_block(search_text):
@@ -149,4 +300,4 @@ class BtcProvider(ProviderInterface):
             transaction = self.get_transaction_by_id(search_text)
             return { "type" : "transaction", "data" : transaction }
             
-        raise
\ No newline at end of file
+        raise NotFoundError(f"No block, address or transaction matches {search_text}")
\ No newline at end of file
@@ -0,0 +1,181 @@
+import threading
+import time
+from typing import Union
+from multichain_explorer.src.cache.cache_backend import CacheBackendInterface
+from multichain_explorer.src.cache.memory_cache_backend import MemoryCacheBackend
+from multichain_explorer.src.models.blockchains import Blockchains
+from multichain_explorer.src.models.provider_options import ProviderOptions
+from multichain_explorer.src.models.provider_models.block import Block
+from multichain_explorer.src.models.provider_models.transaction import Transaction
+from multichain_explorer.src.models.resource_types import Resource
+from multichain_explorer.src.providers.provider import ProviderInterface
+from multichain_explorer.src.services.concurrent_service import ConcurrentService
+from multichain_explorer.src.providers.not_found_error import NotFoundError
+
+
+class CachedProvider(ProviderInterface):
+    """
+    Wraps a provider and caches the blocks and transactions that can no longer change,
+    ie.: the ones buried under at least the finality depth of the chain.
+    Data closer to the tip, summaries and addresses are always fetched from the provider
+    """
+
+    # Blocks under the tip needed to consider a block final, can be overridden by the caller
+    FINALITY_DEPTHS : dict = {
+        Blockchains.ETH  : 64,  # two epochs, finalized checkpoint
+        Blockchains.BTC  : 6,
+        Blockchains.ADA  : 15,
+        Blockchains.ALGO : 0,   # immediate finality
+        Blockchains.LUNA : 1,   # tendermint, final once the next block commits it
+    }
+
+    # Seconds the latest block number is reused to decide the finality of new data
+    TIP_TTL : float = 5
+
+    concurrentService : ConcurrentService = ConcurrentService()
+
+
+    def __init__(self, provider: ProviderInterface, blockchain_id: Blockchains,
+                 backend: CacheBackendInterface = None, finality_depth: int = None):
+        """
+        Args:
+            provider: the provider to wrap
+            blockchain_id: the blockchain of the provider, part of the cache keys
+            backend: where the data is cached, defaults to an in-memory LRU cache
+            finality_depth: overrides the finality depth of the chain
+        """
+        self.provider = provider
+        self.blockchain_id = blockchain_id
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.finality_depth = (finality_depth if finality_depth is not None
+                               else self.FINALITY_DEPTHS[blockchain_id])
+        self.validator = provider.validator
+
+        self._tip = None
+        self._tip_time = 0
+        self._tip_lock = threading.Lock()
+
+
+    def get_summary(self):
+        return self.provider.get_summary()
+
+
+    def fetch_latest_block_number(self) -> int:
+        latest_block_number = self.provider.fetch_latest_block_number()
+        self._update_tip(latest_block_number)
+        return latest_block_number
+
+
+    def get_latest_block_number(self) -> int:
+        latest_block_number = self.provider.get_latest_block_number()
+        self._update_tip(latest_block_number)
+        return latest_block_number
+
+
+    def get_blocks(self, num_blocks = 10, options = ProviderOptions()):
+        blocks = self.provider.get_blocks(num_blocks, options)
+        for block in blocks:
+            self._store(Resource.block, block["id"], block, options)
+        return blocks
+
+
+    def get_block_by_id(self, block_id = 'latest', options = ProviderOptions()):
+        if block_id == 'latest':
+            return self.provider.get_block_by_id(block_id, options)
+
+        key = self._get_key(Resource.block, block_id, options)
+        block = self.backend.get(key)
+        if block is None:
+            block = self.provider.get_block_by_id(block_id, options)
+            self._store(Resource.block, block_id, block, options)
+        return block
+
+
+    def get_transactions(self, num_tx = 10, options = ProviderOptions()):
+        transactions = self.provider.get_transactions(num_tx, options)
+        for transaction in transactions:
+            self._store(Resource.transaction, transaction["id"], transaction, options)
+        return transactions
+
+
+    def get_block_transactions(self, block_id, options = ProviderOptions()):
+        transactions = self.provider.get_block_transactions(block_id, options)
+        for transaction in transactions:
+            self._store(Resource.transaction, transaction["id"], transaction, options)
+        return transactions
+
+
+    def get_transaction_by_id(self, tx_id = 'latest', options = ProviderOptions()):
+        if tx_id == 'latest':
+            return self.provider.get_transaction_by_id(tx_id, options)
+
+        key = self._get_key(Resource.transaction, tx_id, options)
+        transaction = self.backend.get(key)
+        if transaction is None:
+            transaction = self.provider.get_transaction_by_id(tx_id, options)
+            self._store(Resource.transaction, tx_id, transaction, options)
+        return transaction
+
+
+    def get_address(self, address_id):
+        return self.provider.get_address(address_id)
+
+
+    def get_addresses(self, address_ids, options = ProviderOptions()):
+        return self.provider.get_addresses(address_ids, options)
+
+
+    def search_resource(self, search_text):
+        if self.validator.is_block(search_text):
+            block = self.get_block_by_id(search_text)
+            return { "type" : "block", "data" : block }
+        if self.validator.is_address(search_text):
+            address = self.get_address(search_text)
+            return { "type" : "address", "data" : address }
+        if self.validator.is_transaction(search_text):
+            transaction = self.get_transaction_by_id(search_text)
+            return { "type" : "transaction", "data" : transaction }
+
+        raise NotFoundError(f"No block, address or transaction matches {search_text}")
+
+
+    def _get_key(self, resource: Resource, resource_id, options: ProviderOptions) -> tuple:
+        """Cache key of a resource: (chain, resource type, id, raw flag)"""
+        return (self.blockchain_id.value, resource.value, str(resource_id), bool(options.raw))
+
+
+    def _store(self, resource: Resource, resource_id, data: Union[Block, Transaction], options: ProviderOptions):
+        """Cache the data of a block or transaction if its block is final"""
+        # Blocks that could not be fetched are returned as an error dict
+        if not isinstance(data, (Block, Transaction)):
+            return
+
+        height = data.id if resource == Resource.block else data.block
+        if self._is_final(height):
+            self.backend.set(self._get_key(resource, resource_id, options), data)
+
+
+    def _is_final(self, height) -> bool:
+        """Checks whether a block height is buried under the finality depth of the chain"""
+        try:
+            height = int(height)
+        except (TypeError, ValueError):
+            # Pending transactions or unknown heights are never cached
+            return False
+
+        return height <= self._get_tip() - self.finality_depth
+
+
+    def _get_tip(self) -> int:
+        """Latest block number, refreshed from the provider every TIP_TTL seconds"""
+        with self._tip_lock:
+            if self._tip is not None and time.monotonic() - self._tip_time < self.TIP_TTL:
+                return self._tip
+
+        return self.get_latest_block_number()
+
+
+    def _update_tip(self, latest_block_number: int):
+        with self._tip_lock:
+            self._tip = max(latest_block_number, self._tip or 0)
+            self._tip_time = time.monotonic()
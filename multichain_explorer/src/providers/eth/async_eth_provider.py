@@ -0,0 +1,161 @@
+from web3 import Web3, AsyncHTTPProvider
+from web3.eth import AsyncEth
+from web3._utils.rpc_abi import RPC
+from multichain_explorer.src.models.blockchains import Blockchains
+from multichain_explorer.src.services.async_coinmarketcap_service import AsyncCoinMarketCapService
+from multichain_explorer.src.services.async_fetch_service import AsyncFetchService
+from multichain_explorer.src.services.concurrent_service import ConcurrentService
+from multichain_explorer.src.services.request_scheduler import ScheduledClient
+from multichain_explorer.src.validators.eth.eth_validator import EthValidator
+from multichain_explorer.src.validators.validator import ValidatorInterface
+from multichain_explorer.src.models.provider_options import ProviderOptions
+from multichain_explorer.src.models.provider_models.address import Address
+from multichain_explorer.src.models.provider_models.summary import Summary
+from multichain_explorer.src.providers.async_provider import AsyncProviderInterface
+from multichain_explorer.src.providers.eth.eth_provider import EthProvider
+from multichain_explorer.src.providers.not_found_error import NotFoundError
+
+
+class AsyncEthProvider(AsyncProviderInterface):
+    """Asynchronous Ethereum provider, configured through the EthProvider settings"""
+
+    validator : ValidatorInterface = EthValidator()
+    coinMarketCapService : AsyncCoinMarketCapService = AsyncCoinMarketCapService()
+    concurrentService : ConcurrentService = ConcurrentService()
+
+    # The data is built as in the sync provider
+    _get_block_data = EthProvider._get_block_data
+    _get_transaction_data = EthProvider._get_transaction_data
+    _encode_web3 = staticmethod(EthProvider._encode_web3)
+    _get_batch_payload = staticmethod(EthProvider._get_batch_payload)
+    _get_batch_results = staticmethod(EthProvider._get_batch_results)
+
+
+    def __init__(self):
+        self.provider = ScheduledClient(Web3(AsyncHTTPProvider(EthProvider.INFURA_URL),
+                                             modules = { "eth" : (AsyncEth,) },
+                                             middlewares = []),
+                                        "infura", asynchronous = True)
+        # Batch requests are sent by the provider itself, a batch counts as a single request
+        self.fetchService = ScheduledClient(AsyncFetchService.get_shared(), "infura", asynchronous = True)
+
+
+    async def batch_request(self, method: str, params_list: list) -> list:
+        """
+        Send the same JSON-RPC method with several params in batch requests, as EthProvider.batch_request
+
+        Returns:
+            The result of every call formatted as web3 does, ordered as the params.
+            A call that failed or returned no result is replaced by a ValueError
+        """
+        async def send(batch_start: int) -> list:
+            params_batch = params_list[batch_start:batch_start + EthProvider.MAX_BATCH_SIZE]
+            payload = self._get_batch_payload(method, params_batch, batch_start)
+            return self._get_batch_results(method, params_batch, batch_start, await self.fetchService.post_json(EthProvider.INFURA_URL, payload))
+
+        batches = await self.concurrentService.gather_ordered(send, range(0, len(params_list), EthProvider.MAX_BATCH_SIZE))
+        return [result for batch in batches for result in batch]
+
+
+    async def get_summary(self):
+        # Served from the batched, cached quotes of all the chains
+        cryptoData = await self.coinMarketCapService.fetch_quote(Blockchains.ETH.value)
+        currency = self.coinMarketCapService.currency
+
+        summary = Summary(
+            name = cryptoData['name'],
+            price = cryptoData['quote'][currency]['price'],
+            market_cap = cryptoData['quote'][currency]['market_cap'],
+            total_supply = cryptoData['total_supply']
+        )
+        return summary
+
+
+    async def get_latest_block_number(self) -> int:
+        """Returns the number of the latest ETH block"""
+        return await self.provider.eth.block_number
+
+
+    async def get_blocks(self, num_blocks = 10, options = ProviderOptions()):
+        latest_block_number = await self.get_latest_block_number()
+
+        block_numbers = range(latest_block_number,
+                              latest_block_number - num_blocks,
+                              -1)
+
+        # Blocks are fetched concurrently, a failed block is reported in its place
+        return await self.concurrentService.gather_ordered(
+                    lambda block_number: self.get_block_by_id(block_number, options),
+                    block_numbers,
+                    on_error = lambda block_number, err: { "id" : block_number, "error" : str(err) },
+                    max_concurrency = options.max_concurrency
+                )
+
+
+    async def get_block_by_id(self, block_id = 'latest', options = ProviderOptions()):
+        #If id is a number cast to int
+        if type(block_id) == str and block_id.isnumeric():
+            block_id = int(block_id)
+
+        block = await self.provider.eth.get_block(block_id)
+        return self._get_block_data(block, options)
+
+
+    async def get_transactions(self, num_tx = 10, options = ProviderOptions()):
+        """
+        Returns a list of transactions, default number of transactions is 10
+
+        The transactions are read from the tip block, walking back to the previous blocks
+        (up to EthProvider.MAX_WALK_BACK_BLOCKS) when the tip block has fewer than num_tx transactions
+        """
+        full_transactions = EthProvider.FULL_TRANSACTIONS
+        block = await self.provider.eth.get_block("latest", full_transactions = full_transactions)
+        block_transactions = list(block.transactions)
+
+        block_number = block.number
+        while len(block_transactions) < num_tx and block_number > 0 and block.number - block_number < EthProvider.MAX_WALK_BACK_BLOCKS:
+            block_number -= 1
+            previous_block = await self.provider.eth.get_block(block_number, full_transactions = full_transactions)
+            block_transactions = list(previous_block.transactions) + block_transactions
+
+        # Get the last num_tx transactions (default is 10)
+        block_transactions = block_transactions[-num_tx:]
+        if not full_transactions:
+            # Only their hashes were read, they are fetched in a single batch request
+            block_transactions = await self.batch_request(RPC.eth_getTransactionByHash,
+                                                          [[transaction_id.hex()] for transaction_id in block_transactions])
+            for transaction in block_transactions:
+                if isinstance(transaction, Exception):
+                    raise transaction
+
+        return [self._get_transaction_data(transaction, options) for transaction in block_transactions]
+
+
+    async def get_transaction_by_id(self, tx_id = 'latest', options = ProviderOptions()):
+        """Get an Ethereum transaction by id"""
+        transaction = await self.provider.eth.get_transaction(tx_id)
+        return self._get_transaction_data(transaction, options)
+
+
+    async def get_address(self, address_id):
+        balance = await self.provider.eth.get_balance(address_id)
+        return Address(address = address_id, balance = Web3.fromWei(balance, 'ether'))
+
+
+    async def search_resource(self, search_text):
+        if self.validator.is_block(search_text):
+            block = await self.get_block_by_id(search_text)
+            return { "type" : "block", "data" : block }
+        if self.validator.is_address(search_text):
+            address = await self.get_address(search_text)
+            return { "type" : "address", "data" : address }
+        if self.validator.is_transaction(search_text):
+            transaction = await self.get_transaction_by_id(search_text)
+            return { "type" : "transaction", "data" : transaction }
+
+        raise NotFoundError(f"No block, address or transaction matches {search_text}")
+
+
+    async def close(self):
+        # web3 keeps a pooled aiohttp session per endpoint, closed when evicted from its cache
+        pass
@@ -1,65 +1,161 @@
 from web3   import Web3
+from web3._utils.method_formatters import PYTHONIC_RESULT_FORMATTERS
+from web3._utils.rpc_abi import RPC
 from multichain_explorer.src.models.blockchains import Blockchains
 from multichain_explorer.src.services.coinmarketcap_service import CoinMarketCapService
+from multichain_explorer.src.services.concurrent_service import ConcurrentService
+from multichain_explorer.src.services.fetch_service import FetchService
+from multichain_explorer.src.services.request_scheduler import ScheduledClient
 from multichain_explorer.src.validators.eth.eth_validator import EthValidator
 from multichain_explorer.src.validators.validator import ValidatorInterface
 from multichain_explorer.src.models.provider_options import ProviderOptions
+from multichain_explorer.src.models.provider_models.address import Address
+from multichain_explorer.src.models.provider_models.block import Block
+from multichain_explorer.src.models.provider_models.raw_data import RawData
+from multichain_explorer.src.models.provider_models.summary import Summary
+from multichain_explorer.src.models.provider_models.transaction import Transaction
 from multichain_explorer.src.providers.provider import ProviderInterface
+from multichain_explorer.src.providers.not_found_error import NotFoundError
+
+from typing import Union
 
 
 class EthProvider(ProviderInterface):
     
     # Must be set externally by the caller
     INFURA_URL : str = ""
+
+    # Settings the provider instances are pooled by
+    SETTINGS : tuple = ("INFURA_URL",)
+
+    # Maximum number of calls sent in a single JSON-RPC batch request
+    MAX_BATCH_SIZE : int = 100
+
+    # Build the transactions from full transaction block payloads, instead of fetching them by hash
+    FULL_TRANSACTIONS : bool = True
+
+    # Maximum number of blocks before the tip read to fill the latest transactions
+    MAX_WALK_BACK_BLOCKS : int = 10
+
     validator : ValidatorInterface = EthValidator()
     coinMarketCapService : CoinMarketCapService = CoinMarketCapService()
+    concurrentService : ConcurrentService = ConcurrentService()
 
 
     def __init__(self):
-        self.provider = Web3(Web3.HTTPProvider(self.INFURA_URL))
+        # Share the pooled, keep-alive session with the rest of the services
+        fetchService = FetchService.get_shared()
+        self.provider = ScheduledClient(Web3(Web3.HTTPProvider(self.INFURA_URL,
+                                                               session = fetchService.session,
+                                                               request_kwargs = { "timeout" : fetchService.get_timeout() })),
+                                        "infura")
+        # Batch requests are sent by the provider itself, a batch counts as a single request
+        self.fetchService = ScheduledClient(fetchService, "infura")
+
+
+    def batch_request(self, method: str, params_list: list, keep_raw: bool = False) -> list:
+        """
+        Send the same JSON-RPC method with several params in batch requests of at most MAX_BATCH_SIZE calls
+
+        Args:
+            method: the JSON-RPC method (eg.: eth_getBlockByNumber)
+            params_list: the params of every call
+            keep_raw: return every result as a tuple (result formatted as web3 does, result as received)
+
+        Returns:
+            The result of every call formatted as web3 does, ordered as the params.
+            A call that failed or returned no result is replaced by a ValueError
+
+        Raises:
+            HTTPError, ConnectionError: if a batch request fails as a whole
+            ValueError: if a batch is rejected as a whole (eg.: batch size or rate limit), as web3 raises the JSON-RPC errors
+        """
+        def send(batch_start: int) -> list:
+            params_batch = params_list[batch_start:batch_start + self.MAX_BATCH_SIZE]
+            payload = self._get_batch_payload(method, params_batch, batch_start)
+            return self._get_batch_results(method, params_batch, batch_start, self.fetchService.post_json(self.INFURA_URL, payload), keep_raw)
+
+        batches = self.concurrentService.map_ordered(send, range(0, len(params_list), self.MAX_BATCH_SIZE))
+        return [result for batch in batches for result in batch]
+
+
+    @staticmethod
+    def _get_batch_payload(method: str, params_batch: list, batch_start: int) -> list:
+        """JSON-RPC calls of a batch, their ids are their position in the whole params list (shared with the async provider)"""
+        return [{ "jsonrpc" : "2.0", "id" : batch_start + i, "method" : method, "params" : params }
+                for i, params in enumerate(params_batch)]
+
+
+    @staticmethod
+    def _get_batch_results(method: str, params_batch: list, batch_start: int, responses: Union[list, dict], keep_raw: bool = False) -> list:
+        """Results of the calls of a batch ordered as their params, see batch_request (shared with the async provider)"""
+        formatter = PYTHONIC_RESULT_FORMATTERS.get(method, lambda result: result)
+        if isinstance(responses, dict):
+            # A batch rejected as a whole is answered with a single error
+            raise ValueError(responses.get("error", responses))
+        responses = { response["id"] : response for response in responses }
+
+        results = []
+        for i, params in enumerate(params_batch):
+            response = responses.get(batch_start + i, {})
+            if "error" in response:
+                results.append(ValueError(response["error"]))
+            elif response.get("result") is None:
+                results.append(ValueError(f"{method} returned no result for {params}"))
+            else:
+                result = formatter(response["result"])
+                results.append((result, response["result"]) if keep_raw else result)
+        return results
 
 
     def get_summary(self):
-        data = CoinMarketCapService().fetchData(Blockchains.ETH.value)
-        cryptoData = data['data'][Blockchains.ETH.value]
-        currency = "USD"
-
-        summary = {
-            "name" : cryptoData['name'],
-            "price" : cryptoData['quote'][currency]['price'],
-            "marketCap" : cryptoData['quote'][currency]['market_cap'],
-            "totalSupply" : cryptoData['total_supply']
-        }
+        # Served from the batched, cached quotes of all the chains
+        cryptoData = self.coinMarketCapService.fetch_quote(Blockchains.ETH.value)
+        currency = self.coinMarketCapService.currency
+
+        summary = Summary(
+            name = cryptoData['name'],
+            price = cryptoData['quote'][currency]['price'],
+            market_cap = cryptoData['quote'][currency]['market_cap'],
+            total_supply = cryptoData['total_supply']
+        )
         return summary
 
 
+    def fetch_latest_block_number(self) -> int:
+        """Fetches the number of the latest ETH block"""
+        return self.provider.eth.block_number
+
+
     def get_blocks(self, num_blocks = 10, options = ProviderOptions()):
-        latest_blocks = []
-        # Would be nice if calls were asynchronous
-        for block_number in range(self.provider.eth.block_number, 
-                                  self.provider.eth.block_number-num_blocks, 
-                                  -1):
-            block_data = self.get_block_by_id(block_number, options)
-            latest_blocks.append(block_data)
-        return latest_blocks
+        if self.rollingWindow is not None:
+            blocks = self.rollingWindow.get_blocks(num_blocks, options)
+            if blocks is not None:
+                return blocks
+
+        latest_block_number = self.get_latest_block_number()
+
+        block_numbers = range(latest_block_number, 
+                              latest_block_number - num_blocks, 
+                              -1)
+
+        # All the blocks are fetched in a single batch request, a failed block is reported in its place
+        blocks = self.batch_request(RPC.eth_getBlockByNumber, [[hex(block_number), False] for block_number in block_numbers], keep_raw = True)
+        return [{ "id" : block_number, "error" : str(block) } if isinstance(block, Exception) else self._get_block_data(block[0], options, raw_block = block[1])
+                for block_number, block in zip(block_numbers, blocks)]
 
 
     def get_block_by_id(self, block_id = 'latest', options = ProviderOptions()):
+        if block_id == 'latest' and self.headTracker is not None:
+            return self.headTracker.get_latest_block(options)
+
         #If id is a number cast to int
         if type(block_id) == str and block_id.isnumeric():
             block_id = int(block_id)
         
         try:
             block = self.provider.eth.get_block(block_id)
-            block_data = {
-                "id" : block.number,
-                "miner" : block.miner,
-                "difficulty" : block.difficulty,
-                "timestamp": block.timestamp,
-            }
-
-            if options.raw:
-                block_data["rawData"] = self.provider.toJSON(block)
+            block_data = self._get_block_data(block, options)
 
         except ValueError as err:
             # Log exception
@@ -68,55 +164,111 @@ class EthProvider(ProviderInterface):
         return block_data
 
 
+    def _get_block_data(self, block, options = ProviderOptions(), raw_block: dict = None) -> Block:
+        """
+        Builds the block data from a web3 block (shared with the async provider)
+
+        The raw data is the JSON-RPC block as received when given, the web3 block otherwise,
+        serialized only when read
+        """
+        return Block(
+            id = block['number'],
+            miner = block['miner'],
+            difficulty = block['difficulty'],
+            timestamp = block['timestamp'],
+            hash = block['hash'].hex(),
+            parent_hash = block['parentHash'].hex(),
+            raw_data = (RawData(raw_block) if raw_block is not None else RawData(block, self._encode_web3)) if options.raw else None
+        )
+
+
+    @staticmethod
+    def _encode_web3(value) -> str:
+        """JSON of a web3 block or transaction, with its HexBytes as hex strings"""
+        return Web3.toJSON(value)
+
+
     def get_transactions(self, num_tx = 10, options = ProviderOptions()):
-        """Returns a list of transactions, default number of transactions is 10"""
-        try:
-            block = self.provider.eth.get_block("latest")
-            block_transactions = block.transactions
-            latest_transactions = []
+        """
+        Returns a list of transactions, default number of transactions is 10
 
-            # Get the last num_tx transactions from block (default is 10)
-            for transaction_id in block_transactions[-num_tx:]:
-                #Convert id from binary hex to string
-                transaction_data = self.get_transaction_by_id(transaction_id.hex(), options)
-                latest_transactions.append(transaction_data)
+        The transactions are read from the tip block, walking back to the previous blocks
+        (up to MAX_WALK_BACK_BLOCKS) when the tip block has fewer than num_tx transactions
+        """
+        if self.rollingWindow is not None:
+            transactions = self.rollingWindow.get_transactions(num_tx, options)
+            if transactions is not None:
+                return transactions
 
-        except ValueError as err:
-            # Log exception
-            raise
-        return latest_transactions
+        block = self.provider.eth.get_block(self.get_tracked_block_number() or "latest", full_transactions = self.FULL_TRANSACTIONS)
+        block_transactions = list(block.transactions)
+
+        block_number = block.number
+        while len(block_transactions) < num_tx and block_number > 0 and block.number - block_number < self.MAX_WALK_BACK_BLOCKS:
+            block_number -= 1
+            previous_block = self.provider.eth.get_block(block_number, full_transactions = self.FULL_TRANSACTIONS)
+            block_transactions = list(previous_block.transactions) + block_transactions
+
+        # Get the last num_tx transactions (default is 10)
+        return self._get_transactions_data(block_transactions[-num_tx:], options)
+
+
+    def get_block_transactions(self, block_id, options = ProviderOptions()):
+        """Get all the transactions of an Ethereum block"""
+        block = self.provider.eth.get_block(block_id, full_transactions = self.FULL_TRANSACTIONS)
+        return self._get_transactions_data(block.transactions, options)
+
+
+    def _get_transactions_data(self, block_transactions, options = ProviderOptions()) -> list:
+        """Builds the data of block transactions, fetching them in a single batch request when only their hashes were read"""
+        if not self.FULL_TRANSACTIONS:
+            block_transactions = self.batch_request(RPC.eth_getTransactionByHash,
+                                                    [[transaction_id.hex()] for transaction_id in block_transactions])
+            for transaction in block_transactions:
+                if isinstance(transaction, Exception):
+                    raise transaction
+
+        return [self._get_transaction_data(transaction, options) for transaction in block_transactions]
 
 
     def get_transaction_by_id(self, tx_id = 'latest', options = ProviderOptions()):
         """Get an Ethereum transaction by id"""
         transaction = self.provider.eth.get_transaction(tx_id)
-        transaction_data = {
-            "id"    : tx_id,
-            "from"  : transaction['from'],
-            "to"    : transaction['to'],
-            "value" : transaction['value'],
-            "block" : transaction['blockNumber']
-        }
+        return self._get_transaction_data(transaction, options)
 
-        if options.raw:
-            transaction_data["rawData"] = self.provider.toJSON(transaction)
 
-        return transaction_data
+    def _get_transaction_data(self, transaction, options = ProviderOptions()) -> Transaction:
+        """Builds the transaction data from a web3 transaction (shared with the async provider)"""
+        return Transaction(
+            id = transaction['hash'].hex(),
+            address_from = transaction['from'],
+            address_to = transaction['to'],
+            value = transaction['value'],
+            block = transaction['blockNumber'],
+            # Pending transactions have no block yet
+            block_hash = transaction['blockHash'].hex() if transaction.get('blockHash') is not None else None,
+            raw_data = RawData(transaction, self._encode_web3) if options.raw else None
+        )
 
 
     def get_address(self, address_id):
         try:
             balance = self.provider.eth.get_balance(address_id)
-            balance = self.provider.fromWei(balance, 'ether')
-            return {
-                "address"   : address_id,
-                "balance"   : balance
-            }
+            balance = Web3.fromWei(balance, 'ether')
+            return Address(address = address_id, balance = balance)
         except Exception as err:
             #log error
             raise
 
     
+    def get_addresses(self, address_ids, options = ProviderOptions()):
+        """Get the info of several Ethereum addresses in a single batch request"""
+        balances = self.batch_request(RPC.eth_getBalance, [[address_id, "latest"] for address_id in address_ids])
+        return [{ "address" : address_id, "error" : str(balance) } if isinstance(balance, Exception)
+                else Address(address = address_id, balance = Web3.fromWei(balance, 'ether'))
+                for address_id, balance in zip(address_ids, balances)]
+
+    
     def search_resource(self, search_text):
         if self.validator.is_block(search_text):
             block = self.get_block_by_id(search_text)
@@ -128,4 +280,4 @@ class EthProvider(ProviderInterface):
             transaction = self.get_transaction_by_id(search_text)
             return { "type" : "transaction", "data" : transaction }
             
-        raise
\ No newline at end of file
+        raise NotFoundError(f"No block, address or transaction matches {search_text}")
\ No newline at end of file
@@ -0,0 +1,152 @@
+from multichain_explorer.src.models.blockchains import Blockchains
+from multichain_explorer.src.services.async_coinmarketcap_service import AsyncCoinMarketCapService
+from multichain_explorer.src.services.concurrent_service import ConcurrentService
+from multichain_explorer.src.validators.luna.luna_validator import LunaValidator
+from multichain_explorer.src.validators.validator import ValidatorInterface
+from multichain_explorer.src.models.provider_options import ProviderOptions
+from multichain_explorer.src.models.provider_models.address import Address
+from multichain_explorer.src.models.provider_models.summary import Summary
+from multichain_explorer.src.providers.async_provider import AsyncProviderInterface
+from multichain_explorer.src.providers.luna.luna_provider import LunaProvider
+from multichain_explorer.src.services.request_scheduler import ScheduledClient
+from multichain_explorer.src.providers.not_found_error import NotFoundError
+
+from terra_sdk.client.lcd import AsyncLCDClient
+
+
+class AsyncLunaProvider(AsyncProviderInterface):
+    """Asynchronous Terra provider, configured through the LunaProvider settings"""
+
+    validator: ValidatorInterface = LunaValidator()
+    coinMarketCapService : AsyncCoinMarketCapService = AsyncCoinMarketCapService()
+    concurrentService : ConcurrentService = ConcurrentService()
+
+    # The data is built as in the sync provider
+    messageDecoder = LunaProvider.messageDecoder
+    _get_block_data = LunaProvider._get_block_data
+    extractTxData = LunaProvider.extractTxData
+    NO_TRANSFER = LunaProvider.NO_TRANSFER
+    _encode_tx = staticmethod(LunaProvider._encode_tx)
+    _print_balance = LunaProvider._print_balance
+
+
+    def __init__(self):
+        self._client = None
+
+
+    @property
+    def provider(self) -> AsyncLCDClient:
+        """LCD client, created on first use as it binds to the running event loop"""
+        if self._client is None:
+            self._client = ScheduledClient(AsyncLCDClient(chain_id = LunaProvider.TERRA_CHAIN_ID, url = LunaProvider.TERRA_URL),
+                                           "terra-lcd", asynchronous = True)
+            if self.instrumentation is not None:
+                self._client = self.instrumentation.wrap_client(self._client)
+        return self._client
+
+
+    async def get_summary(self):
+        # Served from the batched, cached quotes of all the chains
+        cryptoData = await self.coinMarketCapService.fetch_quote(Blockchains.LUNA.value)
+        currency = self.coinMarketCapService.currency
+
+        summary = Summary(
+            name = cryptoData['name'],
+            price = cryptoData['quote'][currency]['price'],
+            market_cap = cryptoData['quote'][currency]['market_cap'],
+            total_supply = cryptoData['total_supply']
+        )
+        return summary
+
+
+    async def get_latest_block_number(self) -> int:
+        """Returns the number of the latest LUNA block"""
+        return int( (await self.provider.tendermint.block_info())['block']['header']['height'] )
+
+
+    async def get_blocks(self, num_blocks = 10, options = ProviderOptions()):
+        latest_block = await self.provider.tendermint.block_info()
+        latest_block_number = int( latest_block['block']['header']['height'] )
+
+        # The tip block is already read, only the blocks before it are fetched
+        block_numbers = range(latest_block_number - 1,
+                              latest_block_number - num_blocks,
+                              -1)
+
+        # Blocks are fetched concurrently, a failed block is reported in its place
+        blocks = await self.concurrentService.gather_ordered(
+                    lambda block_number: self.get_block_by_id(block_number, options),
+                    block_numbers,
+                    on_error = lambda block_number, err: { "id" : block_number, "error" : str(err) },
+                    max_concurrency = options.max_concurrency
+                )
+        return [self._get_block_data(latest_block, options)] + blocks
+
+
+    async def get_block_by_id(self, block_id = 'latest', options = ProviderOptions()):
+        if block_id == 'latest':
+            block = await self.provider.tendermint.block_info()
+        else:
+            block = await self.provider.tendermint.block_info(int(block_id))
+
+        return self._get_block_data(block, options)
+
+
+    async def _get_block_transactions(self, block_number: int) -> list:
+        """Get the transactions of a height, searched a page at a time as in the sync provider"""
+        block_transactions = []
+        while True:
+            page = await self.provider.tx.search([["tx.height", block_number]],
+                                                 { "pagination.limit" : str(LunaProvider.SEARCH_PAGE_SIZE), "pagination.offset" : str(len(block_transactions)) })
+            block_transactions += page["txs"]
+            total = int( (page.get("pagination") or {}).get("total") or 0 )
+            if len(page["txs"]) < LunaProvider.SEARCH_PAGE_SIZE or len(block_transactions) >= total:
+                return block_transactions
+
+
+    async def get_transactions(self, num_tx = 10, options = ProviderOptions()):
+        """Returns a list of transactions, default number of transactions is 10, walking back from the tip block as the sync provider"""
+        latest_block_number = await self.get_latest_block_number()
+        block_transactions = await self._get_block_transactions(latest_block_number)
+
+        block_number = latest_block_number
+        while len(block_transactions) < num_tx and block_number > 1 and latest_block_number - block_number + 1 < LunaProvider.MAX_WALK_BACK_BLOCKS:
+            block_number -= 1
+            block_transactions = (await self._get_block_transactions(block_number)) + block_transactions
+
+        # Get the last num_tx transactions (default is 10)
+        return [self.extractTxData(transaction, options) for transaction in block_transactions[-num_tx:]]
+
+
+    async def get_transaction_by_id(self, tx_id = 'latest', options = ProviderOptions()):
+        """Get a Terra transaction by id"""
+        if tx_id == 'latest':
+            return (await self.get_transactions(1, options))[-1]
+
+        tx = await self.provider.tx.tx_info(tx_id)
+        return self.extractTxData(tx, options)
+
+
+    async def get_address(self, address_id):
+        address = await self.provider.bank.balance(address_id)
+        return Address(address = address_id, balance = self._print_balance(address[0].to_data()))
+
+
+    async def search_resource(self, search_text):
+        if self.validator.is_block(search_text):
+            block = await self.get_block_by_id(search_text)
+            return { "type" : "block", "data" : block }
+        if self.validator.is_address(search_text):
+            address = await self.get_address(search_text)
+            return { "type" : "address", "data" : address }
+        if self.validator.is_transaction(search_text):
+            transaction = await self.get_transaction_by_id(search_text)
+            return { "type" : "transaction", "data" : transaction }
+
+        raise NotFoundError(f"No block, address or transaction matches {search_text}")
+
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.session.close()
+            self._client = None
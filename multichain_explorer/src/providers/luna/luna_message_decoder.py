@@ -0,0 +1,87 @@
+from typing import Callable, Dict, Iterable, List
+from multichain_explorer.src.models.provider_models.transfer import Transfer
+from terra_sdk.core.bank import MsgMultiSend, MsgSend
+from terra_sdk.core.wasm import MsgExecuteContract
+
+
+class LunaMessageDecoder():
+    """
+    Decodes the messages of Terra transactions into transfers, with the from and to
+    addresses and the formatted value of the moved coins.
+
+    Every message class has its own decoder, looked up once per message. The messages
+    without a decoder (eg.: reward withdrawals, oracle votes) move no funds and make
+    no transfers. Decoders of other message classes can be registered at any time
+    """
+
+    def __init__(self):
+        self._decoders : Dict[type, Callable] = {
+            MsgSend : self._decode_send,
+            MsgExecuteContract : self._decode_execute_contract,
+            MsgMultiSend : self._decode_multi_send,
+        }
+
+
+    def register(self, message_type: type, decoder: Callable[[object], List[Transfer]]):
+        """
+        Register the decoder of a message class, replacing the current one
+
+        Args:
+            message_type: the message class (eg.: terra_sdk MsgSwap)
+            decoder: function returning the transfers of a message, see print_coins to format the values
+        """
+        self._decoders[message_type] = decoder
+
+
+    def decode(self, messages: Iterable) -> List[Transfer]:
+        """
+        Get the transfers of every message of a transaction, in order
+
+        Args:
+            messages: the messages of the transaction body
+
+        Returns:
+            The list of transfers
+        """
+        transfers = []
+        decoders = self._decoders
+        for message in messages:
+            decoder = decoders.get(type(message))
+            if decoder is not None:
+                transfers += decoder(message)
+        return transfers
+
+
+    @staticmethod
+    def print_coins(coins: List[dict]) -> str:
+        """Returns a string with the formatted coins ('amount (denom)'), "0" when there are none
+
+        Args:
+            coins (List[dict]): List of coins
+
+        returns:
+            str: Formatted coins
+        """
+        if len(coins) == 0:
+            return "0"
+        return ", ".join(f"{coin['amount']} ({coin['denom']})" for coin in coins)
+
+
+    def _decode_send(self, message: MsgSend) -> List[Transfer]:
+        return [Transfer(address_from = message.from_address, address_to = message.to_address, value = self.print_coins(message.amount.to_data()))]
+
+
+    def _decode_execute_contract(self, message: MsgExecuteContract) -> List[Transfer]:
+        return [Transfer(address_from = message.sender, address_to = message.contract, value = self.print_coins(message.coins.to_data()))]
+
+
+    def _decode_multi_send(self, message: MsgMultiSend) -> List[Transfer]:
+        if len(message.inputs) == 1:
+            # A single sender (the only kind allowed since Cosmos SDK 0.46) pays every output
+            sender = message.inputs[0].address
+            return [Transfer(address_from = sender, address_to = output.address, value = self.print_coins(output.coins.to_data()))
+                    for output in message.outputs]
+
+        # The inputs and outputs of several senders can't be paired, each one is a transfer on its own
+        return ([Transfer(address_from = input.address, address_to = "", value = self.print_coins(input.coins.to_data())) for input in message.inputs] +
+                [Transfer(address_from = "", address_to = output.address, value = self.print_coins(output.coins.to_data())) for output in message.outputs])
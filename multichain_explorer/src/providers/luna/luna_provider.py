@@ -1,13 +1,27 @@
 
+from multichain_explorer.src.cache.ttl_cache import TTLCache
 from multichain_explorer.src.models.blockchains import Blockchains
 from multichain_explorer.src.services.coinmarketcap_service import CoinMarketCapService
+from multichain_explorer.src.services.concurrent_service import ConcurrentService
+from multichain_explorer.src.services.event_loop_client import EventLoopClient
+from multichain_explorer.src.services.request_scheduler import ScheduledClient
 from multichain_explorer.src.validators.luna.luna_validator import LunaValidator
 from multichain_explorer.src.validators.validator import ValidatorInterface
 from multichain_explorer.src.models.provider_options import ProviderOptions
+from multichain_explorer.src.models.provider_models.address import Address
+from multichain_explorer.src.models.provider_models.block import Block
+from multichain_explorer.src.models.provider_models.raw_data import RawData
+from multichain_explorer.src.models.provider_models.summary import Summary
+from multichain_explorer.src.models.provider_models.transaction import Transaction
+from multichain_explorer.src.models.provider_models.transfer import Transfer
 from multichain_explorer.src.providers.provider import ProviderInterface
+from multichain_explorer.src.providers.luna.luna_message_decoder import LunaMessageDecoder
+from multichain_explorer.src.providers.not_found_error import NotFoundError
 
+import math
+import threading
 from typing import List
-from terra_sdk.client.lcd import LCDClient
+from terra_sdk.client.lcd import AsyncLCDClient
 
 class LunaProvider(ProviderInterface):
     
@@ -15,87 +29,205 @@ class LunaProvider(ProviderInterface):
     TERRA_CHAIN_ID  : str = ""
     TERRA_URL       : str = ""
 
+    # Settings the provider instances are pooled by
+    SETTINGS : tuple = ("TERRA_CHAIN_ID", "TERRA_URL")
+
+    # Maximum number of blocks before the tip read to fill the latest transactions
+    MAX_WALK_BACK_BLOCKS : int = 10
+
+    # Transactions asked for per page when listing the transactions of a block
+    SEARCH_PAGE_SIZE : int = 100
+
+    # Blocks, and transaction lists, kept in memory by height. Tendermint blocks are final once committed
+    BLOCK_CACHE_SIZE : int = 256
+
     validator: ValidatorInterface = LunaValidator()
     coinMarketCapService : CoinMarketCapService = CoinMarketCapService()
+    concurrentService : ConcurrentService = ConcurrentService()
+    # Decoders of the transaction messages, new message classes can be registered on it
+    messageDecoder : LunaMessageDecoder = LunaMessageDecoder()
+
+    # From, to and value of the transactions moving no funds
+    NO_TRANSFER : Transfer = Transfer(address_from = "", address_to = "", value = "")
 
 
     def __init__(self):
-        self.provider = LCDClient(chain_id = self.TERRA_CHAIN_ID, url = self.TERRA_URL)
+        self._client = None
+        self._loop_client = None
+        self._client_lock = threading.Lock()
+        self._blocks = TTLCache(ttl = math.inf, max_entries = self.BLOCK_CACHE_SIZE)
+        self._block_transactions = TTLCache(ttl = math.inf, max_entries = self.BLOCK_CACHE_SIZE)
+
+
+    @property
+    def provider(self) -> AsyncLCDClient:
+        """LCD client shared by the threads of the provider
+
+        A single async LCD client runs on an event loop of its own, the calling threads
+        (eg.: concurrent block fetches) wait for its results, see EventLoopClient
+        """
+        with self._client_lock:
+            if self._client is None:
+                self._loop_client = EventLoopClient.start(
+                    lambda: AsyncLCDClient(chain_id = self.TERRA_CHAIN_ID, url = self.TERRA_URL), "terra-lcd")
+                client = ScheduledClient(self._loop_client, "terra-lcd")
+                if self.instrumentation is not None:
+                    client = self.instrumentation.wrap_client(client)
+                self._client = client
+            return self._client
+
+
+    def close(self):
+        """Close the LCD client and its event loop, a new one is started on the next call"""
+        super().close()
+        with self._client_lock:
+            if self._loop_client is not None:
+                self._loop_client.stop()
+            self._client = None
+            self._loop_client = None
+        self._blocks.clear()
+        self._block_transactions.clear()
 
 
     def get_summary(self):
-        data = CoinMarketCapService().fetchData(Blockchains.LUNA.value)
-        cryptoData = data['data'][Blockchains.LUNA.value]
-        currency = "USD"
-
-        summary = {
-            "name" : cryptoData['name'],
-            "price" : cryptoData['quote'][currency]['price'],
-            "marketCap" : cryptoData['quote'][currency]['market_cap'],
-            "totalSupply" : cryptoData['total_supply']
-        }
+        # Served from the batched, cached quotes of all the chains
+        cryptoData = self.coinMarketCapService.fetch_quote(Blockchains.LUNA.value)
+        currency = self.coinMarketCapService.currency
+
+        summary = Summary(
+            name = cryptoData['name'],
+            price = cryptoData['quote'][currency]['price'],
+            market_cap = cryptoData['quote'][currency]['market_cap'],
+            total_supply = cryptoData['total_supply']
+        )
         return summary
 
 
+    def fetch_latest_block_number(self) -> int:
+        """Fetches the number of the latest LUNA block, the block is kept so reading it afterwards is free"""
+        block = self.provider.tendermint.block_info()
+        block_number = int( block['block']['header']['height'] )
+        self._blocks.set(block_number, block)
+        return block_number
+
+
     def get_blocks(self, num_blocks = 10, options = ProviderOptions()):
-        latest_block_number = int( self.provider.tendermint.block_info()['block']['header']['height'] )
-        latest_blocks = []
-
-        for block_number in range(latest_block_number, 
-                                latest_block_number - num_blocks, 
-                                -1):
-            block_data = self.get_block_by_id(block_number)
-            latest_blocks.append(block_data)
-        
-        return latest_blocks
+        if self.rollingWindow is not None:
+            blocks = self.rollingWindow.get_blocks(num_blocks, options)
+            if blocks is not None:
+                return blocks
+
+        latest_block_number = self.get_latest_block_number()
+
+        block_numbers = range(latest_block_number, 
+                              latest_block_number - num_blocks, 
+                              -1)
+
+        # Blocks are fetched concurrently, a failed block is reported in its place
+        return self.concurrentService.map_ordered(
+                    lambda block_number: self.get_block_by_id(block_number, options),
+                    block_numbers,
+                    on_error = lambda block_number, err: { "id" : block_number, "error" : str(err) },
+                    max_concurrency = options.max_concurrency
+                )
 
 
     def get_block_by_id(self, block_id = 'latest', options = ProviderOptions()):
-        try:
-            if block_id == 'latest':
-                block = self.provider.tendermint.block_info()
-            else:
-                block_id = int(block_id) #Cast to int
-                block = self.provider.tendermint.block_info(block_id)
-
-            block_data = {
-                "id" :block_id,
-                "miner" : block['block']['header']['proposer_address'],
-                "difficulty" : "-",
-                "timestamp": block['block']['header']['time']
-            }
-            
-            if options.raw:
-                block_data["rawData"] = {}
+        if block_id == 'latest' and self.headTracker is not None:
+            return self.headTracker.get_latest_block(options)
+
+        if block_id == 'latest':
+            block = self.provider.tendermint.block_info()
+            self._blocks.set(int( block['block']['header']['height'] ), block)
+        else:
+            block = self._get_block(int(block_id)) #Cast to int
 
-            return block_data
+        return self._get_block_data(block, options)
 
-        except Exception as e:
-            raise
+
+    def _get_block(self, block_number: int) -> dict:
+        """Get the tendermint block of a height, read once and then served from memory"""
+        block = self._blocks.get(block_number)
+        if block is None:
+            block = self.provider.tendermint.block_info(block_number)
+            self._blocks.set(block_number, block)
+        return block
+
+
+    def _get_block_transactions(self, block_number: int) -> list:
+        """
+        Get the transactions of a height, read once and then served from memory
+
+        The transactions are searched by height, a page of SEARCH_PAGE_SIZE transactions
+        per call, instead of tx_infos_by_height asking for every transaction one by one
+        """
+        block_transactions = self._block_transactions.get(block_number)
+        if block_transactions is not None:
+            return block_transactions
+
+        block_transactions = []
+        while True:
+            page = self.provider.tx.search([["tx.height", block_number]],
+                                           { "pagination.limit" : str(self.SEARCH_PAGE_SIZE), "pagination.offset" : str(len(block_transactions)) })
+            block_transactions += page["txs"]
+            total = int( (page.get("pagination") or {}).get("total") or 0 )
+            if len(page["txs"]) < self.SEARCH_PAGE_SIZE or len(block_transactions) >= total:
+                break
+
+        # An empty list may be a height not produced yet, only the found transactions are kept
+        if len(block_transactions) > 0:
+            self._block_transactions.set(block_number, block_transactions)
+        return block_transactions
+
+
+    def _get_block_data(self, block: dict, options = ProviderOptions()) -> Block:
+        """Builds the block data from a tendermint block (shared with the async provider)"""
+        return Block(
+            id = int( block['block']['header']['height'] ),
+            miner = block['block']['header']['proposer_address'],
+            difficulty = "-",
+            timestamp = block['block']['header']['time'],
+            hash = block['block_id']['hash'],
+            parent_hash = block['block']['header']['last_block_id']['hash'],
+            raw_data = RawData(block) if options.raw else None
+        )
 
 
     def get_transactions(self, num_tx = 10, options = ProviderOptions()):
-        """Returns a list of transactions, default number of transactions is 10"""
-        try:
-            block_transactions = self.provider.tx.tx_infos_by_height()
-            latest_transactions = []
+        """
+        Returns a list of transactions, default number of transactions is 10
 
-            # Get the last num_tx transactions from block (default is 10)
-            for transaction in block_transactions[-num_tx:]:
-                transaction_data = self.extractTxData(transaction, options)
-                latest_transactions.append(transaction_data)
+        The transactions are read from the tip block, walking back to the previous blocks
+        (up to MAX_WALK_BACK_BLOCKS) when the tip block has fewer than num_tx transactions
+        """
+        if self.rollingWindow is not None:
+            transactions = self.rollingWindow.get_transactions(num_tx, options)
+            if transactions is not None:
+                return transactions
 
-        except ValueError as err:
-            # Log exception
-            raise
-        
-        return latest_transactions
+        latest_block_number = self.get_latest_block_number()
+        block_transactions = list(self._get_block_transactions(latest_block_number))
+
+        block_number = latest_block_number
+        while len(block_transactions) < num_tx and block_number > 1 and latest_block_number - block_number + 1 < self.MAX_WALK_BACK_BLOCKS:
+            block_number -= 1
+            block_transactions = list(self._get_block_transactions(block_number)) + block_transactions
+
+        # Get the last num_tx transactions (default is 10)
+        return [self.extractTxData(transaction, options) for transaction in block_transactions[-num_tx:]]
+
+
+    def get_block_transactions(self, block_id, options = ProviderOptions()):
+        """Get all the transactions of a Terra block"""
+        block_transactions = self._get_block_transactions(int(block_id))
+        return [self.extractTxData(transaction, options) for transaction in block_transactions]
 
 
     def get_transaction_by_id(self, tx_id = 'latest', options = ProviderOptions()):
         """Get a Terra transaction by id"""
         if tx_id == 'latest':
-            tx_id = self.provider.tx.tx_infos_by_height()[-1].txhash
+            # The listed transactions are whole, no need to read the last one again
+            return self.get_transactions(1, options)[-1]
 
         try:
             tx = self.provider.tx.tx_info(tx_id)
@@ -108,12 +240,7 @@ class LunaProvider(ProviderInterface):
     def get_address(self, address_id):
         try:
             address = self.provider.bank.balance(address_id)
-            address_info = {
-                "address"   : address_id,
-                "balance"   : self._print_balance(address[0].to_data())
-            }
-
-            return address_info
+            return Address(address = address_id, balance = self._print_balance(address[0].to_data()))
         except Exception as err:
             raise
 
@@ -129,73 +256,34 @@ class LunaProvider(ProviderInterface):
             transaction = self.get_transaction_by_id(search_text)
             return { "type" : "transaction", "data" : transaction }
             
-        raise
+        raise NotFoundError(f"No block, address or transaction matches {search_text}")
 
 
-    def extractTxData(self, tx, options = ProviderOptions()) -> dict:
-        """Extracts data from a transaction"""
-        
-        # Get the transaction data based on transaction type
-        from_address = ""
-        to_address = ""  
-        value = ""
-
-        if type( tx.tx.body.messages[0] ).__name__ == 'MsgSend':
-            from_address = tx.tx.body.messages[0].from_address
-            to_address = tx.tx.body.messages[0].to_address
-            value = self._print_coins( tx.tx.body.messages[0].amount.to_data() )
-        elif type( tx.tx.body.messages[0] ).__name__ == 'MsgExecuteContract':
-            from_address = tx.tx.body.messages[0].sender
-            to_address = tx.tx.body.messages[0].contract  
-            value = self._print_coins( tx.tx.body.messages[0].coins.to_data() )
-        elif type( tx.tx.body.messages[0] ).__name__ == 'MsgMultiSend':
-            from_address = ""
-            to_address = ""  
-            value = ""
-        elif type( tx.tx.body.messages[0] ).__name__ == 'MsgWithdrawDelegationReward':
-            from_address = ""
-            to_address = ""  
-            value = ""
-        elif type( tx.tx.body.messages[0] ).__name__ == 'MsgWithdrawValidatorCommission':
-            from_address = ""
-            to_address = ""  
-            value = ""
-        elif type( tx.tx.body.messages[0] ).__name__ == 'MsgAggregateExchangeRateVote':
-            from_address = ""
-            to_address = ""  
-            value = ""
-
-        tx_data = {
-                "id"    : tx.txhash,
-                "from"  : from_address,
-                "to"    : to_address,
-                "value" : value,
-                "block" : tx.height
-            }
-        
-        if options.raw:
-            #TODO - Add raw data
-            tx_data["rawData"] = {}
-
-        return tx_data
-
-
-    def _print_coins(self, coins: List[dict]) -> str:
-        """Returns a string with the formatted coins ('denom: amount')
-        
-        Args:
-            coins (List[dict]): List of coins
-
-        returns:
-            str: Formatted coins
+    def extractTxData(self, tx, options = ProviderOptions()) -> Transaction:
         """
+        Extracts data from a transaction
 
-        if len(coins) == 0:
-            return "0"
-        else:
-            format_coins = lambda coin: f"{coin['amount']} ({coin['denom']})"
-            formatted_coins = map(format_coins, coins)
-            return ", ".join(formatted_coins)
+        The transfers of every message are decoded by the messageDecoder, the from, to
+        and value of the transaction are the ones of its first transfer
+        """
+        transfers = self.messageDecoder.decode(tx.tx.body.messages)
+        first_transfer = transfers[0] if len(transfers) > 0 else self.NO_TRANSFER
+
+        return Transaction(
+            id = tx.txhash,
+            address_from = first_transfer.address_from,
+            address_to = first_transfer.address_to,
+            value = first_transfer.value,
+            block = tx.height,
+            transfers = tuple(transfers),
+            raw_data = RawData(tx, self._encode_tx) if options.raw else None
+        )
+
+
+    @staticmethod
+    def _encode_tx(tx) -> str:
+        """JSON of a terra_sdk transaction info, as returned by the LCD API"""
+        return tx.to_json()
 
 
     def _print_balance(self, balances: List[dict]) -> str:
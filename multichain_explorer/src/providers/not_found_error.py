@@ -0,0 +1,5 @@
+class NotFoundError(ValueError):
+    """
+    Raised by the providers when no block, address or transaction matches the requested one.
+    A ValueError, as the providers raised before
+    """
@@ -1,12 +1,27 @@
 import abc
-from typing import List
+from typing import Iterator, List, Union
 from multichain_explorer.src.models.provider_options import ProviderOptions
+from multichain_explorer.src.models.provider_models.address import Address
+from multichain_explorer.src.models.provider_models.block import Block
+from multichain_explorer.src.models.provider_models.transaction import Transaction
 
 class ProviderInterface(metaclass=abc.ABCMeta):
+
+    # Set by a running HeadTracker, the "latest" lookups are then served from memory
+    headTracker = None
+
+    # Set by a started RollingWindow, the latest blocks and transactions are then served from memory
+    rollingWindow = None
+
+    # Set by an attached Instrumentation, the calls to the provider and its clients are then recorded
+    instrumentation = None
+
     @classmethod
     def __subclasshook__(cls, subclass):
         return (hasattr(subclass, 'get_summary') and 
                 callable(subclass.get_summary) and 
+                hasattr(subclass, 'fetch_latest_block_number') and 
+                callable(subclass.fetch_latest_block_number) and 
                 hasattr(subclass, 'get_blocks') and 
                 callable(subclass.get_blocks) and 
                 hasattr(subclass, 'get_block_by_id') and 
@@ -14,6 +29,8 @@ class ProviderInterface(metaclass=abc.ABCMeta):
                 hasattr(subclass, 'get_transactions') and 
                 callable(subclass.get_transactions) and 
                 hasattr(subclass, 'get_transaction_by_id') and 
+                hasattr(subclass, 'get_block_transactions') and 
+                callable(subclass.get_block_transactions) and 
                 callable(subclass.get_transaction_by_id) and 
                 callable(subclass.get_address) and 
                 hasattr(subclass, 'get_address') and 
@@ -27,8 +44,7 @@ class ProviderInterface(metaclass=abc.ABCMeta):
         Get a summary of the blockchain
 
         Returns:
-            A dict containing the summary data of the blockchain
-            The dict has the following structure:
+            A Summary with the summary data of the blockchain, its to_dict has the following structure:
             {
                 "name" : blockchain_name,
                 "price" : token_price,
@@ -41,17 +57,56 @@ class ProviderInterface(metaclass=abc.ABCMeta):
         """
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def fetch_latest_block_number(self) -> int:
+        """ Fetch the number (height) of the latest block from the blockchain
+        
+        Returns:
+            The latest block number as an int
+            
+        Raises:
+            NotImplementedError if the method is not implemented
+        """
+        raise NotImplementedError
+
+    def get_latest_block_number(self) -> int:
+        """ Get the number (height) of the latest block, from the head tracker when one is running
+        
+        Returns:
+            The latest block number as an int
+        """
+        if self.headTracker is not None:
+            return self.headTracker.get_latest_block_number()
+        return self.fetch_latest_block_number()
+
+    def get_tracked_block_number(self):
+        """ Get the latest block number known by the head tracker
+        
+        Returns:
+            The latest block number as an int, None when no head tracker is running
+            so the caller can let the blockchain resolve "latest" in the same call
+        """
+        if self.headTracker is not None:
+            return self.headTracker.get_latest_block_number()
+        return None
+
     @abc.abstractmethod
     def get_blocks(self, num_blocks: int, options: ProviderOptions):
         """ Get a list of blocks
         
         Args:
             num_blocks: number of blocks to return
-            options: ProviderOptions object 
+            options: ProviderOptions object
 
         Returns:
-            The list of blocks
-            
+            The list of blocks, from the latest to the oldest. The blocks are fetched
+            concurrently (up to options.max_concurrency calls in flight), a block that
+            could not be fetched is returned in its place as:
+            {
+                "id"    : block_number,
+                "error" : error_message
+            }
+
         Raises:
             NotImplementedError if the method is not implemented
         """
@@ -66,14 +121,15 @@ class ProviderInterface(metaclass=abc.ABCMeta):
             options: ProviderOptions object 
 
         Returns:
-            A dict containing the block data
-            The dict has the following structure:
+            A Block with the block data, its to_dict has the following structure:
             {
                 "id"            : block_number,
                 "miner"         : miner,
                 "difficulty"    : difficulty,
                 "timestamp"     : timestamp,
-                "rawData"       : raw_data (optional)
+                "hash"          : block_hash (None on chains without block hashes),
+                "parentHash"    : parent_block_hash,
+                "rawData"       : raw_data, as given by the blockchain (only with options.raw)
             }
             
         Raises:
@@ -105,15 +161,16 @@ class ProviderInterface(metaclass=abc.ABCMeta):
             tx_id: id of the transaction
 
         Returns:
-            A dict containing the transaction data
-            The dict has the following structure:
+            A Transaction with the transaction data, its to_dict has the following structure:
             {
-                "id"    : tx_id,
-                "from"  : transaction_from,
-                "to"    : transaction_to,
-                "value" : transaction_value,
-                "block" : transaction_blockNumber
-                "rawData" : transaction_rawData (optional)
+                "id"        : tx_id,
+                "from"      : transaction_from,
+                "to"        : transaction_to,
+                "value"     : transaction_value,
+                "block"     : transaction_blockNumber,
+                "blockHash" : transaction_blockHash (None when not given by the blockchain),
+                "transfers" : every transfer of the transaction (optional),
+                "rawData"   : transaction_rawData, as given by the blockchain (only with options.raw)
             } 
         
         Raises:
@@ -129,10 +186,9 @@ class ProviderInterface(metaclass=abc.ABCMeta):
             address_id: address identifier
 
         Returns:
-            A dict containing the address data
-            The dict has the following structure:
+            An Address with the address data, its to_dict has the following structure:
             {
-                "id"        : address_id,
+                "address"   : address_id,
                 "balance"   : address_balance,
             }
         
@@ -141,6 +197,31 @@ class ProviderInterface(metaclass=abc.ABCMeta):
         """
         raise NotImplementedError
 
+    def get_addresses(self, address_ids: List[str], options = ProviderOptions()) -> List[Union[Address, dict]]:
+        """Returns several addresses by their address identifiers
+        
+        The addresses are fetched concurrently, up to options.max_concurrency calls in flight.
+        Providers whose blockchain supports bulk lookups override it with a batched version
+
+        Args:
+            address_ids: the address identifiers
+            options: the provider options
+
+        Returns:
+            A list with the addresses data, see get_address, ordered as the
+            identifiers. A failed address is reported in its place as:
+            {
+                "address"   : address_id,
+                "error"     : error message
+            }
+        """
+        return self.concurrentService.map_ordered(
+                    self.get_address,
+                    address_ids,
+                    on_error = lambda address_id, err: { "address" : address_id, "error" : str(err) },
+                    max_concurrency = options.max_concurrency
+                )
+
     @abc.abstractmethod
     def search_resource(self, search_text):
         """Search for a resource (block, address or transaction) by search_text
@@ -153,10 +234,87 @@ class ProviderInterface(metaclass=abc.ABCMeta):
             The dict has the following structure:
             {
                 "type"  : type ("block", "address" or "transaction"),
-                "data"  : dict with block, address or transaction data
+                "data"  : the Block, Address or Transaction
             }
         
+        Raises:
+            NotFoundError (a ValueError) if the text does not match any resource of the blockchain
+            NotImplementedError if the method is not implemented
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_block_transactions(self, block_id, options = ProviderOptions()) -> List[Transaction]:
+        """
+        Get all the transactions of a block
+
+        Args:
+            block_id: the block id (number or hash)
+            options: the provider options
+
+        Returns:
+            A list with the transactions data, see get_transaction_by_id
+
         Raises:
             NotImplementedError if the method is not implemented
         """
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+
+
+    def iter_blocks(self, start: int, end: int, options = ProviderOptions()) -> Iterator[Union[Block, dict]]:
+        """
+        Iterate over the blocks from start to end, both included, going downwards when end < start
+
+        The blocks are prefetched concurrently, up to options.max_concurrency blocks ahead of the
+        caller, and yielded in order as they arrive. A failed block is yielded as { "id", "error" }
+
+        Args:
+            start: the number of the first block
+            end: the number of the last block
+            options: the provider options
+
+        Yields:
+            The blocks data, see get_block_by_id
+        """
+        step = 1 if end >= start else -1
+        return self.concurrentService.iter_ordered(
+                    lambda block_number: self.get_block_by_id(block_number, options),
+                    range(start, end + step, step),
+                    on_error = lambda block_number, err: { "id" : block_number, "error" : str(err) },
+                    window = options.max_concurrency
+                )
+
+
+    def iter_transactions(self, start: int, end: int, options = ProviderOptions()) -> Iterator[Union[Transaction, dict]]:
+        """
+        Iterate over the transactions of the blocks from start to end, both included,
+        going downwards when end < start. The transactions of a block keep their order
+
+        The blocks transactions are prefetched concurrently, up to options.max_concurrency
+        blocks ahead of the caller. A block whose transactions failed is yielded as { "block", "error" }
+
+        Args:
+            start: the number of the first block
+            end: the number of the last block
+            options: the provider options
+
+        Yields:
+            The transactions data, see get_transaction_by_id
+        """
+        step = 1 if end >= start else -1
+        blocks_transactions = self.concurrentService.iter_ordered(
+                                    lambda block_number: self.get_block_transactions(block_number, options),
+                                    range(start, end + step, step),
+                                    on_error = lambda block_number, err: [{ "block" : block_number, "error" : str(err) }],
+                                    window = options.max_concurrency
+                                )
+        for block_transactions in blocks_transactions:
+            yield from block_transactions
+
+
+    def close(self):
+        """Release the clients and connections held by the provider, stop its head tracker and rolling window"""
+        if self.rollingWindow is not None:
+            self.rollingWindow.stop()
+        if self.headTracker is not None:
+            self.headTracker.stop()
@@ -1,32 +1,181 @@
+import threading
+from typing import Dict, Tuple, Type
 
 from multichain_explorer.src.providers.ada.ada_provider import AdaProvider
 from multichain_explorer.src.providers.algo.algo_provider import AlgoProvider
 from multichain_explorer.src.providers.btc.btc_provider import BtcProvider
 from multichain_explorer.src.providers.eth.eth_provider import EthProvider
 from multichain_explorer.src.providers.luna.luna_provider import LunaProvider
+from multichain_explorer.src.providers.ada.async_ada_provider import AsyncAdaProvider
+from multichain_explorer.src.providers.algo.async_algo_provider import AsyncAlgoProvider
+from multichain_explorer.src.providers.btc.async_btc_provider import AsyncBtcProvider
+from multichain_explorer.src.providers.eth.async_eth_provider import AsyncEthProvider
+from multichain_explorer.src.providers.luna.async_luna_provider import AsyncLunaProvider
 from multichain_explorer.src.providers.provider import ProviderInterface
+from multichain_explorer.src.providers.async_provider import AsyncProviderInterface
 from multichain_explorer.src.models.blockchains import Blockchains
+from multichain_explorer.src.metrics.instrumentation import Instrumentation
+from multichain_explorer.src.metrics.metrics_backend import MetricsBackendInterface
+from multichain_explorer.src.metrics.noop_metrics_backend import NoopMetricsBackend
+from multichain_explorer.src.services.head_tracker import HeadTracker
+from multichain_explorer.src.services.rolling_window import RollingWindow
 
 class BlockchainProvider():
+    """
+    Factory of the blockchain providers. Sync providers are long lived and shared
+    between threads, one instance per blockchain and provider settings
+    """
+
+    PROVIDERS : Dict[Blockchains, Type[ProviderInterface]] = {
+        Blockchains.BTC : BtcProvider,
+        Blockchains.ETH : EthProvider,
+        Blockchains.ADA : AdaProvider,
+        Blockchains.ALGO : AlgoProvider,
+        Blockchains.LUNA : LunaProvider
+    }
+
+    # Track the head of the pooled instances on a background thread, see HeadTracker
+    TRACK_HEADS : bool = False
+
+    # Serve the latest blocks and transactions of the pooled instances from memory, see RollingWindow
+    ROLLING_WINDOWS : bool = False
+
+    # Where the calls of the providers and of their upstream clients are recorded, see Instrumentation.
+    # The providers are not instrumented with the default no-op backend
+    METRICS_BACKEND : MetricsBackendInterface = NoopMetricsBackend()
+
+    _instances : Dict[Blockchains, Tuple[tuple, ProviderInterface]] = {}
+    _lock = threading.Lock()
+
 
     def get_instance(blockchain_id: Blockchains) -> ProviderInterface:
         """
         Get the blockchain provider instance
 
+        The instance is created on first use and reused afterwards. When the provider
+        settings (eg.: EthProvider.INFURA_URL) or the METRICS_BACKEND change, the old
+        instance is closed and a new one is created with the new settings
+
         Args:
             blockchain_id: the blockchain id as an enum
         
         Returns:
             The blockchain provider instance wrapped in a ProviderInterface
         """
+        settings = (BlockchainProvider.get_settings(blockchain_id), BlockchainProvider.METRICS_BACKEND)
+        with BlockchainProvider._lock:
+            pooled = BlockchainProvider._instances.get(blockchain_id)
+            if pooled is not None and pooled[0] == settings:
+                return pooled[1]
+
+            instance = BlockchainProvider.create_instance(blockchain_id)
+            if BlockchainProvider.TRACK_HEADS:
+                HeadTracker(instance, blockchain_id).start()
+            if BlockchainProvider.ROLLING_WINDOWS:
+                RollingWindow(instance).start()
+            BlockchainProvider._instances[blockchain_id] = (settings, instance)
+
+        if pooled is not None:
+            pooled[1].close()
+        return instance
+
+
+    def create_instance(blockchain_id: Blockchains) -> ProviderInterface:
+        """
+        Create a new blockchain provider instance, not shared with other callers
+
+        Args:
+            blockchain_id: the blockchain id as an enum
+
+        Returns:
+            The blockchain provider instance wrapped in a ProviderInterface
+        """
+        instance = BlockchainProvider.PROVIDERS[blockchain_id]()
+        BlockchainProvider.instrument(instance, blockchain_id)
+        return instance
+
+
+    def instrument(instance, blockchain_id: Blockchains):
+        """
+        Record the calls of a provider instance, sync or async, into the METRICS_BACKEND
+
+        Args:
+            instance: the provider instance
+            blockchain_id: the blockchain id as an enum
+        """
+        # Not isinstance, the interface subclass hook matches every backend
+        if type(BlockchainProvider.METRICS_BACKEND) is not NoopMetricsBackend:
+            Instrumentation(BlockchainProvider.METRICS_BACKEND, blockchain_id).attach(instance)
+
+
+    def get_settings(blockchain_id: Blockchains) -> tuple:
+        """
+        Get the current settings of a blockchain provider
+
+        Args:
+            blockchain_id: the blockchain id as an enum
+
+        Returns:
+            The values of the provider settings, as a tuple
+        """
+        provider_class = BlockchainProvider.PROVIDERS[blockchain_id]
+        return tuple(getattr(provider_class, setting) for setting in provider_class.SETTINGS)
+
+
+    def close(blockchain_id: Blockchains = None):
+        """
+        Close the pooled provider instances
+
+        Args:
+            blockchain_id: the blockchain to close the instance of, all of them if not set
+        """
+        with BlockchainProvider._lock:
+            if blockchain_id is None:
+                closed = list(BlockchainProvider._instances.values())
+                BlockchainProvider._instances.clear()
+            else:
+                closed = [BlockchainProvider._instances.pop(blockchain_id)] if blockchain_id in BlockchainProvider._instances else []
+
+        for _, instance in closed:
+            instance.close()
+
+
+    def reload(blockchain_id: Blockchains) -> ProviderInterface:
+        """
+        Replace the pooled provider instance with a new one, eg.: after changing its settings
+
+        Args:
+            blockchain_id: the blockchain id as an enum
+
+        Returns:
+            The new blockchain provider instance wrapped in a ProviderInterface
+        """
+        BlockchainProvider.close(blockchain_id)
+        return BlockchainProvider.get_instance(blockchain_id)
+
+
+    def get_async_instance(blockchain_id: Blockchains) -> AsyncProviderInterface:
+        """
+        Get a new asynchronous blockchain provider instance, not pooled
+        as the async clients are bound to the event loop they are used on
+
+        Args:
+            blockchain_id: the blockchain id as an enum
+
+        Returns:
+            The blockchain provider instance wrapped in an AsyncProviderInterface
+        """
         match blockchain_id:
             case Blockchains.BTC:
-                return BtcProvider()
+                instance = AsyncBtcProvider()
             case Blockchains.ETH:
-                return EthProvider()
+                instance = AsyncEthProvider()
             case Blockchains.ADA:
-                return AdaProvider()
+                instance = AsyncAdaProvider()
             case Blockchains.ALGO:
-                return AlgoProvider()
+                instance = AsyncAlgoProvider()
             case Blockchains.LUNA:
-                return LunaProvider()
\ No newline at end of file
+                instance = AsyncLunaProvider()
+
+        BlockchainProvider.instrument(instance, blockchain_id)
+        return instance
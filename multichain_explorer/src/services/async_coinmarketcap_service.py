@@ -0,0 +1,76 @@
+import asyncio
+from typing import List
+from multichain_explorer.src.services.async_fetch_service import AsyncFetchService
+from multichain_explorer.src.services.coinmarketcap_service import CoinMarketCapService
+from multichain_explorer.src.services.request_scheduler import ScheduledClient
+
+
+class AsyncCoinMarketCapService():
+    """
+    This class is used to fetch data from the CoinMarketCap API from coroutines.
+    It shares the settings and the quotes cache of CoinMarketCapService
+    """
+
+    # Requests in flight by event loop, shared by every instance so the coroutines of
+    # all the providers missing the same quotes wait for a single request
+    _inFlight : dict = {}
+
+    def __init__(self):
+        self.service = CoinMarketCapService()
+        self.currency = self.service.currency
+        self.fetchService = ScheduledClient(AsyncFetchService.get_shared(), "coinmarketcap", asynchronous = True)
+
+
+    async def fetch_many(self, symbols: List[str]) -> dict:
+        """
+        Fetch the quotes of several cryptocurrencies with a single API call,
+        see CoinMarketCapService.fetch_many
+
+        Args:
+            symbols: the symbols of the cryptocurrencies
+
+        Returns:
+            A dict with the data of each symbol, keyed by symbol
+        """
+        quotes = self.service.get_cached_quotes(symbols)
+        missing = [symbol for symbol in symbols if symbol not in quotes]
+
+        if missing:
+            to_fetch = sorted(set(missing) | set(self.service.prefetchSymbols))
+            # The tasks are bound to their event loop
+            key = (asyncio.get_running_loop(), tuple(to_fetch), self.currency)
+
+            task = self._inFlight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(self._fetch_quotes(to_fetch))
+                self._inFlight[key] = task
+                task.add_done_callback(lambda _: self._inFlight.pop(key, None))
+
+            await asyncio.shield(task)
+            quotes.update(self.service.get_cached_quotes(missing))
+
+        # Raises KeyError for the symbols CoinMarketCap did not return
+        return { symbol : quotes[symbol] for symbol in symbols }
+
+
+    async def fetch_quote(self, symbol: str) -> dict:
+        """
+        Fetch the quote of a cryptocurrency, served from the batched quotes cache
+
+        Args:
+            symbol: the symbol of the cryptocurrency
+
+        Returns:
+            The data of the cryptocurrency as a dict
+        """
+        return (await self.fetch_many([symbol]))[symbol]
+
+
+    async def _fetch_quotes(self, symbols: List[str]):
+        """Fetch the quotes of the symbols in one call and cache them"""
+        data = await self.fetchService.fetch_json(
+                                        self.service.COINMARKETCAP_API_URL,
+                                        self.service.get_params(",".join(symbols)),
+                                        self.service.get_headers()
+                                    )
+        self.service.store_quotes(data)
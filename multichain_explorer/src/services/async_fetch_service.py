@@ -0,0 +1,135 @@
+import asyncio
+import json
+import threading
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+from multichain_explorer.src.metrics.instrumentation import Instrumentation
+from multichain_explorer.src.services.fetch_service import FetchService
+
+
+class AsyncFetchService():
+    """
+    This class is used to fetch data over HTTP from coroutines, through a pooled
+    aiohttp session per event loop. Pool size, timeouts and retries are read from
+    the FetchService settings
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+
+    def __init__(self):
+        self._sessions = {}
+
+
+    @classmethod
+    def get_shared(cls) -> "AsyncFetchService":
+        """
+        Get the async fetch service shared by every async service and provider
+
+        Returns:
+            The shared AsyncFetchService instance
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+
+    def get_session(self) -> ClientSession:
+        """
+        Get the pooled session of the running event loop, created on first use
+
+        Returns:
+            The aiohttp session
+        """
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            self._prune()
+            connector = TCPConnector(limit = FetchService.POOL_CONNECTIONS * FetchService.POOL_MAXSIZE,
+                                     limit_per_host = FetchService.POOL_MAXSIZE)
+            timeout = ClientTimeout(sock_connect = FetchService.CONNECT_TIMEOUT,
+                                    sock_read = FetchService.READ_TIMEOUT)
+            session = ClientSession(connector = connector, timeout = timeout)
+            self._sessions[loop] = session
+        return session
+
+
+    def _prune(self):
+        """
+        Drop the sessions of the closed event loops (eg.: of finished asyncio.run calls).
+        They can't be closed without their loop, their connections were closed along with it
+        """
+        for loop in [loop for loop in self._sessions if loop.is_closed()]:
+            del self._sessions[loop]
+
+
+    async def fetch_json(self, endpoint: str, parameters = None, headers = None):
+        """
+        Fetch JSON data from an endpoint
+
+        Args:
+            endpoint: the endpoint to fetch from
+            parameters: the parameters to pass to the endpoint
+            headers: the headers to pass to the endpoint
+
+        Returns:
+            The decoded JSON data
+
+        Raises:
+            aiohttp.ClientError: if the connection fails or the response is an error
+        """
+        return await self._request("GET", endpoint, params = parameters, headers = headers)
+
+
+    async def post_json(self, endpoint: str, payload, headers = None):
+        """
+        Post a JSON payload to an endpoint and return the JSON response
+
+        Args:
+            endpoint: the endpoint to post to
+            payload: the data to send as JSON
+            headers: the headers to pass to the endpoint
+
+        Returns:
+            The decoded JSON data
+
+        Raises:
+            aiohttp.ClientError: if the connection fails or the response is an error
+        """
+        # Encoded here so the bytes sent can be counted
+        headers = { **(headers or {}), "Content-Type" : "application/json" }
+        return await self._request("POST", endpoint, data = json.dumps(payload).encode(), headers = headers)
+
+
+    async def _request(self, method: str, endpoint: str, **kwargs):
+        """Send a request, retrying with exponential backoff on 5xx responses (429 is raised to the RequestScheduler)"""
+        session = self.get_session()
+        attempt = 0
+
+        while True:
+            async with session.request(method, endpoint, **kwargs) as response:
+                if response.status in FetchService.RETRY_STATUSES and attempt < FetchService.MAX_RETRIES:
+                    await asyncio.sleep(self._get_retry_delay(response, attempt))
+                    attempt += 1
+                    continue
+
+                response.raise_for_status()
+                body = await response.read()
+                Instrumentation.count_traffic(len(kwargs.get("data") or b""), len(body))
+                return await response.json(content_type = None)
+
+
+    def _get_retry_delay(self, response, attempt: int) -> float:
+        """Seconds to wait before a retry, the Retry-After header takes precedence"""
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None and retry_after.isdigit():
+            return float(retry_after)
+        return FetchService.BACKOFF_FACTOR * (2 ** attempt)
+
+
+    async def close(self):
+        """Close the session of the running event loop"""
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
@@ -0,0 +1,77 @@
+import inspect
+from typing import Callable
+
+
+class ClientProxy():
+    """
+    Proxy of an upstream client passing every method call, and every property read
+    (eg.: Web3 eth.block_number), through a wrapper. Sub-clients (eg.: Web3 eth, the
+    Algorand indexer, the Terra tendermint API) are proxied as well, and proxies of
+    different kinds can be stacked on the same client
+    """
+
+    # Attribute values returned as they are, the rest are sub-clients
+    PLAIN_TYPES : tuple = (str, bytes, int, float, bool, dict, list, tuple, set, type(None))
+
+    # Attributes returned as they are, the HTTP sessions and the cleanup of the clients are not upstream calls
+    NOT_WRAPPED : tuple = ("session", "close")
+
+
+    def __init__(self, client, prefix: str = ""):
+        """
+        Args:
+            client: the upstream client, or another proxy of it
+            prefix: path of the client from the provider, prefix of the wrapped endpoints
+        """
+        object.__setattr__(self, "_client", client)
+        object.__setattr__(self, "_prefix", prefix)
+
+
+    def wrap_call(self, call: Callable, endpoint: str) -> Callable:
+        """
+        Wrap a call to the upstream
+
+        Args:
+            call: the client method
+            endpoint: the path of the method from the provider (eg.: eth.get_block)
+
+        Returns:
+            The wrapped call
+        """
+        raise NotImplementedError
+
+
+    def wrap_sub_client(self, client, prefix: str) -> "ClientProxy":
+        """Proxy a sub-client, with the same wrapper"""
+        raise NotImplementedError
+
+
+    def get_target(self):
+        """The proxied client, under every stacked proxy"""
+        client = self._client
+        while isinstance(client, ClientProxy):
+            client = client._client
+        return client
+
+
+    def __getattr__(self, name: str):
+        if name.startswith("_") or name in self.NOT_WRAPPED:
+            return getattr(self._client, name)
+
+        endpoint = f"{self._prefix}.{name}" if self._prefix else name
+        # Looked up statically, descriptors of the clients (eg.: web3 Method) fail when read from the class
+        if isinstance(inspect.getattr_static(type(self.get_target()), name, None), property):
+            # Properties of the clients may call the upstream
+            return self.wrap_call(lambda: getattr(self._client, name), endpoint)()
+
+        value = getattr(self._client, name)
+        if callable(value):
+            return self.wrap_call(value, endpoint)
+        if isinstance(value, self.PLAIN_TYPES) or isinstance(value, type(self)):
+            # Sub-clients already proxied the same way (eg.: with their own rate limit) are kept
+            return value
+        return self.wrap_sub_client(value, endpoint)
+
+
+    def __setattr__(self, name: str, value):
+        setattr(self._client, name, value)
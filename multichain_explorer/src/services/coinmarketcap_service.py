@@ -1,24 +1,38 @@
+from typing import List
+from multichain_explorer.src.cache.single_flight import SingleFlight
+from multichain_explorer.src.cache.ttl_cache import TTLCache
+from multichain_explorer.src.models.blockchains import Blockchains
 from multichain_explorer.src.services.fetch_service import FetchService
+from multichain_explorer.src.services.request_scheduler import ScheduledClient
 
 class CoinMarketCapService():
     """
-    This class is used to fetch data from the CoinMarketCap API 
+    This class is used to fetch data from the CoinMarketCap API
     """
 
     #To be loaded from config file
     COINMARKETCAP_API_URL: str = ""
     COINMARKETCAP_API_KEY: str = ""
 
+    #Seconds a quote is served from the cache
+    CACHE_TTL: float = 60
+
+    # Shared by every instance, so the quotes fetched for one provider serve the others
+    _quotesCache: TTLCache = TTLCache()
+    _singleFlight: SingleFlight = SingleFlight()
+
     def __init__(self):
         self.currency = "USD"
-        self.fetchService = FetchService()
+        self.fetchService = ScheduledClient(FetchService.get_shared(), "coinmarketcap")
+        # Symbols fetched along with any missing quote, one request serves every chain
+        self.prefetchSymbols = [blockchain.value for blockchain in Blockchains.get_available_blockchains()]
 
     def fetchData(self, symbol: str) -> dict:
         """
         Fetch data from the CoinMarketCap API
 
         Args:
-            symbol: the symbol of the cryptocurrency
+            symbol: the symbol of the cryptocurrency, or a comma separated list of symbols
 
         Returns:
             The data as a dict
@@ -27,8 +41,7 @@ class CoinMarketCapService():
             params = self.get_params(symbol)
             headers = self.get_headers()
 
-            #TODO - Use class member service
-            data = FetchService().fetch_json(
+            data = self.fetchService.fetch_json(
                                         self.COINMARKETCAP_API_URL,
                                         params,
                                         headers
@@ -39,19 +52,82 @@ class CoinMarketCapService():
             raise
 
 
+    def fetch_many(self, symbols: List[str]) -> dict:
+        """
+        Fetch the quotes of several cryptocurrencies with a single API call
+
+        Quotes are cached for CACHE_TTL seconds by (symbol, currency) and concurrent
+        callers missing the same quotes share a single request
+
+        Args:
+            symbols: the symbols of the cryptocurrencies
+
+        Returns:
+            A dict with the data of each symbol, keyed by symbol
+        """
+        quotes = self.get_cached_quotes(symbols)
+        missing = [symbol for symbol in symbols if symbol not in quotes]
+
+        if missing:
+            to_fetch = sorted(set(missing) | set(self.prefetchSymbols))
+            self._singleFlight.do((tuple(to_fetch), self.currency),
+                                  lambda: self._fetch_quotes(to_fetch))
+            quotes.update(self.get_cached_quotes(missing))
+
+        # Raises KeyError for the symbols CoinMarketCap did not return
+        return { symbol : quotes[symbol] for symbol in symbols }
+
+
+    def fetch_quote(self, symbol: str) -> dict:
+        """
+        Fetch the quote of a cryptocurrency, served from the batched quotes cache
+
+        Args:
+            symbol: the symbol of the cryptocurrency
+
+        Returns:
+            The data of the cryptocurrency as a dict
+        """
+        return self.fetch_many([symbol])[symbol]
+
+
+    def get_cached_quotes(self, symbols: List[str]) -> dict:
+        """Get the cached quotes of the symbols, missing or expired quotes are left out"""
+        quotes = {}
+        for symbol in symbols:
+            quote = self._quotesCache.get((symbol, self.currency))
+            if quote is not None:
+                quotes[symbol] = quote
+        return quotes
+
+
+    def store_quotes(self, data: dict):
+        """Cache the quotes of a CoinMarketCap quotes response"""
+        for symbol, quote in data.get('data', {}).items():
+            self._quotesCache.set((symbol, self.currency), quote, self.CACHE_TTL)
+
+
+    def _fetch_quotes(self, symbols: List[str]):
+        """Fetch the quotes of the symbols in one call and cache them"""
+        data = self.fetchData(",".join(symbols))
+        self.store_quotes(data)
+
+
     def get_params(self, symbol: str) -> dict:
         """
         Get the parameters for the API call
 
         Args:
-            symbol: the symbol of the cryptocurrency
+            symbol: the symbol of the cryptocurrency, or a comma separated list of symbols
 
         Returns:
             The parameters as a dict
         """
         parameters = {
             'symbol': symbol,
-            'convert': self.currency
+            'convert': self.currency,
+            # Don't fail the whole batch because of a single unknown symbol
+            'skip_invalid': 'true'
         }
         return parameters
 
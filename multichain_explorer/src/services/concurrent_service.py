@@ -0,0 +1,144 @@
+import asyncio
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Awaitable, Callable, Iterable, Iterator, List
+
+
+class ConcurrentService():
+    """
+    This class is used to run provider calls concurrently, blocking calls on threads
+    or coroutines on the running event loop, with a bounded number of calls in flight
+    """
+
+    #Can be overridden by the caller
+    MAX_CONCURRENCY: int = 10
+
+    def __init__(self, max_concurrency: int = None):
+        self.max_concurrency = max_concurrency or self.MAX_CONCURRENCY
+
+
+    def map_ordered(self,
+                    func: Callable[[Any], Any],
+                    items: Iterable,
+                    on_error: Callable[[Any, Exception], Any] = None,
+                    max_concurrency: int = None) -> List:
+        """
+        Call func for every item concurrently and return the results in the order of the items
+
+        Args:
+            func: the function to call for each item
+            items: the items to call the function with
+            on_error: called with (item, exception) when a call fails, its return value
+                      is placed in the results instead. If not set the exception is raised
+            max_concurrency: maximum number of calls in flight, defaults to the service setting
+
+        Returns:
+            The list of results, ordered as the items
+        """
+        items = list(items)
+        if len(items) == 0:
+            return []
+
+        max_concurrency = max_concurrency or self.max_concurrency
+        max_workers = max(1, min(max_concurrency, len(items)))
+
+        # The calls run with the context of the caller (eg.: the priority of its requests)
+        context = contextvars.copy_context()
+
+        def call(item):
+            try:
+                return context.copy().run(func, item)
+            except Exception as err:
+                if on_error is None:
+                    raise
+                return on_error(item, err)
+
+        # A single worker does not need a thread pool
+        if max_workers == 1:
+            return [call(item) for item in items]
+
+        with ThreadPoolExecutor(max_workers = max_workers) as executor:
+            return list(executor.map(call, items))
+
+
+    def iter_ordered(self,
+                     func: Callable[[Any], Any],
+                     items: Iterable,
+                     on_error: Callable[[Any, Exception], Any] = None,
+                     window: int = None) -> Iterator:
+        """
+        Call func for every item concurrently and yield the results in the order of the items
+
+        At most window calls are prefetched ahead of the consumer, so memory stays bounded
+        whatever the number of items. Items are read lazily, eg.: from a large range
+
+        Args:
+            func: the function to call for each item
+            items: the items to call the function with
+            on_error: called with (item, exception) when a call fails, its return value
+                      is yielded instead. If not set the exception is raised
+            window: maximum number of calls in flight or waiting to be consumed,
+                    defaults to the service max concurrency
+
+        Yields:
+            The results, ordered as the items
+        """
+        items = iter(items)
+        window = window or self.max_concurrency
+
+        # The calls run with the context of the caller (eg.: the priority of its requests)
+        context = contextvars.copy_context()
+
+        def call(item):
+            try:
+                return context.copy().run(func, item)
+            except Exception as err:
+                if on_error is None:
+                    raise
+                return on_error(item, err)
+
+        executor = ThreadPoolExecutor(max_workers = window)
+        pending = deque(executor.submit(call, item) for item in islice(items, window))
+        try:
+            while pending:
+                result = pending.popleft().result()
+                # Refill the window before handing the result to the consumer
+                pending.extend(executor.submit(call, item) for item in islice(items, 1))
+                yield result
+        finally:
+            # The consumer may stop early, calls not started yet are dropped
+            executor.shutdown(wait = False, cancel_futures = True)
+
+
+    async def gather_ordered(self,
+                             func: Callable[[Any], Awaitable],
+                             items: Iterable,
+                             on_error: Callable[[Any, Exception], Any] = None,
+                             max_concurrency: int = None) -> List:
+        """
+        Await func for every item concurrently and return the results in the order of the items
+
+        Args:
+            func: the coroutine function to call for each item
+            items: the items to call the function with
+            on_error: called with (item, exception) when a call fails, its return value
+                      is placed in the results instead. If not set the exception is raised
+            max_concurrency: maximum number of calls in flight, defaults to the service setting
+
+        Returns:
+            The list of results, ordered as the items
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+
+        async def call(item):
+            async with semaphore:
+                try:
+                    return await func(item)
+                except Exception as err:
+                    if on_error is None:
+                        raise
+                    return on_error(item, err)
+
+        return await asyncio.gather(*[call(item) for item in items])
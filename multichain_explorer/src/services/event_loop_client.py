@@ -0,0 +1,82 @@
+import asyncio
+import threading
+from typing import Callable
+from multichain_explorer.src.services.client_proxy import ClientProxy
+
+
+class EventLoopClient(ClientProxy):
+    """
+    Proxy of an async upstream client whose calls run on an event loop of its own, in a
+    background thread, while the calling thread waits for their results. The threads of
+    a sync provider share a single client and loop this way, see ClientProxy
+    """
+
+    def __init__(self, client, loop: asyncio.AbstractEventLoop, thread: threading.Thread = None, prefix: str = ""):
+        """
+        Args:
+            client: the async upstream client, bound to the loop
+            loop: the event loop running the calls
+            thread: the thread running the loop, stopped along with the client
+            prefix: path of the client from the provider
+        """
+        super().__init__(client, prefix)
+        object.__setattr__(self, "_loop", loop)
+        object.__setattr__(self, "_thread", thread)
+
+
+    @classmethod
+    def start(cls, create_client: Callable, name: str) -> "EventLoopClient":
+        """
+        Start an event loop in a background thread and create the client on it
+
+        Args:
+            create_client: creates the async client, called on the loop as the client binds to it
+            name: name of the loop thread
+
+        Returns:
+            The proxy of the client
+        """
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target = loop.run_forever, name = name, daemon = True)
+        thread.start()
+
+        async def create():
+            return create_client()
+        try:
+            client = asyncio.run_coroutine_threadsafe(create(), loop).result()
+        except Exception:
+            cls._stop_loop(loop, thread)
+            raise
+        return cls(client, loop, thread)
+
+
+    def stop(self):
+        """Close the HTTP session of the client, then stop its event loop and close it"""
+        async def close():
+            session = getattr(self._client, "session", None)
+            if session is not None:
+                await session.close()
+        try:
+            asyncio.run_coroutine_threadsafe(close(), self._loop).result()
+        finally:
+            self._stop_loop(self._loop, self._thread)
+
+
+    @staticmethod
+    def _stop_loop(loop: asyncio.AbstractEventLoop, thread: threading.Thread):
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+    def wrap_call(self, call: Callable, endpoint: str) -> Callable:
+        def run(*args, **kwargs):
+            result = call(*args, **kwargs)
+            if not asyncio.iscoroutine(result):
+                return result
+            return asyncio.run_coroutine_threadsafe(result, self._loop).result()
+        return run
+
+
+    def wrap_sub_client(self, client, prefix: str) -> "EventLoopClient":
+        return EventLoopClient(client, self._loop, self._thread, prefix)
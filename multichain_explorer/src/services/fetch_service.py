@@ -1,14 +1,104 @@
-from requests import Request, Session
-from requests.exceptions import ConnectionError, Timeout, TooManyRedirects
+from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from multichain_explorer.src.metrics.instrumentation import Instrumentation
 import json
+import threading
 
 
 class FetchService():
+    """
+    This class is used to fetch data over HTTP through a long lived session,
+    so connections are pooled and kept alive between calls
+    """
+
+    # Can be overridden by the caller before the session is created
+    POOL_CONNECTIONS : int  = 10        # number of hosts with a connection pool
+    POOL_MAXSIZE : int      = 20        # connections kept alive per host
+    CONNECT_TIMEOUT : float = 5         # seconds
+    READ_TIMEOUT : float    = 30        # seconds
+    MAX_RETRIES : int       = 3
+    BACKOFF_FACTOR : float  = 0.5       # waits 0.5s, 1s, 2s... between retries
+    RETRY_STATUSES : tuple  = (500, 502, 503, 504)    # 429 is handled by the RequestScheduler
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
 
     def __init__(self):
-        pass
+        self._session = None
+        self._session_lock = threading.Lock()
+
+
+    @property
+    def session(self) -> Session:
+        """The pooled session, created on first use so the settings can be changed after import"""
+        with self._session_lock:
+            if self._session is None:
+                self._session = self.create_session()
+            return self._session
+
+
+    @classmethod
+    def get_shared(cls) -> "FetchService":
+        """
+        Get the fetch service shared by every service and provider
+
+        Returns:
+            The shared FetchService instance
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+
+    def create_session(self) -> Session:
+        """
+        Create a session with a pooled adapter that retries with exponential
+        backoff on 5xx responses (honouring the Retry-After header)
+
+        Returns:
+            The configured session
+        """
+        retry = Retry(
+            total = self.MAX_RETRIES,
+            backoff_factor = self.BACKOFF_FACTOR,
+            status_forcelist = self.RETRY_STATUSES,
+            allowed_methods = None,     # JSON-RPC reads are sent as POST requests
+            respect_retry_after_header = True,
+            raise_on_status = False
+        )
+        adapter = HTTPAdapter(
+            pool_connections = self.POOL_CONNECTIONS,
+            pool_maxsize = self.POOL_MAXSIZE,
+            max_retries = retry
+        )
+
+        session = Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.hooks["response"].append(self._count_traffic)
+        return session
+
+
+    def _count_traffic(self, response, *args, **kwargs):
+        """Count the bytes of every response in the running upstream call, see Instrumentation"""
+        body = response.request.body
+        Instrumentation.count_traffic(len(body) if body else 0, len(response.content))
+
+
+    def get_timeout(self) -> tuple:
+        """
+        Get the (connect, read) timeout used for every request
+
+        Returns:
+            The timeout as a tuple
+        """
+        return (self.CONNECT_TIMEOUT, self.READ_TIMEOUT)
+
 
-    def fetch_json(self, endpoint: str, parameters, headers) -> dict: 
+    def fetch_json(self, endpoint: str, parameters, headers) -> dict:
         """
         Fetch JSON data from an endpoint
 
@@ -16,21 +106,72 @@ class FetchService():
             endpoint: the endpoint to fetch from
             parameters: the parameters to pass to the endpoint
             headers: the headers to pass to the endpoint
-        
+
         Returns:
             The JSON data as a dict
 
         Raises:
-            HTTPException: if the connection fails
+            RequestException: if the connection fails
+            HTTPError: if the endpoint answers with an error status, once the retries are exhausted
         """
-        session = Session()
-        session.headers.update(headers)
-
-        try:
-            response = session.get(endpoint, params=parameters)
-            data = json.loads(response.text)
-            return data
-        except (ConnectionError, Timeout, TooManyRedirects) as e:
-            print(e)
-            raise
-  
\ No newline at end of file
+        response = self.session.get(endpoint,
+                                    params = parameters,
+                                    headers = headers,
+                                    timeout = self.get_timeout())
+        response.raise_for_status()
+        data = json.loads(response.text)
+        return data
+
+
+    def fetch_raw(self, endpoint: str, parameters, headers) -> bytes:
+        """
+        Fetch the body of an endpoint as it is sent, without decoding it
+
+        Args:
+            endpoint: the endpoint to fetch from
+            parameters: the parameters to pass to the endpoint
+            headers: the headers to pass to the endpoint
+
+        Returns:
+            The bytes of the response body
+
+        Raises:
+            HTTPError: if the endpoint answers with an error status
+        """
+        response = self.session.get(endpoint,
+                                    params = parameters,
+                                    headers = headers,
+                                    timeout = self.get_timeout())
+        response.raise_for_status()
+        return response.content
+
+
+    def post_json(self, endpoint: str, payload, headers = None):
+        """
+        Post JSON data to an endpoint and return the JSON response
+
+        Args:
+            endpoint: the endpoint to post to
+            payload: the data to send as JSON
+            headers: the headers to pass to the endpoint
+
+        Returns:
+            The JSON data of the response
+
+        Raises:
+            HTTPError: if the endpoint answers with an error status
+        """
+        response = self.session.post(endpoint,
+                                     json = payload,
+                                     headers = headers,
+                                     timeout = self.get_timeout())
+        response.raise_for_status()
+        return response.json()
+
+
+    def close(self):
+        """Close the pooled connections, a new session is created on the next request"""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
@@ -0,0 +1,152 @@
+import logging
+import threading
+import time
+from typing import Callable, List
+from multichain_explorer.src.models.blockchains import Blockchains
+from multichain_explorer.src.models.provider_options import ProviderOptions
+from multichain_explorer.src.models.provider_models.block import Block
+from multichain_explorer.src.models.request_priority import RequestPriority
+from multichain_explorer.src.services.request_scheduler import RequestScheduler
+
+logger = logging.getLogger(__name__)
+
+
+class HeadTracker():
+    """
+    Polls the head of a blockchain on a background thread and keeps the latest block
+    number and the latest block in memory. While running, every "latest" lookup of
+    the provider is served by the tracker instead of querying the blockchain again
+    """
+
+    # Seconds between two head polls, close to the block time of every chain
+    POLL_INTERVALS : dict = {
+        Blockchains.ETH  : 4,
+        Blockchains.BTC  : 30,
+        Blockchains.ADA  : 10,
+        Blockchains.ALGO : 2,
+        Blockchains.LUNA : 3,
+    }
+
+    # Polls missed before the tracked head is considered stale and read directly
+    MAX_MISSED_POLLS : int = 3
+
+
+    def __init__(self, provider, blockchain_id: Blockchains, poll_interval: float = None):
+        """
+        Args:
+            provider: the provider to track the head of
+            blockchain_id: the blockchain of the provider
+            poll_interval: overrides the poll interval of the chain, in seconds
+        """
+        self.provider = provider
+        self.blockchain_id = blockchain_id
+        self.poll_interval = poll_interval or self.POLL_INTERVALS[blockchain_id]
+
+        self._block_number = None
+        self._block = None
+        self._updated_at = 0
+        self._lock = threading.Lock()
+        self._listeners : List[Callable[[int, Block], None]] = []
+        self._stopped = threading.Event()
+        self._thread = None
+
+
+    def start(self):
+        """Start polling the head and serve the "latest" lookups of the provider"""
+        if self._thread is not None:
+            return
+
+        self._stopped.clear()
+        self._thread = threading.Thread(target = self._run,
+                                        name = f"head-tracker-{self.blockchain_id.value}",
+                                        daemon = True)
+        self._thread.start()
+        self.provider.headTracker = self
+
+
+    def stop(self):
+        """Stop polling, the provider queries the blockchain again for the "latest" lookups"""
+        if self.provider.headTracker is self:
+            self.provider.headTracker = None
+
+        self._stopped.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+
+    def subscribe(self, listener: Callable[[int, Block], None]):
+        """
+        Call a listener on every new head
+
+        Args:
+            listener: called with the new block number and block, from the polling thread
+        """
+        self._listeners.append(listener)
+
+
+    def get_latest_block_number(self) -> int:
+        """
+        Get the latest block number, read from the blockchain when the tracked one is stale
+
+        Returns:
+            The latest block number as an int
+        """
+        if self._is_stale():
+            self.poll()
+        return self._block_number
+
+
+    def get_latest_block(self, options = ProviderOptions()) -> Block:
+        """
+        Get the latest block, read from the blockchain when the tracked one is stale
+
+        Args:
+            options: the provider options, raw blocks are not tracked and always fetched
+
+        Returns:
+            The latest block data, see ProviderInterface.get_block_by_id
+        """
+        if options.raw:
+            return self.provider.get_block_by_id(self.get_latest_block_number(), options)
+
+        if self._is_stale():
+            self.poll()
+        return self._block
+
+
+    def poll(self):
+        """Read the head from the blockchain, fetching the new block when it changed"""
+        block_number = self.provider.fetch_latest_block_number()
+        with self._lock:
+            changed = block_number != self._block_number
+            if not changed:
+                self._updated_at = time.monotonic()
+                return
+
+        block = self.provider.get_block_by_id(block_number)
+        with self._lock:
+            self._block_number = block_number
+            self._block = block
+            self._updated_at = time.monotonic()
+
+        for listener in self._listeners:
+            listener(block_number, block)
+
+
+    def _is_stale(self) -> bool:
+        with self._lock:
+            return (self._block_number is None or
+                    time.monotonic() - self._updated_at > self.poll_interval * self.MAX_MISSED_POLLS)
+
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                # Polls, and the listeners called on new heads, give way to the interactive lookups
+                with RequestScheduler.prioritize(RequestPriority.background):
+                    self.poll()
+            except Exception:
+                # The head is read directly once stale, polling goes on
+                logger.exception("Polling the %s head failed", self.blockchain_id.value)
+            self._stopped.wait(self.poll_interval)
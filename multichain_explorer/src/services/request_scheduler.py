@@ -0,0 +1,337 @@
+import asyncio
+import contextlib
+import heapq
+import itertools
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, Optional, Tuple
+from multichain_explorer.src.models.request_priority import RequestPriority
+from multichain_explorer.src.services.client_proxy import ClientProxy
+
+
+# Priority of the requests made by the current thread or task
+_priority : ContextVar = ContextVar("request_priority", default = RequestPriority.interactive)
+
+
+class RequestScheduler():
+    """
+    Token bucket rate limiter of an upstream API, shared by every provider calling it.
+
+    Requests waiting for a token are served by priority, so interactive lookups go before
+    the background ones (head tracking, rolling window prefetch). When the upstream answers
+    429 the requests are paused for its Retry-After, the rate is halved and then recovered
+    step by step on every successful request, and the throttled request is retried
+    """
+
+    # (requests per second, burst) of every upstream API, can be overridden by the caller.
+    # Upstreams missing or set to None are not rate limited
+    LIMITS : Dict[str, Tuple[float, int]] = {
+        "infura"          : (10, 20),
+        "blockchain.info" : (5, 10),
+        "blockfrost"      : (10, 500),
+        "algod"           : (10, 20),
+        "indexer"         : (10, 20),
+        "terra-lcd"       : (10, 20),
+        "coinmarketcap"   : (0.5, 5),
+    }
+
+    # Retries of a throttled request before its error is raised
+    MAX_RETRIES : int = 5
+
+    # Seconds paused on a 429 without Retry-After, doubled on every consecutive 429
+    BACKOFF : float = 1
+
+    # Lowest rate after consecutive 429, as a fraction of the configured rate
+    MIN_RATE_FACTOR : float = 0.1
+
+    # Fraction of the configured rate recovered on every successful request
+    RECOVERY_FACTOR : float = 0.05
+
+    # Shortest sleep of a coroutine waiting for a token, in seconds
+    MIN_ASYNC_WAIT : float = 0.005
+
+    _schedulers : Dict[str, "RequestScheduler"] = {}
+    _schedulers_lock = threading.Lock()
+
+
+    def __init__(self, upstream: str, rate: float = None, burst: int = None):
+        """
+        Args:
+            upstream: name of the upstream API
+            rate: requests per second, not rate limited if not set
+            burst: requests that can be sent at once after an idle period, defaults to the rate
+        """
+        self.upstream = upstream
+        self.limits = (rate, burst)
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst or (int(rate) if rate else 1))
+
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._throttles = 0
+        self._waiting = []
+        self._tickets = itertools.count()
+        self._condition = threading.Condition()
+
+
+    @classmethod
+    def get_scheduler(cls, upstream: str) -> "RequestScheduler":
+        """
+        Get the scheduler shared by every caller of an upstream API
+
+        The scheduler is created on first use, and again when the LIMITS of the upstream change
+
+        Args:
+            upstream: name of the upstream API, see LIMITS
+        """
+        limits = cls.LIMITS.get(upstream) or (None, None)
+        with cls._schedulers_lock:
+            scheduler = cls._schedulers.get(upstream)
+            if scheduler is None or scheduler.limits != tuple(limits):
+                scheduler = cls._schedulers[upstream] = cls(upstream, *limits)
+            return scheduler
+
+
+    @staticmethod
+    @contextlib.contextmanager
+    def prioritize(priority: RequestPriority):
+        """
+        Send the requests made inside the block, in the current thread or task, with a priority
+
+        Args:
+            priority: the priority of the requests
+        """
+        token = _priority.set(priority)
+        try:
+            yield
+        finally:
+            _priority.reset(token)
+
+
+    @staticmethod
+    def get_priority() -> RequestPriority:
+        """Priority of the requests made by the current thread or task"""
+        return _priority.get()
+
+
+    def acquire(self, priority: RequestPriority = None):
+        """
+        Wait for a token, the waiting requests are served by priority and then in arrival order
+
+        Args:
+            priority: the priority of the request, defaults to the one of the current thread or task
+        """
+        priority = priority if priority is not None else _priority.get()
+        with self._condition:
+            ticket = (priority, next(self._tickets))
+            heapq.heappush(self._waiting, ticket)
+            # A waiter with a higher priority becomes the next one served
+            self._condition.notify_all()
+            try:
+                while True:
+                    delay = self._get_delay() if self._waiting[0] == ticket else None
+                    if delay is not None and delay <= 0:
+                        self._tokens -= 1
+                        return
+                    self._condition.wait(delay)
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._condition.notify_all()
+
+
+    async def acquire_async(self, priority: RequestPriority = None):
+        """
+        Coroutine version of acquire, the coroutine sleeps on the event loop until its token is available
+
+        A cancelled coroutine leaves the queue without taking a token
+
+        Args:
+            priority: the priority of the request, defaults to the one of the current task
+        """
+        priority = priority if priority is not None else _priority.get()
+        with self._condition:
+            ticket = (priority, next(self._tickets))
+            heapq.heappush(self._waiting, ticket)
+            self._condition.notify_all()
+        try:
+            while True:
+                with self._condition:
+                    delay = self._get_delay()
+                    if self._waiting[0] == ticket and delay <= 0:
+                        self._tokens -= 1
+                        return
+                # Behind other requests the wait is computed again after the next token
+                await asyncio.sleep(max(delay, self.MIN_ASYNC_WAIT))
+        finally:
+            with self._condition:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._condition.notify_all()
+
+
+    def run(self, call: Callable, priority: RequestPriority = None):
+        """
+        Call the upstream once a token is available, retrying when it is throttled
+
+        Args:
+            call: the upstream call
+            priority: the priority of the request, defaults to the one of the current thread or task
+
+        Returns:
+            The result of the call
+        """
+        attempt = 0
+        while True:
+            self.acquire(priority)
+            try:
+                result = call()
+            except Exception as err:
+                throttled, retry_after = self.get_throttle(err)
+                if not throttled or attempt >= self.MAX_RETRIES:
+                    raise
+                self.throttled(retry_after)
+                attempt += 1
+                continue
+            self.succeeded()
+            return result
+
+
+    async def run_async(self, call: Callable, priority: RequestPriority = None):
+        """
+        Coroutine version of run, the call returns an awaitable
+
+        Args:
+            call: the upstream call, called again on every retry
+            priority: the priority of the request, defaults to the one of the current task
+
+        Returns:
+            The result of the awaited call
+        """
+        priority = priority if priority is not None else _priority.get()
+        attempt = 0
+        while True:
+            await self.acquire_async(priority)
+            try:
+                result = await call()
+            except Exception as err:
+                throttled, retry_after = self.get_throttle(err)
+                if not throttled or attempt >= self.MAX_RETRIES:
+                    raise
+                self.throttled(retry_after)
+                attempt += 1
+                continue
+            self.succeeded()
+            return result
+
+
+    def throttled(self, retry_after: float = None):
+        """
+        Pause the requests after a 429 and halve the rate
+
+        Args:
+            retry_after: seconds to wait given by the upstream, backs off exponentially if not set
+        """
+        with self._condition:
+            self._throttles += 1
+            delay = retry_after if retry_after is not None else self.BACKOFF * 2 ** (self._throttles - 1)
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            if self.rate is not None:
+                self._refill()
+                self.rate = max(self.rate / 2, self.max_rate * self.MIN_RATE_FACTOR)
+                self._tokens = min(self._tokens, 0)
+            self._condition.notify_all()
+
+
+    def succeeded(self):
+        """Recover the rate step by step after a successful request"""
+        if self._throttles == 0 and self.rate == self.max_rate:
+            return
+        with self._condition:
+            self._throttles = 0
+            if self.rate is not None:
+                self._refill()
+                self.rate = min(self.max_rate, self.rate + self.max_rate * self.RECOVERY_FACTOR)
+
+
+    @staticmethod
+    def get_status(err: Exception) -> Optional[int]:
+        """
+        HTTP status of the upstream answer that raised an error, None when the error has none
+
+        The clients raise different errors, the status is read from the error attributes
+        (eg.: requests HTTPError, Blockfrost ApiError, algosdk AlgodHTTPError, terra LCDResponseError)
+        """
+        response = getattr(err, "response", None)
+        for source, attribute in ((err, "status_code"), (err, "code"), (err, "status"),
+                                  (response, "status_code"), (response, "status")):
+            value = getattr(source, attribute, None)
+            if isinstance(value, int):
+                return value
+        return None
+
+
+    def get_throttle(self, err: Exception) -> Tuple[bool, float]:
+        """
+        Whether an error is a 429 answer of the upstream, and its Retry-After
+
+        Returns:
+            A tuple (throttled, retry after in seconds or None)
+        """
+        if self.get_status(err) != 429:
+            return False, None
+
+        response = getattr(err, "response", None)
+        headers = getattr(response, "headers", None) or getattr(err, "headers", None) or {}
+        retry_after = headers.get("Retry-After")
+        try:
+            return True, float(retry_after) if retry_after is not None else None
+        except ValueError:
+            # An HTTP date, the default backoff is used instead
+            return True, None
+
+
+    def _refill(self):
+        now = time.monotonic()
+        if self.rate is not None:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+
+    def _get_delay(self) -> float:
+        """Seconds until a token is available"""
+        self._refill()
+        delay = self._paused_until - time.monotonic()
+        if self.rate is not None and self._tokens < 1:
+            delay = max(delay, (1 - self._tokens) / self.rate)
+        return delay
+
+
+class ScheduledClient(ClientProxy):
+    """Proxy of an upstream client sending every call through the scheduler of its upstream, see ClientProxy"""
+
+    def __init__(self, client, upstream: str, asynchronous: bool = False, prefix: str = ""):
+        """
+        Args:
+            client: the upstream client
+            upstream: name of the upstream API, see RequestScheduler.LIMITS
+            asynchronous: whether the client calls return awaitables
+            prefix: path of the client from the provider
+        """
+        super().__init__(client, prefix)
+        object.__setattr__(self, "_upstream", upstream)
+        object.__setattr__(self, "_asynchronous", asynchronous)
+
+
+    def wrap_call(self, call: Callable, endpoint: str) -> Callable:
+        # The scheduler is looked up on every call, so LIMITS can be changed at any time
+        if self._asynchronous:
+            return lambda *args, **kwargs: RequestScheduler.get_scheduler(self._upstream).run_async(lambda: call(*args, **kwargs))
+        return lambda *args, **kwargs: RequestScheduler.get_scheduler(self._upstream).run(lambda: call(*args, **kwargs))
+
+
+    def wrap_sub_client(self, client, prefix: str) -> "ScheduledClient":
+        return ScheduledClient(client, self._upstream, self._asynchronous, prefix)
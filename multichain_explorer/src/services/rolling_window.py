@@ -0,0 +1,199 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import List
+from multichain_explorer.src.models.provider_options import ProviderOptions
+from multichain_explorer.src.models.provider_models.block import Block
+from multichain_explorer.src.models.provider_models.transaction import Transaction
+
+logger = logging.getLogger(__name__)
+
+
+class RollingWindow():
+    """
+    Keeps the latest blocks of a blockchain, and their transactions, in memory.
+
+    The window is updated incrementally: on every new head only the missing heights are
+    fetched. Blocks are chained by their parent hash, so a reorg is detected when a new
+    block does not link to the window, and the replaced blocks are evicted and fetched again
+    """
+
+    #Can be overridden by the caller
+    SIZE : int = 20
+    MAX_TRANSACTIONS : int = 100
+
+
+    def __init__(self, provider, size: int = None, max_transactions: int = None):
+        """
+        Args:
+            provider: the provider to keep the latest blocks of
+            size: number of latest blocks kept
+            max_transactions: number of latest transactions kept
+        """
+        self.provider = provider
+        self.size = size or self.SIZE
+        self.max_transactions = max_transactions or self.MAX_TRANSACTIONS
+
+        # Blocks and transactions by height, oldest first
+        self._blocks = OrderedDict()
+        self._transactions = OrderedDict()
+        self._fetched = {}
+        # The readers only wait for the updated window to be swapped in, the updates run one at a time
+        self._lock = threading.Lock()
+        self._update_lock = threading.Lock()
+
+
+    def start(self):
+        """Serve the get_blocks and get_transactions calls of the provider that fit in the window"""
+        self.provider.rollingWindow = self
+        if self.provider.headTracker is not None:
+            self.provider.headTracker.subscribe(lambda block_number, block: self.update(block_number, block))
+
+
+    def stop(self):
+        """Stop serving the calls of the provider"""
+        if self.provider.rollingWindow is self:
+            self.provider.rollingWindow = None
+
+
+    def get_blocks(self, num_blocks: int, options = ProviderOptions()) -> List[Block]:
+        """
+        Get the latest blocks, newest first, as ProviderInterface.get_blocks
+
+        Returns:
+            The blocks, None when they do not fit in the window
+        """
+        if options.raw or num_blocks > self.size:
+            return None
+
+        if not self._refresh():
+            return None
+        with self._lock:
+            blocks = list(reversed(self._blocks.values()))
+        return blocks[:num_blocks] if len(blocks) >= num_blocks else None
+
+
+    def get_transactions(self, num_tx: int, options = ProviderOptions()) -> List[Transaction]:
+        """
+        Get the latest transactions, in chain order
+
+        Returns:
+            The transactions, None when they do not fit in the window
+        """
+        if options.raw or num_tx > self.max_transactions:
+            return None
+
+        if not self._refresh():
+            return None
+        with self._lock:
+            transactions = [transaction for block_transactions in self._transactions.values()
+                                        for transaction in block_transactions]
+        return transactions[-num_tx:] if len(transactions) >= num_tx else None
+
+
+    def update(self, head: int, head_block: Block = None):
+        """
+        Bring the window up to a new head, fetching only the missing heights
+
+        Args:
+            head: the latest block number
+            head_block: the latest block, when already known (eg.: from the head tracker)
+
+        Raises:
+            ValueError: if a block can not be fetched or the chain keeps changing while
+                        updating, the window keeps its previous blocks
+        """
+        with self._update_lock:
+            # The upstream calls are made on a copy of the window, then swapped in
+            self._fetched = { head : head_block } if head_block is not None else {}
+            try:
+                blocks = self._update_blocks(OrderedDict(self._blocks), head)
+                transactions = self._update_transactions(blocks, self._transactions)
+            finally:
+                self._fetched = {}
+
+            with self._lock:
+                self._blocks = blocks
+                self._transactions = transactions
+
+
+    def _update_blocks(self, window: OrderedDict, head: int) -> OrderedDict:
+        """Get the blocks of the window at a new head, oldest first"""
+        lowest = max(head - self.size + 1, 0)
+        top = next(reversed(window), lowest - 1)
+        if top == head and (head not in self._fetched or self._fetched[head].hash == window[head].hash):
+            return window
+
+        # The missing heights are fetched concurrently
+        missing = range(max(top + 1, lowest), head + 1)
+        for height, block in zip(missing, self.provider.concurrentService.map_ordered(self.provider.get_block_by_id, missing, on_error = lambda height, err: None)):
+            self._fetched.setdefault(height, block)
+
+        # Walk down from the head until the new blocks link to the window, evicting the blocks replaced by a reorg
+        blocks = { head : self._get_block(head) }
+        for height in range(head - 1, lowest - 1, -1):
+            child = blocks[height + 1]
+            kept = window.get(height)
+            if kept is not None and self._is_parent(kept, child):
+                break
+
+            block = self._get_block(height)
+            if not self._is_parent(block, child):
+                # Fetched before the child was replaced, fetch it again
+                self._fetched.pop(height)
+                block = self._get_block(height)
+                if not self._is_parent(block, child):
+                    raise ValueError(f"The chain changed while updating height {height}")
+            blocks[height] = block
+
+        # The blocks replaced by a reorg, and the ones out of the window, are evicted
+        for height in [height for height in window if height > head or height in blocks or height < lowest]:
+            window.pop(height)
+        window.update(blocks)
+        return OrderedDict(sorted(window.items()))
+
+
+    def _is_parent(self, block: Block, child: Block) -> bool:
+        """Whether the child links to the block, chains without block hashes are always linked"""
+        return block.hash is None or child.parent_hash == block.hash
+
+
+    def _refresh(self) -> bool:
+        """Update the window to the latest head, when no head tracker keeps it up to date"""
+        try:
+            if self.provider.headTracker is None:
+                self.update(self.provider.fetch_latest_block_number())
+            return True
+        except Exception:
+            # The calls are left to the provider
+            logger.exception("Updating the rolling window failed")
+            return False
+
+
+    def _get_block(self, height: int) -> Block:
+        """Block at a height, fetched once per update"""
+        block = self._fetched.get(height)
+        # Blocks that could not be fetched are returned as an error dict
+        if not isinstance(block, Block):
+            block = self.provider.get_block_by_id(height)
+            if not isinstance(block, Block):
+                raise ValueError(f"Block {height} could not be fetched")
+            self._fetched[height] = block
+        return block
+
+
+    def _update_transactions(self, blocks: OrderedDict, kept: OrderedDict) -> OrderedDict:
+        """Get the transactions of the newest blocks, fetching only the new ones, until max_transactions are kept"""
+        transactions = OrderedDict()
+        count = 0
+        for height, block in reversed(blocks.items()):
+            if count >= self.max_transactions:
+                break
+            # The transactions kept of a block replaced by a reorg are fetched again
+            block_transactions = kept.get(height) if self._blocks.get(height) is block else None
+            if block_transactions is None:
+                block_transactions = self.provider.get_block_transactions(height)
+            transactions[height] = block_transactions
+            count += len(block_transactions)
+
+        return OrderedDict(reversed(transactions.items()))
@@ -3,19 +3,25 @@ import re
 
 class AlgoValidator(ValidatorInterface):
 
-    blockRegex = r"^$"
-    addressRegex = r"^$"
-    transactionRegex = r"^$"
+    # Compiled once, the patterns are also used by the SearchClassifier
+    blockRegex = re.compile(r"^[0-9]{1,10}$")
+    addressRegex = re.compile(r"^[A-Z2-7]{58}$")
+    transactionRegex = re.compile(r"^[A-Z2-7]{52}$")
+
+    # Length range and prefixes of the texts matched by the patterns, see ValidatorInterface
+    blockLength = (1, 10)
+    addressLength = (58, 58)
+    transactionLength = (52, 52)
 
 
     def is_block(self, text: str) -> bool:
         """Checks whether the text matches an ALGO block number signature"""
-        return bool( re.match(self.blockRegex, text) )
+        return bool( self.blockRegex.match(text) )
 
     def is_address(self, text: str) -> bool:
         """Checks whether the text matches an ALGO address signature"""
-        return bool( re.match(self.addressRegex, text) )
+        return bool( self.addressRegex.match(text) )
 
     def is_transaction(self, text: str) -> bool:
         """Checks whether the text matches an ALGO block transaction signature"""        
-        return bool( re.match(self.transactionRegex, text) )
+        return bool( self.transactionRegex.match(text) )
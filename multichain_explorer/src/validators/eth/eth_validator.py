@@ -3,19 +3,27 @@ import re
 
 class EthValidator(ValidatorInterface):
 
-    blockRegex = r"^[0-9]{1,20}$"
-    addressRegex = r"^0x[a-fA-F0-9]{40}$"
-    transactionRegex = r"^0x[a-f0-9]{64}$"
+    # Compiled once, the patterns are also used by the SearchClassifier
+    blockRegex = re.compile(r"^[0-9]{1,20}$")
+    addressRegex = re.compile(r"^0x[a-fA-F0-9]{40}$")
+    transactionRegex = re.compile(r"^0x[a-f0-9]{64}$")
+
+    # Length range and prefixes of the texts matched by the patterns, see ValidatorInterface
+    blockLength = (1, 20)
+    addressLength = (42, 42)
+    addressPrefixes = ("0x",)
+    transactionLength = (66, 66)
+    transactionPrefixes = ("0x",)
 
 
     def is_block(self, text: str) -> bool:
         """Checks whether the text matches an ETH block number signature"""
-        return bool( re.match(self.blockRegex, text) )
+        return bool( self.blockRegex.match(text) )
 
     def is_address(self, text: str) -> bool:
         """Checks whether the text matches an ETH address signature"""
-        return bool( re.match(self.addressRegex, text) )
+        return bool( self.addressRegex.match(text) )
 
     def is_transaction(self, text: str) -> bool:
         """Checks whether the text matches an ETH block transaction signature"""        
-        return bool( re.match(self.transactionRegex, text) )
+        return bool( self.transactionRegex.match(text) )
@@ -3,19 +3,26 @@ import re
 
 class LunaValidator(ValidatorInterface):
 
-    blockRegex = r"^$"
-    addressRegex = r"^$"
-    transactionRegex = r"^$"
+    # Compiled once, the patterns are also used by the SearchClassifier
+    blockRegex = re.compile(r"^[0-9]{1,10}$")
+    addressRegex = re.compile(r"^terra1([ac-hj-np-z02-9]{38}|[ac-hj-np-z02-9]{58})$")
+    transactionRegex = re.compile(r"^[a-fA-F0-9]{64}$")
+
+    # Length range and prefixes of the texts matched by the patterns, see ValidatorInterface
+    blockLength = (1, 10)
+    addressLength = (44, 64)
+    addressPrefixes = ("terra1",)
+    transactionLength = (64, 64)
 
 
     def is_block(self, text: str) -> bool:
         """Checks whether the text matches an LUNA block number signature"""
-        return bool( re.match(self.blockRegex, text) )
+        return bool( self.blockRegex.match(text) )
 
     def is_address(self, text: str) -> bool:
         """Checks whether the text matches an LUNA address signature"""
-        return bool( re.match(self.addressRegex, text) )
+        return bool( self.addressRegex.match(text) )
 
     def is_transaction(self, text: str) -> bool:
         """Checks whether the text matches an LUNA block transaction signature"""        
-        return bool( re.match(self.transactionRegex, text) )
+        return bool( self.transactionRegex.match(text) )
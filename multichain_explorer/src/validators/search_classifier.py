@@ -0,0 +1,77 @@
+from typing import Dict, List, Tuple
+from multichain_explorer.src.models.blockchains import Blockchains
+from multichain_explorer.src.models.resource_types import Resource
+from multichain_explorer.src.validators.ada.ada_validator import AdaValidator
+from multichain_explorer.src.validators.algo.algo_validator import AlgoValidator
+from multichain_explorer.src.validators.btc.btc_validator import BtcValidator
+from multichain_explorer.src.validators.eth.eth_validator import EthValidator
+from multichain_explorer.src.validators.luna.luna_validator import LunaValidator
+from multichain_explorer.src.validators.validator import ValidatorInterface
+
+
+class SearchClassifier():
+    """
+    Classifies a search text as the blocks, addresses or transactions of every chain it
+    could be, in one pass over the compiled validator patterns of all the chains.
+
+    The length range and the literal prefixes of every pattern are given by the validators,
+    see ValidatorInterface, so most patterns are discarded without running the regex
+    """
+
+    VALIDATORS : Dict[Blockchains, ValidatorInterface] = {
+        Blockchains.ETH : EthValidator(),
+        Blockchains.BTC : BtcValidator(),
+        Blockchains.ADA : AdaValidator(),
+        Blockchains.ALGO : AlgoValidator(),
+        Blockchains.LUNA : LunaValidator()
+    }
+
+
+    def __init__(self, validators: Dict[Blockchains, ValidatorInterface] = None):
+        """
+        Args:
+            validators: the validator of every chain to classify for, defaults to all the chains
+        """
+        validators = validators or self.VALIDATORS
+
+        # Rules as (blockchain, resource, pattern, min length, max length, literal prefixes), in the validators order
+        self._rules = []
+        for blockchain, validator in validators.items():
+            self._rules.extend([
+                (blockchain, Resource.block, validator.blockRegex, *validator.blockLength, validator.blockPrefixes),
+                (blockchain, Resource.address, validator.addressRegex, *validator.addressLength, validator.addressPrefixes),
+                (blockchain, Resource.transaction, validator.transactionRegex, *validator.transactionLength,
+                 validator.transactionPrefixes)
+            ])
+        self._number_rules = [rule for rule in self._rules if rule[1] == Resource.block]
+
+        self.max_length = max(rule[4] for rule in self._rules)
+        # Short digit only texts can only be block numbers
+        self.max_number_length = min(rule[3] for rule in self._rules if rule[1] != Resource.block) - 1
+
+
+    def classify(self, text: str) -> List[Tuple[Blockchains, Resource]]:
+        """
+        Get every (blockchain, resource) the text could be
+
+        Args:
+            text: the search text
+
+        Returns:
+            The list of (blockchain, resource) candidates, in the order of the validators
+            and, for a validator, of the block, address and transaction signatures.
+            An empty list when the text matches no signature
+        """
+        text = text.strip()
+        length = len(text)
+        if length == 0 or length > self.max_length:
+            return []
+
+        if text.isdigit() and length <= self.max_number_length:
+            rules = self._number_rules
+        else:
+            rules = self._rules
+        return [(blockchain, resource)
+                for blockchain, resource, pattern, min_length, max_length, prefixes in rules
+                if min_length <= length <= max_length and text.startswith(prefixes) and pattern.match(text)]
+
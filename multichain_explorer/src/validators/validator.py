@@ -1,6 +1,18 @@
 import abc
+import math
+from typing import Tuple
 
 class ValidatorInterface(metaclass=abc.ABCMeta):
+
+    # Length range (min, max) and literal prefixes of the texts matched by every signature,
+    # the SearchClassifier discards the texts out of them without running the checks
+    blockLength : Tuple[int, float] = (0, math.inf)
+    blockPrefixes : Tuple[str, ...] = ("",)
+    addressLength : Tuple[int, float] = (0, math.inf)
+    addressPrefixes : Tuple[str, ...] = ("",)
+    transactionLength : Tuple[int, float] = (0, math.inf)
+    transactionPrefixes : Tuple[str, ...] = ("",)
+
     @classmethod
     def __subclasshook__(cls, subclass):
         return (hasattr(subclass, 'is_block') and 
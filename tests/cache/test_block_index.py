@@ -0,0 +1,23 @@
+import time
+
+from multichain_explorer.src.cache.block_index import BlockIndex
+
+
+def test_lookup_by_either_key():
+    """Test whether an indexed block is found by height and by hash"""
+    index = BlockIndex()
+    index.add(10, "hash-10")
+
+    assert index.get_hash(10) == "hash-10"
+    assert index.get_height("hash-10") == 10
+    assert index.get_hash(11) is None
+
+
+def test_height_expires_with_ttl():
+    """Test whether a height indexed near the tip stops resolving after its ttl, while its hash is kept"""
+    index = BlockIndex()
+    index.add(10, "hash-10", ttl = 0.05)
+    time.sleep(0.06)
+
+    assert index.get_hash(10) is None
+    assert index.get_height("hash-10") == 10
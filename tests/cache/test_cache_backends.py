@@ -0,0 +1,64 @@
+import pickle
+
+import pytest
+from multichain_explorer.src.cache.cache_backend import CacheBackendInterface
+from multichain_explorer.src.cache.memory_cache_backend import MemoryCacheBackend
+from multichain_explorer.src.cache.sqlite_cache_backend import SqliteCacheBackend
+
+
+ENTRY_SIZE = len(pickle.dumps({ "id" : 0 }, pickle.HIGHEST_PROTOCOL))
+
+
+@pytest.fixture(params = ["memory", "sqlite"])
+def backend(request, tmp_path) -> CacheBackendInterface:
+    """Setup a cache backend with room for three block entries"""
+    if request.param == "memory":
+        yield MemoryCacheBackend(max_bytes = 3 * ENTRY_SIZE)
+    else:
+        backend = SqliteCacheBackend(str(tmp_path / "cache.db"), max_bytes = 3 * ENTRY_SIZE)
+        yield backend
+        backend.close()
+
+
+def test_get_returns_stored_value(backend: CacheBackendInterface):
+    """Test whether a stored value is returned"""
+    backend.set(("ETH", "block", "1", False), { "id" : 1 })
+    assert backend.get(("ETH", "block", "1", False)) == { "id" : 1 }
+    assert backend.get(("ETH", "block", "1", True)) is None
+
+
+def test_least_recently_used_evicted(backend: CacheBackendInterface):
+    """Test whether the least recently used entry is evicted when the budget is exceeded"""
+    for block_id in range(3):
+        backend.set(block_id, { "id" : block_id })
+
+    backend.get(0)
+    backend.set(3, { "id" : 3 })
+
+    assert backend.get(1) is None
+    assert [backend.get(block_id) for block_id in (0, 2, 3)] == [{ "id" : 0 }, { "id" : 2 }, { "id" : 3 }]
+
+
+def test_delete_and_clear(backend: CacheBackendInterface):
+    """Test whether entries can be removed"""
+    backend.set(1, { "id" : 1 })
+    backend.set(2, { "id" : 2 })
+
+    backend.delete(1)
+    assert backend.get(1) is None
+
+    backend.clear()
+    assert backend.get(2) is None
+    assert len(backend) == 0
+
+
+def test_sqlite_backend_persists(tmp_path):
+    """Test whether the on-disk backend keeps its entries between instances"""
+    path = str(tmp_path / "cache.db")
+    backend = SqliteCacheBackend(path)
+    backend.set(("BTC", "transaction", "abc", False), { "id" : "abc" })
+    backend.close()
+
+    backend = SqliteCacheBackend(path)
+    assert backend.get(("BTC", "transaction", "abc", False)) == { "id" : "abc" }
+    backend.close()
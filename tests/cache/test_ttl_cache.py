@@ -0,0 +1,41 @@
+import time
+
+import pytest
+from multichain_explorer.src.cache.ttl_cache import TTLCache
+
+
+@pytest.fixture
+def cache() -> TTLCache:
+    """Setup a cache with a short time to live"""
+    return TTLCache(ttl = 0.05, max_entries = 3)
+
+
+def test_get_returns_stored_value(cache: TTLCache):
+    """Test whether a stored value is returned before it expires"""
+    cache.set(("ETH", "USD"), 1)
+    assert cache.get(("ETH", "USD")) == 1
+    assert ("ETH", "USD") in cache
+
+
+def test_get_returns_default_after_expiry(cache: TTLCache):
+    """Test whether an entry is dropped once its time to live has passed"""
+    cache.set("key", 1)
+    time.sleep(0.06)
+    assert cache.get("key", "missing") == "missing"
+    assert "key" not in cache
+
+
+def test_set_with_custom_ttl(cache: TTLCache):
+    """Test whether an entry can outlive the default time to live"""
+    cache.set("key", 1, ttl = 10)
+    time.sleep(0.06)
+    assert cache.get("key") == 1
+
+
+def test_oldest_entries_dropped_when_full(cache: TTLCache):
+    """Test whether the oldest entry is evicted when the cache is full"""
+    for key in range(4):
+        cache.set(key, key, ttl = 10)
+
+    assert 0 not in cache
+    assert [cache.get(key) for key in range(1, 4)] == [1, 2, 3]
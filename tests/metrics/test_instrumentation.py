@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+from multichain_explorer.src.metrics.instrumentation import Instrumentation
+from multichain_explorer.src.metrics.prometheus_metrics_backend import PrometheusMetricsBackend
+from multichain_explorer.src.models.blockchains import Blockchains
+from multichain_explorer.src.providers.eth.eth_provider import EthProvider
+from multichain_explorer.src.providers.provider_factory import BlockchainProvider
+
+
+class FakeIndexer():
+    """Upstream sub-client whose requests are counted as HTTP traffic"""
+
+    def search_transactions(self, block):
+        Instrumentation.count_traffic(10, 200)
+        return { "transactions" : [block] }
+
+
+class FakeClient():
+    """Upstream client with a property calling the upstream, and a sub-client"""
+
+    def __init__(self):
+        self.indexer = FakeIndexer()
+
+    @property
+    def last_round(self) -> int:
+        return 7
+
+    def block_info(self, block_id):
+        if block_id < 0:
+            raise KeyError(block_id)
+        return { "id" : block_id }
+
+    async def status(self):
+        return { "last-round" : 7 }
+
+
+class FakeProvider():
+    """Provider whose get_blocks calls its own get_block_by_id"""
+
+    def __init__(self):
+        self.provider = FakeClient()
+
+    def get_latest_block_number(self):
+        return self.provider.last_round
+
+    def get_block_by_id(self, block_id):
+        return self.provider.block_info(block_id)
+
+    def get_blocks(self, num_blocks):
+        latest = self.get_latest_block_number()
+        return [self.get_block_by_id(block_id) for block_id in range(latest, latest - num_blocks, -1)]
+
+    def get_transactions(self, num_tx):
+        return self.provider.indexer.search_transactions(self.get_latest_block_number())["transactions"]
+
+    async def get_summary(self):
+        return await self.provider.status()
+
+
+@pytest.fixture
+def backend() -> PrometheusMetricsBackend:
+    return PrometheusMetricsBackend()
+
+
+@pytest.fixture
+def provider(backend: PrometheusMetricsBackend) -> FakeProvider:
+    """Setup an instrumented fake provider"""
+    provider = FakeProvider()
+    Instrumentation(backend, Blockchains.ALGO).attach(provider)
+    return provider
+
+
+def get_count(backend: PrometheusMetricsBackend, metric: str, labels: str) -> int:
+    prefix = f"multichain_explorer_{metric}_count{{blockchain=\"ALGO\",{labels}}} "
+    return next((int(line[len(prefix):]) for line in backend.export().splitlines() if line.startswith(prefix)), 0)
+
+
+def test_nested_calls_are_recorded(provider: FakeProvider, backend: PrometheusMetricsBackend):
+    """Test whether the calls a provider makes to its own methods and clients are all recorded"""
+    provider.get_blocks(3)
+
+    assert get_count(backend, "provider_call_duration_seconds", 'method="get_blocks"') == 1
+    assert get_count(backend, "provider_call_duration_seconds", 'method="get_block_by_id"') == 3
+    assert get_count(backend, "upstream_request_duration_seconds", 'endpoint="block_info"') == 3
+    assert get_count(backend, "upstream_request_duration_seconds", 'endpoint="last_round"') == 1
+
+
+def test_errors_are_recorded(provider: FakeProvider, backend: PrometheusMetricsBackend):
+    """Test whether a failed call is recorded with its error type and still raises"""
+    with pytest.raises(KeyError):
+        provider.get_block_by_id(-1)
+
+    export = backend.export()
+    assert 'provider_call_errors_total{blockchain="ALGO",method="get_block_by_id",error="KeyError"} 1' in export
+    assert 'upstream_errors_total{blockchain="ALGO",endpoint="block_info",error="KeyError"} 1' in export
+
+
+def test_sub_client_traffic_is_recorded(provider: FakeProvider, backend: PrometheusMetricsBackend):
+    """Test whether sub-clients are recorded by their path, with the HTTP traffic of the call"""
+    assert provider.get_transactions(1) == [7]
+
+    export = backend.export()
+    assert 'upstream_sent_bytes_total{blockchain="ALGO",endpoint="indexer.search_transactions"} 10' in export
+    assert 'upstream_received_bytes_total{blockchain="ALGO",endpoint="indexer.search_transactions"} 200' in export
+
+
+def test_coroutines_are_measured_until_awaited(provider: FakeProvider, backend: PrometheusMetricsBackend):
+    """Test whether async provider methods and clients are recorded once awaited"""
+    assert asyncio.run(provider.get_summary()) == { "last-round" : 7 }
+
+    assert get_count(backend, "provider_call_duration_seconds", 'method="get_summary"') == 1
+    assert get_count(backend, "upstream_request_duration_seconds", 'endpoint="status"') == 1
+
+
+def test_factory_instruments_with_backend(monkeypatch, backend: PrometheusMetricsBackend):
+    """Test whether the pooled providers are only instrumented with a metrics backend set"""
+    monkeypatch.setattr(EthProvider, "INFURA_URL", "http://localhost:8545")
+    try:
+        assert BlockchainProvider.get_instance(Blockchains.ETH).instrumentation is None
+
+        monkeypatch.setattr(BlockchainProvider, "METRICS_BACKEND", backend)
+        instrumented = BlockchainProvider.get_instance(Blockchains.ETH)
+        assert instrumented.instrumentation.backend is backend
+        assert EthProvider.coinMarketCapService.fetchService is not instrumented.coinMarketCapService.fetchService
+    finally:
+        BlockchainProvider.close()
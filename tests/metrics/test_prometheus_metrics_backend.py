@@ -0,0 +1,45 @@
+import pytest
+from multichain_explorer.src.metrics.prometheus_metrics_backend import PrometheusMetricsBackend
+
+
+@pytest.fixture
+def backend() -> PrometheusMetricsBackend:
+    """Setup a backend with three latency buckets"""
+    return PrometheusMetricsBackend(buckets = (0.1, 1, 10))
+
+
+def test_export_histograms(backend: PrometheusMetricsBackend):
+    """Test whether the calls are exported as cumulative Prometheus histograms"""
+    backend.record_call("ETH", "get_blocks", 0.05)
+    backend.record_call("ETH", "get_blocks", 0.5)
+    backend.record_call("ETH", "get_blocks", 20, error = "Timeout")
+
+    lines = backend.export().splitlines()
+
+    assert "# TYPE multichain_explorer_provider_call_duration_seconds histogram" in lines
+    assert 'multichain_explorer_provider_call_duration_seconds_bucket{blockchain="ETH",method="get_blocks",le="0.1"} 1' in lines
+    assert 'multichain_explorer_provider_call_duration_seconds_bucket{blockchain="ETH",method="get_blocks",le="10.0"} 2' in lines
+    assert 'multichain_explorer_provider_call_duration_seconds_bucket{blockchain="ETH",method="get_blocks",le="+Inf"} 3' in lines
+    assert 'multichain_explorer_provider_call_duration_seconds_count{blockchain="ETH",method="get_blocks"} 3' in lines
+    assert 'multichain_explorer_provider_call_errors_total{blockchain="ETH",method="get_blocks",error="Timeout"} 1' in lines
+
+
+def test_export_upstream_bytes(backend: PrometheusMetricsBackend):
+    """Test whether the bytes are summed per endpoint, calls without observed traffic add nothing"""
+    backend.record_upstream("ETH", "eth.get_block", 0.2, bytes_sent = 100, bytes_received = 2000)
+    backend.record_upstream("ETH", "eth.get_block", 0.2, bytes_sent = 50, bytes_received = 1000)
+    backend.record_upstream("BTC", "block_info", 0.2)
+
+    lines = backend.export().splitlines()
+
+    assert 'multichain_explorer_upstream_sent_bytes_total{blockchain="ETH",endpoint="eth.get_block"} 150' in lines
+    assert 'multichain_explorer_upstream_received_bytes_total{blockchain="ETH",endpoint="eth.get_block"} 3000' in lines
+    assert 'multichain_explorer_upstream_request_duration_seconds_count{blockchain="BTC",endpoint="block_info"} 1' in lines
+    assert not any(line.startswith("multichain_explorer_upstream_received_bytes_total{blockchain=\"BTC\"") for line in lines)
+
+
+def test_labels_are_escaped(backend: PrometheusMetricsBackend):
+    """Test whether quotes in the label values do not break the exposition format"""
+    backend.record_call("ETH", 'get_"blocks"', 0.01)
+
+    assert 'method="get_\\"blocks\\""' in backend.export()
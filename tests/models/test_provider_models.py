@@ -0,0 +1,84 @@
+import dataclasses
+import json
+import pickle
+from decimal import Decimal
+
+import pytest
+from multichain_explorer.src.models.provider_models.address import Address
+from multichain_explorer.src.models.provider_models.block import Block
+from multichain_explorer.src.models.provider_models.json_serializer import to_json
+from multichain_explorer.src.models.provider_models.raw_data import RawData
+from multichain_explorer.src.models.provider_models.transaction import Transaction
+from multichain_explorer.src.models.provider_models.transfer import Transfer
+
+
+@pytest.fixture
+def block() -> Block:
+    """Setup a block without raw data"""
+    return Block(id = 100, miner = "miner", difficulty = "-", timestamp = 1650000000, hash = "hash-100", parent_hash = "hash-99")
+
+
+def test_models_are_slotted_and_frozen(block: Block):
+    """Test whether the models hold no per-instance dict and can't be changed"""
+    assert not hasattr(block, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        block.id = 101
+
+
+def test_to_dict_keys(block: Block):
+    """Test whether to_dict uses the keys of the provider interface, leaving out the optional fields not set"""
+    assert block.to_dict() == { "id" : 100, "miner" : "miner", "difficulty" : "-", "timestamp" : 1650000000,
+                                "hash" : "hash-100", "parentHash" : "hash-99" }
+
+    transaction = Transaction(id = "tx", address_from = "a", address_to = "b", value = 1, block = 100,
+                              transfers = (Transfer("a", "b", 1),), raw_data = {})
+    assert transaction.to_dict() == { "id" : "tx", "from" : "a", "to" : "b", "value" : 1, "block" : 100, "blockHash" : None,
+                                      "transfers" : [{ "from" : "a", "to" : "b", "value" : 1 }], "rawData" : {} }
+
+
+def test_read_by_dict_key(block: Block):
+    """Test whether the fields can still be read by their dict keys"""
+    assert block["parentHash"] == "hash-99"
+    assert "hash" in block and "rawData" not in block and "error" not in block
+    with pytest.raises(KeyError):
+        block["parent_hash"]
+
+
+def test_to_json(block: Block):
+    """Test whether the models, and the lists and dicts holding them, are serialized with their dict keys"""
+    data = json.loads(to_json({ "blocks" : [block], "address" : Address("0xabc", Decimal("1.5")) }))
+
+    assert data == { "blocks" : [block.to_dict()], "address" : { "address" : "0xabc", "balance" : "1.5" } }
+
+
+def test_raw_data_decoded_when_read():
+    """Test whether the raw data is decoded only once, the first time it is read"""
+    encoded = []
+    def encode(payload) -> str:
+        encoded.append(payload)
+        return json.dumps(payload)
+
+    raw_data = RawData({ "number" : 100 }, encode)
+    assert encoded == []
+    assert raw_data.value == { "number" : 100 } and raw_data.value == { "number" : 100 }
+    assert len(encoded) == 1
+
+
+def test_raw_data_passed_through(block: Block):
+    """Test whether to_json writes the upstream JSON of the raw data as it was received"""
+    upstream = b'{"hash":"hash-100","size":285, "text":"\\u00e9"}'
+    raw_block = dataclasses.replace(block, raw_data = RawData(upstream))
+
+    assert upstream.decode() in to_json([raw_block])
+    assert json.loads(to_json([raw_block]))[0]["rawData"] == { "hash" : "hash-100", "size" : 285, "text" : "\u00e9" }
+    assert raw_block.to_dict()["rawData"]["size"] == 285
+
+
+def test_raw_data_pickled_undecoded(block: Block):
+    """Test whether raw data survives a pickle round trip (eg.: through a cache backend), still undecoded"""
+    encode = lambda payload: json.dumps(payload)
+    raw_block = pickle.loads(pickle.dumps(dataclasses.replace(block, raw_data = RawData({ "size" : 285 }, encode))))
+
+    assert raw_block.raw_data.to_json() == '{"size": 285}'
+    assert raw_block["rawData"] == { "size" : 285 }
+    assert raw_block.to_dict()["rawData"] == { "size" : 285 }
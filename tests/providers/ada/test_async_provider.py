@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+from multichain_explorer.src.models.provider_options import ProviderOptions
+from multichain_explorer.src.providers.ada.async_ada_provider import AsyncAdaProvider
+
+
+class FakeAsyncFetchService():
+    """Blockfrost REST API of a chain at height 250 with 3 transactions per block, recording the paths"""
+
+    HEAD = 250
+
+    def __init__(self):
+        self.paths = []
+        # Heights of the blocks without transactions
+        self.empty = set()
+
+    async def fetch_json(self, endpoint, parameters = None, headers = None):
+        path = endpoint.split("/api/v0/", 1)[1]
+        self.paths.append(path)
+        parts = path.split("/")
+        if parts[0] == "blocks" and len(parts) == 2:
+            return self._block(self.HEAD if parts[1] == "latest" else int(parts[1].split("-")[-1]))
+        if parts[0] == "blocks" and parts[2] == "previous":
+            height, count, page = int(parts[1].split("-")[1]), parameters["count"], parameters["page"]
+            return [self._block(block_height) for block_height in range(max(height - page * count, 0), height - (page - 1) * count)]
+        if parts[0] == "blocks" and parts[2] == "txs":
+            hashes = [f"tx-{parts[1]}-{index}" for index in range(3)] if int(parts[1].split("-")[1]) not in self.empty else []
+            return (hashes if parameters.get("order", "asc") == "asc" else list(reversed(hashes)))[:parameters["count"]]
+        if parts[0] == "txs" and len(parts) == 3:
+            return { "hash" : parts[1], "inputs" : [{ "address" : "addr-from" }],
+                     "outputs" : [{ "address" : "addr-to", "amount" : [{ "unit" : "lovelace", "quantity" : "1" }] }] }
+        return { "hash" : parts[1], "block_height" : 100, "block" : "block-100" }
+
+    def _block(self, height: int) -> dict:
+        return { "height" : height, "slot_leader" : "pool", "time" : height, "hash" : f"block-{height}",
+                 "previous_block" : f"block-{height - 1}" }
+
+
+@pytest.fixture
+def provider() -> AsyncAdaProvider:
+    """Setup an async ADA provider on the fake Blockfrost API"""
+    provider = AsyncAdaProvider()
+    provider.fetchService = FakeAsyncFetchService()
+    return provider
+
+
+def test_get_blocks_lists_previous_blocks(provider: AsyncAdaProvider):
+    """Test whether the blocks before the tip are read from the previous blocks pages, newest first"""
+    blocks = asyncio.run(provider.get_blocks(150))
+
+    assert [block["id"] for block in blocks] == list(range(250, 100, -1))
+    assert sorted(provider.fetchService.paths) == ["blocks/block-250/previous", "blocks/block-250/previous", "blocks/latest"]
+
+
+def test_get_transactions_reads_only_utxos(provider: AsyncAdaProvider):
+    """Test whether the latest transactions are listed newest first in one page, and only their utxos fetched"""
+    transactions = asyncio.run(provider.get_transactions(2))
+
+    assert [transaction["id"] for transaction in transactions] == ["tx-block-250-1", "tx-block-250-2"]
+    assert [transaction["blockHash"] for transaction in transactions] == ["block-250", "block-250"]
+    assert sorted(provider.fetchService.paths) == ["blocks/block-250/txs", "blocks/latest",
+                                                   "txs/tx-block-250-1/utxos", "txs/tx-block-250-2/utxos"]
+
+
+def test_get_transaction_by_id(provider: AsyncAdaProvider):
+    """Test whether a transaction is built from its utxos and its block, with its raw data when requested"""
+    transaction = asyncio.run(provider.get_transaction_by_id("tx-1", ProviderOptions(raw = True)))
+
+    assert (transaction["from"], transaction["to"], transaction["value"], transaction["block"]) == ("addr-from", "addr-to", "1", 100)
+    assert transaction["rawData"]["outputs"][0]["address"] == "addr-to"
+
+
+def test_latest_transaction_walks_back_empty_blocks(provider: AsyncAdaProvider):
+    """Test whether the latest transaction is the newest one of the last block holding transactions"""
+    provider.fetchService.empty = { 250 }
+    transaction = asyncio.run(provider.get_transaction_by_id())
+
+    assert (transaction["id"], transaction["block"]) == ("tx-block-249-2", 249)
@@ -0,0 +1,94 @@
+from types import SimpleNamespace
+
+import pytest
+from multichain_explorer.src.providers.ada.ada_provider import AdaProvider
+from multichain_explorer.src.providers.not_found_error import NotFoundError
+
+
+class FakeBlockFrost():
+    """Blockfrost client of a chain at height 250 with 3 transactions per block, recording its calls"""
+
+    HEAD = 250
+
+    def __init__(self):
+        self.calls = []
+        # Heights of the blocks without transactions
+        self.empty = set()
+
+    def block(self, block_id):
+        self.calls.append(("block", block_id))
+        return self._block(int(str(block_id).split("-")[-1]))
+
+    def block_latest(self):
+        self.calls.append(("block_latest",))
+        return self._block(self.HEAD)
+
+    def blocks_previous(self, block_hash: str, count: int, page: int):
+        self.calls.append(("blocks_previous", page))
+        height = int(block_hash.split("-")[1])
+        return [self._block(block_height) for block_height in range(max(height - page * count, 0), height - (page - 1) * count)]
+
+    def block_transactions(self, block_hash: str, count: int = 100, order: str = "asc", gather_pages: bool = False):
+        self.calls.append(("block_transactions", count, order))
+        hashes = [f"tx-{block_hash}-{index}" for index in range(3)] if int(block_hash.split("-")[1]) not in self.empty else []
+        return (hashes if order == "asc" else list(reversed(hashes)))[:count]
+
+    def transaction_utxos(self, tx_id: str):
+        self.calls.append(("transaction_utxos", tx_id))
+        return SimpleNamespace(hash = tx_id,
+                               inputs = [SimpleNamespace(address = "addr-from")],
+                               outputs = [SimpleNamespace(address = "addr-to", amount = [SimpleNamespace(quantity = "1")])])
+
+    def _block(self, height: int):
+        return SimpleNamespace(height = height, slot_leader = "pool", time = height, hash = f"block-{height}",
+                               previous_block = f"block-{height - 1}")
+
+
+@pytest.fixture
+def provider() -> AdaProvider:
+    """Setup an ADA provider on the fake Blockfrost client"""
+    provider = AdaProvider()
+    provider.provider = FakeBlockFrost()
+    return provider
+
+
+def test_get_blocks_lists_previous_blocks(provider: AdaProvider):
+    """Test whether the blocks before the tip are read from the previous blocks pages, newest first"""
+    blocks = provider.get_blocks(150)
+
+    assert [block["id"] for block in blocks] == list(range(250, 100, -1))
+    assert sorted(provider.provider.calls) == [("block_latest",), ("blocks_previous", 1), ("blocks_previous", 2)]
+
+
+def test_get_blocks_stops_at_genesis(provider: AdaProvider):
+    """Test whether no block before the first one is listed"""
+    provider.provider.HEAD = 3
+
+    assert [block["id"] for block in provider.get_blocks(10)] == [3, 2, 1, 0]
+
+
+def test_get_transactions_fetches_only_utxos(provider: AdaProvider):
+    """Test whether the latest transactions take a block, a page of hashes and their utxos, in the order of the block"""
+    transactions = provider.get_transactions(2)
+
+    assert [transaction["id"] for transaction in transactions] == ["tx-block-250-1", "tx-block-250-2"]
+    assert transactions[0]["block"] == 250 and transactions[0].block_hash == "block-250"
+    assert provider.provider.calls[:2] == [("block_latest",), ("block_transactions", 2, "desc")]
+    assert len(provider.provider.calls) == 4
+
+
+def test_latest_transaction_walks_back_empty_blocks(provider: AdaProvider):
+    """Test whether the latest transaction is the newest one of the last block holding transactions"""
+    provider.provider.empty = { 250, 249 }
+
+    assert provider.get_transaction_by_id()["id"] == "tx-block-248-2"
+    assert [call for call in provider.provider.calls if call[0] == "block"] == [("block", "block-249"), ("block", "block-248")]
+
+
+def test_latest_transaction_not_found(provider: AdaProvider, monkeypatch):
+    """Test whether a tip without transactions in the walked back blocks raises a NotFoundError"""
+    monkeypatch.setattr(provider, "MAX_WALK_BACK_BLOCKS", 2)
+    provider.provider.empty = { 250, 249, 248 }
+
+    with pytest.raises(NotFoundError):
+        provider.get_transaction_by_id()
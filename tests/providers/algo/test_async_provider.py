@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+from multichain_explorer.src.models.provider_options import ProviderOptions
+from multichain_explorer.src.providers.algo.algo_provider import AlgoProvider
+from multichain_explorer.src.providers.algo.async_algo_provider import AsyncAlgoProvider
+
+
+class FakeAsyncFetchService():
+    """algod and indexer REST APIs of a chain at round 100 with 2 transactions per round, recording the paths"""
+
+    def __init__(self):
+        self.paths = []
+
+    async def fetch_json(self, endpoint, parameters = None, headers = None):
+        path = endpoint.split("/", 3)[3]
+        self.paths.append((path, parameters))
+        if path == "v2/status":
+            return { "last-round" : 100 }
+        if path.startswith("v2/blocks/"):
+            round_number = int(path.split("/")[2])
+            return { "block" : { "rnd" : round_number, "ts" : round_number, "prev" : f"blk-{round_number - 1}" } }
+        if path == "v2/transactions":
+            return { "transactions" : [self._transaction(parameters["round"], index) for index in range(2)] }
+        return { "transaction" : self._transaction(int(path.split("-")[1]), int(path.split("-")[2])) }
+
+    def _transaction(self, round_number: int, index: int) -> dict:
+        return { "id" : f"TX-{round_number}-{index}", "tx-type" : "pay", "sender" : "A", "confirmed-round" : round_number,
+                 "payment-transaction" : { "receiver" : "B", "amount" : index } }
+
+
+@pytest.fixture
+def provider(monkeypatch) -> AsyncAlgoProvider:
+    """Setup an async ALGO provider whose head is at round 100"""
+    monkeypatch.setattr(AlgoProvider, "ALGOD_ADDRESS", "http://algod")
+    monkeypatch.setattr(AlgoProvider, "INDEXER_ADDRESS", "http://indexer")
+    provider = AsyncAlgoProvider()
+    provider.fetchService = provider.indexerFetchService = FakeAsyncFetchService()
+    return provider
+
+
+def test_get_transactions_from_the_round_search(provider: AsyncAlgoProvider):
+    """Test whether the latest transactions are built from the search results, without fetching them one by one"""
+    transactions = asyncio.run(provider.get_transactions(1))
+
+    assert [transaction["id"] for transaction in transactions] == ["TX-100-1"]
+    assert [path for path, _ in provider.fetchService.paths] == ["v2/status", "v2/transactions"]
+
+
+def test_get_blocks(provider: AsyncAlgoProvider):
+    """Test whether the blocks are read from algod, newest first"""
+    blocks = asyncio.run(provider.get_blocks(3))
+
+    assert [block["id"] for block in blocks] == [100, 99, 98]
+    assert blocks[0]["parentHash"] == "blk-99"
+    assert blocks[0]["hash"] is None
+
+
+def test_get_transaction_by_id(provider: AsyncAlgoProvider):
+    """Test whether a transaction is read from the indexer by id, with its raw data when requested"""
+    transaction = asyncio.run(provider.get_transaction_by_id("TX-90-1", ProviderOptions(raw = True)))
+
+    assert (transaction["from"], transaction["to"], transaction["value"], transaction["block"]) == ("A", "B", 1, 90)
+    assert transaction["rawData"]["id"] == "TX-90-1"
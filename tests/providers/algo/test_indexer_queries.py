@@ -0,0 +1,96 @@
+import base64
+from types import SimpleNamespace
+
+import pytest
+from algosdk.error import IndexerHTTPError
+from multichain_explorer.src.providers.algo.algo_provider import AlgoProvider
+
+
+class FakeIndexer():
+    """Indexer of a chain at round 100 with 2 transactions per round, answering pages of page_size results"""
+
+    def __init__(self, page_size: int, block_headers: bool = True, error: str = "Not Found"):
+        self.page_size = page_size
+        self.block_headers = block_headers
+        self.error = error
+        self.requests = []
+
+    def search_transactions(self, limit = None, next_page = None, block = None, min_round = None, max_round = None):
+        self.requests.append(("transactions", block, min_round, max_round, next_page))
+        min_round, max_round = (block, block) if block is not None else (min_round, max_round)
+        keys = [(round_number, index) for round_number in range(min_round, max_round + 1) for index in range(2)]
+        return self._page([{ "id" : f"TX-{round_number}-{index}", "tx-type" : "pay", "sender" : "A", "confirmed-round" : round_number,
+                             "payment-transaction" : { "receiver" : "B", "amount" : index } }
+                           for round_number, index in keys], next_page, "transactions")
+
+    def indexer_request(self, method, requrl, params = None):
+        self.requests.append((requrl, params["min-round"], params["max-round"], params.get("next")))
+        if not self.block_headers:
+            raise IndexerHTTPError(self.error)
+        # The indexer is one round behind algod
+        headers = [{ "round" : round_number, "timestamp" : round_number, "previous-block-hash" : base64.b64encode(b"\x00" * 32).decode() }
+                   for round_number in range(params["min-round"], min(params["max-round"], 99) + 1)]
+        return self._page(headers, params.get("next"), "blocks")
+
+    def _page(self, results: list, next_page: str, key: str) -> dict:
+        start = int(next_page or 0)
+        return { key : results[start:start + self.page_size], "next-token" : str(start + self.page_size) }
+
+
+@pytest.fixture
+def provider(monkeypatch) -> AlgoProvider:
+    """Setup an ALGO provider whose head is at round 100, with indexer pages of 3 results"""
+    monkeypatch.setattr(AlgoProvider, "_indexersWithoutBlockHeaders", set())
+    provider = AlgoProvider()
+    provider.provider = SimpleNamespace(indexer = FakeIndexer(page_size = 3),
+                                        block_info = lambda round_number: { "block" : { "rnd" : round_number, "ts" : round_number } })
+    monkeypatch.setattr(provider, "SEARCH_PAGE_SIZE", 3)
+    monkeypatch.setattr(provider, "get_latest_block_number", lambda: 100)
+    return provider
+
+
+def test_get_transactions_walks_back_rounds(provider: AlgoProvider):
+    """Test whether the latest transactions are built from the search results, walking back over growing round ranges"""
+    transactions = provider.get_transactions(7)
+
+    assert [transaction["id"] for transaction in transactions] == \
+           ["TX-97-1", "TX-98-0", "TX-98-1", "TX-99-0", "TX-99-1", "TX-100-0", "TX-100-1"]
+    assert [request[1:4] for request in provider.provider.indexer.requests] == \
+           [(100, None, None), (99, None, None), (None, 97, 98), (None, 97, 98)]
+
+
+def test_get_transactions_stops_at_max_walk_back(provider: AlgoProvider, monkeypatch):
+    """Test whether no round older than MAX_WALK_BACK_ROUNDS is searched"""
+    monkeypatch.setattr(provider, "MAX_WALK_BACK_ROUNDS", 2)
+
+    assert len(provider.get_transactions(10)) == 4
+
+
+def test_get_blocks_reads_block_headers(provider: AlgoProvider):
+    """Test whether the blocks are read from the block headers search, the rounds not indexed yet from algod"""
+    blocks = provider.get_blocks(5)
+
+    assert [block["id"] for block in blocks] == [100, 99, 98, 97, 96]
+    assert blocks[1]["parentHash"] == "blk-" + "A" * 52
+    assert [request[3] for request in provider.provider.indexer.requests] == [None, "3"]
+
+
+def test_get_blocks_without_block_headers_search(provider: AlgoProvider):
+    """Test whether the blocks are read from algod when the indexer has no block headers search, probed only once"""
+    provider.provider.indexer.block_headers = False
+
+    assert [block["id"] for block in provider.get_blocks(3)] == [100, 99, 98]
+    assert [block["id"] for block in provider.get_blocks(3)] == [100, 99, 98]
+    assert len(provider.provider.indexer.requests) == 1
+
+
+def test_get_blocks_raises_indexer_errors(provider: AlgoProvider):
+    """Test whether the indexer errors other than a missing block headers search are raised, and probed again"""
+    provider.provider.indexer.block_headers = False
+    provider.provider.indexer.error = "Too Many Requests"
+
+    with pytest.raises(IndexerHTTPError):
+        provider.get_blocks(3)
+    with pytest.raises(IndexerHTTPError):
+        provider.get_blocks(3)
+    assert len(provider.provider.indexer.requests) == 2
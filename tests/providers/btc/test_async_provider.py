@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+from multichain_explorer.src.models.provider_options import ProviderOptions
+from multichain_explorer.src.providers.btc.async_btc_provider import AsyncBtcProvider
+
+
+class FakeAsyncFetchService():
+    """blockchain.info explorer of a chain at height 100, blocks of 3 transactions, the first one a coinbase, block 98 failing"""
+
+    def __init__(self):
+        self.paths = []
+
+    async def fetch_json(self, endpoint, parameters = None, headers = None):
+        path = endpoint.split("/", 3)[3]
+        self.paths.append(path)
+        if path == "latestblock":
+            return { "height" : 100 }
+        kind, resource_id = path.split("/")
+        if kind == "rawtx":
+            return self._transaction(int(resource_id.split("-")[1]), int(resource_id.split("-")[2]))
+        if kind == "address":
+            return { "final_balance" : 625 }
+
+        height = int(resource_id)
+        if height == 98:
+            raise ValueError("block not found")
+        block = { "ver" : 1, "hash" : f"hash-{height}", "prev_block" : f"hash-{height - 1}", "time" : height, "mrkl_root" : "root",
+                  "bits" : 1, "nonce" : 0, "main_chain" : True, "tx" : [self._transaction(height, index) for index in range(3)] }
+        return { "blocks" : [block] }
+
+    def _transaction(self, height: int, index: int) -> dict:
+        inputs = [{ "sequence" : 0 }] if index == 0 else [{ "prev_out" : { "addr" : "from" } }]
+        return { "hash" : f"tx-{height}-{index}", "block_index" : height, "inputs" : inputs,
+                 "out" : [{ "addr" : "miner" if index == 0 else "to", "value" : index }] }
+
+
+@pytest.fixture
+def provider() -> AsyncBtcProvider:
+    """Setup an async BTC provider whose head is at block 100"""
+    provider = AsyncBtcProvider()
+    provider.fetchService = FakeAsyncFetchService()
+    return provider
+
+
+def test_transactions_hydrated_from_the_block(provider: AsyncBtcProvider):
+    """Test whether the latest transactions are built from a single block request"""
+    transactions = asyncio.run(provider.get_transactions(2))
+
+    assert [transaction["id"] for transaction in transactions] == ["tx-100-1", "tx-100-2"]
+    assert provider.fetchService.paths == ["latestblock", "block-height/100"]
+
+
+def test_get_blocks_reports_failed_block(provider: AsyncBtcProvider):
+    """Test whether the blocks are returned in order, a failed block reported in its place"""
+    blocks = asyncio.run(provider.get_blocks(3))
+
+    assert [block["id"] for block in blocks] == [100, 99, 98]
+    assert blocks[0]["parentHash"] == "hash-99"
+    assert blocks[2]["error"] == "block not found"
+
+
+def test_get_transaction_by_id(provider: AsyncBtcProvider):
+    """Test whether a transaction is read by id, a coinbase one without a sender"""
+    transaction = asyncio.run(provider.get_transaction_by_id("tx-90-0", ProviderOptions(raw = True)))
+
+    assert (transaction["from"], transaction["to"], transaction["block"]) == ("-", "miner", 90)
+    assert transaction["rawData"]["hash"] == "tx-90-0"
@@ -0,0 +1,108 @@
+import json
+
+import pytest
+from multichain_explorer.src.models.provider_options import ProviderOptions
+from multichain_explorer.src.models.provider_models.json_serializer import to_json
+from multichain_explorer.src.providers.btc.btc_provider import BtcProvider
+
+
+class FakeFetchService():
+    """blockchain.info explorer of a chain at height 100, blocks of 3 transactions, the first one a coinbase"""
+
+    def __init__(self):
+        self.endpoints = []
+
+    def fetch_json(self, endpoint, parameters, headers):
+        self.endpoints.append(endpoint.split("/", 3)[3])
+        kind, block_id = endpoint.rsplit("/", 2)[1:]
+        height = int(block_id) if kind == "block-height" else int(block_id.split("-")[1])
+        transactions = [{ "hash" : f"tx-{height}-0", "block_index" : height,
+                          "inputs" : [{ "sequence" : 0 }], "out" : [{ "addr" : "miner", "value" : 625 }] }]
+        transactions += [{ "hash" : f"tx-{height}-{index}", "block_index" : height,
+                           "inputs" : [{ "prev_out" : { "addr" : "from" } }], "out" : [{ "addr" : "to", "value" : index }] }
+                         for index in (1, 2)]
+        block = { "height" : height, "hash" : f"hash-{height}", "prev_block" : f"hash-{height - 1}", "time" : height,
+                  "main_chain" : True, "tx" : transactions }
+        return block if kind == "rawblock" else { "blocks" : [block] }
+
+
+    def fetch_raw(self, endpoint, parameters, headers):
+        return json.dumps(self.fetch_json(endpoint, parameters, headers)).encode()
+
+
+@pytest.fixture
+def provider(monkeypatch) -> BtcProvider:
+    """Setup a BTC provider whose head is at block 100"""
+    provider = BtcProvider()
+    provider.fetchService = FakeFetchService()
+    provider._highest_block_number = 100
+    monkeypatch.setattr(provider, "get_latest_block_number", lambda: 100)
+    return provider
+
+
+def test_transactions_hydrated_from_the_block(provider: BtcProvider):
+    """Test whether the latest transactions are built from a single block request"""
+    transactions = provider.get_transactions(2)
+
+    assert [transaction["id"] for transaction in transactions] == ["tx-100-1", "tx-100-2"]
+    assert provider.get_transaction_by_id("latest")["id"] == "tx-100-2"
+    assert provider.fetchService.endpoints == ["block-height/100"]
+
+
+def test_block_served_by_height_or_hash(provider: BtcProvider):
+    """Test whether a block fetched by hash is found again by height and the other way round"""
+    assert provider.get_block_by_id("hash-90")["id"] == 90
+    assert provider.get_block_by_id(90)["hash"] == "hash-90"
+    assert provider.get_block_by_id("80")["hash"] == "hash-80"
+    assert provider.get_block_by_id("hash-80")["id"] == 80
+
+    assert provider.fetchService.endpoints == ["rawblock/hash-90", "block-height/80"]
+
+
+def test_coinbase_transaction(provider: BtcProvider):
+    """Test whether the coinbase transaction of a block is built without a sender"""
+    transaction = provider.get_block_transactions(100)[0]
+
+    assert transaction["from"] == "-"
+    assert transaction["to"] == "miner"
+
+
+def test_raw_block_passed_through(provider: BtcProvider):
+    """Test whether the raw block is the explorer response as received, the cached block keeps no raw data"""
+    provider.get_block_by_id(90)
+    block = provider.get_block_by_id(90, ProviderOptions(raw = True))
+
+    assert provider.fetchService.endpoints == ["block-height/90", "rawblock/hash-90"]
+    assert provider.fetchService.fetch_raw("https://blockchain.info/rawblock/hash-90", None, None).decode() in to_json(block)
+    assert block["rawData"]["prev_block"] == "hash-89"
+    assert "rawData" not in provider.get_block_by_id(90)
+
+
+def test_raw_block_transactions(provider: BtcProvider):
+    """Test whether the transactions keep their explorer data when the raw data is requested"""
+    block = provider.get_block_by_id(100, ProviderOptions(raw = True))
+    transactions = provider.get_block_transactions(100, ProviderOptions(raw = True))
+
+    assert transactions[1].raw_data.value["out"] == [{ "addr" : "to", "value" : 1 }]
+    assert to_json(transactions[1]).count('"addr":"to"') == 1
+    assert "rawData" not in provider.get_block_transactions(100)[1]
+    # The raw block is fetched once, for the block and its transactions
+    assert provider.fetchService.endpoints == ["block-height/100", "rawblock/hash-100"]
+    assert block.raw_data is transactions[1].raw_data._payload
+
+
+def test_get_addresses_in_balance_requests(provider: BtcProvider, monkeypatch):
+    """Test whether the balances are fetched in bulk requests, invalid addresses being reported without being sent"""
+    requests = []
+    def fetch_json(endpoint, parameters, headers):
+        requests.append(parameters["active"])
+        return { address_id : { "final_balance" : len(address_id) } for address_id in parameters["active"].split("|") }
+    monkeypatch.setattr(provider.fetchService, "fetch_json", fetch_json)
+    monkeypatch.setattr(provider, "MAX_BALANCE_ADDRESSES", 2)
+    address_ids = ["1BoatSLRHtKNngkdXEeobR76b53LETtpyT", "bad", "bc1qar0srrr7xfkvy5l643lydnw9re59gtzzwf5mdq", "3J98t1WpEZ73CNmQviecrnyiWrnqRhWNLy"]
+
+    addresses = provider.get_addresses(address_ids)
+
+    assert requests == ["|".join([address_ids[0], address_ids[2]]), address_ids[3]]
+    assert [address["balance"] for address in addresses if "error" not in address] == [34, 42, 34]
+    assert "bad" in addresses[1]["error"]
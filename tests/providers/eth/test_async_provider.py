@@ -0,0 +1,76 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from hexbytes import HexBytes
+from web3.datastructures import AttributeDict
+from multichain_explorer.src.models.provider_options import ProviderOptions
+from multichain_explorer.src.providers.eth.async_eth_provider import AsyncEthProvider
+from multichain_explorer.src.providers.eth.eth_provider import EthProvider
+
+
+def transaction(block_number: int, index: int) -> dict:
+    return { "hash" : HexBytes(bytes([block_number, index]) * 16), "from" : "0xfrom", "to" : "0xto", "value" : index,
+             "blockNumber" : block_number, "blockHash" : HexBytes(bytes([block_number]) * 32) }
+
+
+class FakeAsyncEth():
+    """Serves the blocks of a chain at height 10, block n holding n - 8 transactions"""
+
+    def __init__(self):
+        self.requests = []
+
+    async def get_block(self, block_id, full_transactions = False):
+        block_number = 10 if block_id == "latest" else block_id
+        self.requests.append((block_number, full_transactions))
+        transactions = [AttributeDict(transaction(block_number, index)) for index in range(max(block_number - 8, 0))]
+        return AttributeDict({ "number" : block_number,
+                               "transactions" : transactions if full_transactions else [tx["hash"] for tx in transactions] })
+
+
+class FakeAsyncFetchService():
+    """Answers JSON-RPC batches of eth_getTransactionByHash calls"""
+
+    def __init__(self):
+        self.payloads = []
+
+    async def post_json(self, endpoint, payload, headers = None):
+        self.payloads.append(payload)
+        return [{ "id" : call["id"], "result" : { "hash" : call["params"][0], "from" : "0x" + "01" * 20, "to" : "0x" + "02" * 20,
+                                                  "value" : "0x1", "blockNumber" : "0xa", "blockHash" : "0x" + "0a" * 32 } }
+                for call in payload]
+
+
+@pytest.fixture
+def provider() -> AsyncEthProvider:
+    """Setup an async ETH provider whose head is at block 10"""
+    provider = AsyncEthProvider()
+    provider.provider = SimpleNamespace(eth = FakeAsyncEth())
+    provider.fetchService = FakeAsyncFetchService()
+    return provider
+
+
+def test_get_transactions_from_full_blocks(provider: AsyncEthProvider):
+    """Test whether the latest transactions are built from full transaction blocks, walking back to the previous blocks"""
+    transactions = asyncio.run(provider.get_transactions(3))
+
+    assert [(transaction["block"], transaction["value"]) for transaction in transactions] == [(9, 0), (10, 0), (10, 1)]
+    assert provider.provider.eth.requests == [(10, True), (9, True)]
+    assert provider.fetchService.payloads == []
+
+
+def test_get_transactions_batches_hashes(provider: AsyncEthProvider, monkeypatch):
+    """Test whether the transactions are fetched in a single batch request when the blocks hold only their hashes"""
+    monkeypatch.setattr(EthProvider, "FULL_TRANSACTIONS", False)
+
+    transactions = asyncio.run(provider.get_transactions(2))
+
+    assert [len(payload) for payload in provider.fetchService.payloads] == [2]
+    assert [transaction["id"] for transaction in transactions] == [transaction(10, 0)["hash"].hex(), transaction(10, 1)["hash"].hex()]
+
+
+def test_raw_transactions(provider: AsyncEthProvider):
+    """Test whether the raw data of the transactions is kept and serialized when read"""
+    transactions = asyncio.run(provider.get_transactions(1, ProviderOptions(raw = True)))
+
+    assert transactions[0]["rawData"]["blockNumber"] == 10
@@ -0,0 +1,114 @@
+import pytest
+from hexbytes import HexBytes
+from web3.datastructures import AttributeDict
+from multichain_explorer.src.models.provider_options import ProviderOptions
+from multichain_explorer.src.models.provider_models.address import Address
+from multichain_explorer.src.providers.eth.eth_provider import EthProvider
+
+
+class FakeFetchService():
+    """Answers JSON-RPC batches with the block of every requested number, block 0x2 fails"""
+
+    def __init__(self):
+        self.payloads = []
+
+    def post_json(self, endpoint, payload, headers = None):
+        self.payloads.append(payload)
+        responses = []
+        for call in reversed(payload):
+            if call["params"][0] == "0x2":
+                responses.append({ "id" : call["id"], "error" : { "code" : -32000, "message" : "header not found" } })
+            else:
+                block = { "number" : call["params"][0], "miner" : "0x05a56e2d52c817161883f50c441c3228cfe54d9f",
+                          "difficulty" : "0x1", "timestamp" : "0x55ba4224", "transactions" : [],
+                          "hash" : "0x" + "11" * 32, "parentHash" : "0x" + "22" * 32 }
+                responses.append({ "id" : call["id"], "result" : block })
+        return responses
+
+
+@pytest.fixture
+def provider(monkeypatch) -> EthProvider:
+    """Setup an ETH provider whose head is at block 5 and sends batches of 2 calls"""
+    provider = EthProvider()
+    provider.fetchService = FakeFetchService()
+    monkeypatch.setattr(provider, "MAX_BATCH_SIZE", 2)
+    monkeypatch.setattr(provider, "get_latest_block_number", lambda: 5)
+    return provider
+
+
+def test_get_blocks_batches_calls(provider: EthProvider):
+    """Test whether the blocks are fetched in batch requests and returned in order"""
+    blocks = provider.get_blocks(5)
+
+    assert [len(payload) for payload in provider.fetchService.payloads] == [2, 2, 1]
+    assert [block["id"] for block in blocks] == [5, 4, 3, 2, 1]
+    assert blocks[0]["miner"] == "0x05a56E2D52c817161883f50c441c3228CFe54d9f"
+
+
+def test_get_blocks_reports_failed_call(provider: EthProvider):
+    """Test whether a failed call of a batch is reported in place of its block"""
+    blocks = provider.get_blocks(5)
+
+    assert "header not found" in blocks[3]["error"]
+
+
+def test_get_blocks_raw_data(provider: EthProvider):
+    """Test whether the raw data of the blocks is the JSON-RPC result as received, not the web3 formatted block"""
+    blocks = provider.get_blocks(1, ProviderOptions(raw = True))
+
+    assert blocks[0]["rawData"]["miner"] == "0x05a56e2d52c817161883f50c441c3228cfe54d9f"
+    assert blocks[0]["rawData"]["number"] == "0x5"
+    assert "rawData" not in provider.get_blocks(1)[0]
+
+
+class FakeEth():
+    """Serves full transaction blocks, block n holding n - 8 transactions"""
+
+    def __init__(self):
+        self.calls = []
+
+    def get_block(self, block_id, full_transactions = False):
+        self.calls.append((block_id, full_transactions))
+        number = 10 if block_id == "latest" else block_id
+        transactions = [AttributeDict({ "hash" : HexBytes(f"0x{number:02d}{i:02d}"), "from" : "a", "to" : "b",
+                                        "value" : 1, "blockNumber" : number })
+                        for i in range(max(0, number - 8))]
+        return AttributeDict({ "number" : number, "transactions" : transactions })
+
+
+def test_get_transactions_walks_back_blocks(provider: EthProvider):
+    """Test whether the transactions are built from full blocks, walking back until num_tx is reached"""
+    provider.provider = AttributeDict({ "eth" : FakeEth() })
+
+    transactions = provider.get_transactions(3)
+
+    assert provider.provider.eth.calls == [("latest", True), (9, True)]
+    assert [transaction["id"] for transaction in transactions] == ["0x0900", "0x1000", "0x1001"]
+    assert provider.fetchService.payloads == []
+
+
+def test_get_addresses_batches_balances(provider: EthProvider, monkeypatch):
+    """Test whether the balances are fetched in batch requests, failures being reported per address"""
+    def post_json(endpoint, payload, headers = None):
+        provider.fetchService.payloads.append(payload)
+        return [{ "id" : call["id"], "error" : { "code" : -32602, "message" : "invalid address" } } if call["params"][0] == "bad"
+                else { "id" : call["id"], "result" : hex(10 ** 18) }
+                for call in payload]
+    monkeypatch.setattr(provider.fetchService, "post_json", post_json)
+
+    addresses = provider.get_addresses(["0x56Eddb7aa87536c09CCc2793473599fD21A8b17F", "bad", "0xEF43aA45d20752aCf6D65d0AA2642D303ECf2538"])
+
+    assert len(provider.fetchService.payloads) == 2
+    assert addresses[0] == Address(address = "0x56Eddb7aa87536c09CCc2793473599fD21A8b17F", balance = 1)
+    assert "invalid address" in addresses[1]["error"]
+    assert addresses[2]["balance"] == 1
+
+
+def test_rejected_batch_raised(provider: EthProvider, monkeypatch):
+    """Test whether a batch rejected with a single error object is raised as the JSON-RPC error"""
+    error = { "code" : -32005, "message" : "batch size too large" }
+    monkeypatch.setattr(provider.fetchService, "post_json", lambda endpoint, payload, headers = None: { "jsonrpc" : "2.0", "id" : None, "error" : error })
+
+    with pytest.raises(ValueError) as raised:
+        provider.batch_request("eth_getBlockByNumber", [["0x1", False]])
+    assert raised.value.args[0] == error
@@ -45,11 +45,13 @@ def block_number() -> str:
 
 def test_get_block_by_id(provider: ProviderInterface, block_number: str):
     """Test whether the provider returns the correct block data"""
-    assert provider.get_block_by_id(block_number) == {
+    assert provider.get_block_by_id(block_number).to_dict() == {
         "id": 1,
         "miner": "0x05a56E2D52c817161883f50c441c3228CFe54d9f",
         "difficulty": 17171480576,
-        "timestamp": 1438269988
+        "timestamp": 1438269988,
+        "hash": "0x88e96d4537bea4d9c05d12549907b32561d3bf31f45aae734cdc119f13406cb6",
+        "parentHash": "0xd4e56740f876aef8c010b86a40d5f56745a118d0906a34e69aec8c0db1cb8fa3"
     }
 
 
@@ -60,10 +62,11 @@ def tx_id() -> str:
 
 def test_get_transaction_by_id(provider: ProviderInterface, tx_id: str):
     """Test whether the provider returns the correct transaction data"""
-    assert provider.get_transaction_by_id(tx_id) == {
+    # The dict also holds the hash of the block
+    assert provider.get_transaction_by_id(tx_id).to_dict().items() >= {
         "id": "0x9a72dba1ff86ab68eb9e5074134b993d0eda143be6420bc73aab5c1f99b66c92",
         "from": "0xDFd5293D8e347dFe59E90eFd55b2956a1343963d",
         "to": "0xEC471BE76460b252a9Aec4e9CE3A94933DA79616",
         "value": 67131140000000000,
         "block": 14528351
-    }
\ No newline at end of file
+    }.items()
\ No newline at end of file
@@ -0,0 +1,81 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from multichain_explorer.src.models.provider_options import ProviderOptions
+from multichain_explorer.src.providers.luna.async_luna_provider import AsyncLunaProvider
+from multichain_explorer.src.providers.luna.luna_provider import LunaProvider
+
+
+class FakeAsyncLCDClient():
+    """Async Terra LCD API of a chain at height 100, where the even heights have 3 transactions and the odd ones none"""
+
+    def __init__(self):
+        self.calls = []
+        self.tendermint = SimpleNamespace(block_info = self.block_info)
+        self.tx = SimpleNamespace(search = self.search, tx_info = self.tx_info)
+
+    async def block_info(self, height = None):
+        self.calls.append(("block_info", height))
+        height = height or 100
+        return { "block_id" : { "hash" : f"hash-{height}" },
+                 "block" : { "header" : { "height" : str(height), "proposer_address" : "proposer", "time" : "2022-05-31T12:00:00Z",
+                                          "last_block_id" : { "hash" : f"hash-{height - 1}" } } } }
+
+    async def search(self, events, params):
+        height, offset, limit = events[0][1], int(params["pagination.offset"]), int(params["pagination.limit"])
+        self.calls.append(("search", height, offset))
+        total = 3 if height % 2 == 0 else 0
+        txs = [self._tx(f"tx-{height}-{index}", height) for index in range(offset, min(offset + limit, total))]
+        return { "txs" : txs, "pagination" : { "next_key" : None, "total" : str(total) } }
+
+    async def tx_info(self, tx_hash):
+        self.calls.append(("tx_info", tx_hash))
+        return self._tx(tx_hash, 90)
+
+    def _tx(self, tx_hash: str, height: int):
+        return SimpleNamespace(txhash = tx_hash, height = height, tx = SimpleNamespace(body = SimpleNamespace(messages = [None])),
+                               to_json = lambda: json.dumps({ "txhash" : tx_hash, "height" : str(height) }))
+
+
+@pytest.fixture
+def client(monkeypatch) -> FakeAsyncLCDClient:
+    """Setup the LCD client of the async Terra provider"""
+    client = FakeAsyncLCDClient()
+    monkeypatch.setattr(AsyncLunaProvider, "provider", property(lambda self: client))
+    return client
+
+
+def test_transactions_walk_back_the_heights(client: FakeAsyncLCDClient):
+    """Test whether the latest transactions are filled from the previous heights, a search per height"""
+    transactions = asyncio.run(AsyncLunaProvider().get_transactions(5))
+
+    assert [transaction["id"] for transaction in transactions] == ["tx-98-1", "tx-98-2", "tx-100-0", "tx-100-1", "tx-100-2"]
+    assert client.calls == [("block_info", None), ("search", 100, 0), ("search", 99, 0), ("search", 98, 0)]
+
+
+def test_transactions_searched_by_pages(client: FakeAsyncLCDClient, monkeypatch):
+    """Test whether the transactions of a height are searched a page at a time"""
+    monkeypatch.setattr(LunaProvider, "SEARCH_PAGE_SIZE", 2)
+
+    transactions = asyncio.run(AsyncLunaProvider()._get_block_transactions(100))
+
+    assert [transaction.txhash for transaction in transactions] == ["tx-100-0", "tx-100-1", "tx-100-2"]
+    assert client.calls == [("search", 100, 0), ("search", 100, 2)]
+
+
+def test_get_blocks_reuses_the_tip_block(client: FakeAsyncLCDClient):
+    """Test whether the tip block read for its height is not fetched again"""
+    blocks = asyncio.run(AsyncLunaProvider().get_blocks(3))
+
+    assert [block["id"] for block in blocks] == [100, 99, 98]
+    assert sorted(client.calls, key = str) == [("block_info", 98), ("block_info", 99), ("block_info", None)]
+
+
+def test_get_transaction_by_id(client: FakeAsyncLCDClient):
+    """Test whether a transaction is read by hash, with its raw data when requested"""
+    transaction = asyncio.run(AsyncLunaProvider().get_transaction_by_id("TX", ProviderOptions(raw = True)))
+
+    assert (transaction["id"], transaction["block"], transaction["transfers"]) == ("TX", 90, ())
+    assert transaction["rawData"] == { "txhash" : "TX", "height" : "90" }
@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+
+import pytest
+from multichain_explorer.src.providers.luna.luna_provider import LunaProvider
+
+
+class FakeLCDClient():
+    """Terra LCD API of a chain at height 100, where the even heights have 3 transactions and the odd ones none"""
+
+    def __init__(self):
+        self.calls = []
+        self.tendermint = SimpleNamespace(block_info = self.block_info)
+        self.tx = SimpleNamespace(search = self.search)
+
+    def block_info(self, height = None):
+        self.calls.append(("block_info", height))
+        height = height or 100
+        return { "block_id" : { "hash" : f"hash-{height}" },
+                 "block" : { "header" : { "height" : str(height), "proposer_address" : "proposer", "time" : "2022-05-31T12:00:00Z",
+                                          "last_block_id" : { "hash" : f"hash-{height - 1}" } } } }
+
+    def search(self, events, params):
+        height, offset, limit = events[0][1], int(params["pagination.offset"]), int(params["pagination.limit"])
+        self.calls.append(("search", height, offset))
+        total = 3 if height % 2 == 0 else 0
+        txs = [SimpleNamespace(txhash = f"tx-{height}-{index}", height = height, tx = SimpleNamespace(body = SimpleNamespace(messages = [None])))
+               for index in range(offset, min(offset + limit, total))]
+        return { "txs" : txs, "pagination" : { "next_key" : None, "total" : str(total) } }
+
+
+@pytest.fixture
+def client(monkeypatch) -> FakeLCDClient:
+    """Setup the LCD client of the Terra providers"""
+    client = FakeLCDClient()
+    monkeypatch.setattr(LunaProvider, "provider", property(lambda self: client))
+    return client
+
+
+def test_transactions_walk_back_the_heights(client: FakeLCDClient):
+    """Test whether the latest transactions are filled from the previous heights, a search per height"""
+    transactions = LunaProvider().get_transactions(5)
+
+    assert [transaction["id"] for transaction in transactions] == ["tx-98-1", "tx-98-2", "tx-100-0", "tx-100-1", "tx-100-2"]
+    assert client.calls == [("block_info", None), ("search", 100, 0), ("search", 99, 0), ("search", 98, 0)]
+
+
+def test_transactions_searched_by_pages(client: FakeLCDClient):
+    """Test whether the transactions of a height are searched a page at a time"""
+    provider = LunaProvider()
+    provider.SEARCH_PAGE_SIZE = 2
+
+    transactions = provider.get_block_transactions(100)
+
+    assert [transaction["id"] for transaction in transactions] == ["tx-100-0", "tx-100-1", "tx-100-2"]
+    assert client.calls == [("search", 100, 0), ("search", 100, 2)]
+
+
+def test_blocks_and_transactions_reused(client: FakeLCDClient):
+    """Test whether the tip block and the transaction lists already read are not asked for again"""
+    provider = LunaProvider()
+    provider.get_transactions(3)
+    client.calls.clear()
+
+    blocks = provider.get_blocks(3)
+    transaction = provider.get_transaction_by_id("latest")
+
+    assert [block["id"] for block in blocks] == [100, 99, 98]
+    assert transaction["id"] == "tx-100-2"
+    assert sorted(client.calls, key = str) == [("block_info", 98), ("block_info", 99), ("block_info", None), ("block_info", None)]
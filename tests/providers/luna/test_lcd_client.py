@@ -0,0 +1,66 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+from multichain_explorer.src.providers.luna import luna_provider
+from multichain_explorer.src.providers.luna.luna_provider import LunaProvider
+
+
+class FakeAsyncLCDClient():
+    """Async Terra LCD API of a chain at height 100, recording the instances and the loops running the calls"""
+
+    instances = []
+
+    def __init__(self, chain_id = None, url = None):
+        self.loop = asyncio.get_running_loop()
+        self.loops = set()
+        self.session = SimpleNamespace(closed = False, close = self.close_session)
+        self.tendermint = SimpleNamespace(block_info = self.block_info)
+        FakeAsyncLCDClient.instances.append(self)
+
+    async def block_info(self, height = None):
+        self.loops.add(asyncio.get_running_loop())
+        height = height or 100
+        return { "block_id" : { "hash" : f"hash-{height}" },
+                 "block" : { "header" : { "height" : str(height), "proposer_address" : "proposer", "time" : "2022-05-31T12:00:00Z",
+                                          "last_block_id" : { "hash" : f"hash-{height - 1}" } } } }
+
+    async def close_session(self):
+        self.session.closed = True
+
+
+@pytest.fixture
+def provider(monkeypatch) -> LunaProvider:
+    """Setup a LUNA provider creating fake async LCD clients"""
+    FakeAsyncLCDClient.instances = []
+    monkeypatch.setattr(luna_provider, "AsyncLCDClient", FakeAsyncLCDClient)
+    provider = LunaProvider()
+    yield provider
+    provider.close()
+
+
+def test_threads_share_one_client_and_loop(provider: LunaProvider):
+    """Test whether the concurrent block fetches run on a single client and event loop"""
+    blocks = provider.get_blocks(5)
+    provider.get_blocks(5)
+
+    assert [block["id"] for block in blocks] == [100, 99, 98, 97, 96]
+    assert len(FakeAsyncLCDClient.instances) == 1
+    client = FakeAsyncLCDClient.instances[0]
+    assert client.loops == { client.loop }
+
+
+def test_close_releases_the_client_and_loop(provider: LunaProvider):
+    """Test whether closing the provider closes the session and the loop, and a new client is started afterwards"""
+    provider.fetch_latest_block_number()
+    client = FakeAsyncLCDClient.instances[0]
+    threads = threading.active_count()
+
+    provider.close()
+
+    assert client.session.closed
+    assert client.loop.is_closed()
+    assert threading.active_count() == threads - 1
+    assert provider.fetch_latest_block_number() == 100
+    assert len(FakeAsyncLCDClient.instances) == 2
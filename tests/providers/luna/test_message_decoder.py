@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+
+import pytest
+from terra_sdk.core import Coins
+from terra_sdk.core.bank import MsgMultiSend, MsgSend, MultiSendInput, MultiSendOutput
+from terra_sdk.core.distribution import MsgWithdrawDelegatorReward
+from terra_sdk.core.wasm import MsgExecuteContract
+from multichain_explorer.src.models.provider_models.transfer import Transfer
+from multichain_explorer.src.providers.luna.luna_message_decoder import LunaMessageDecoder
+from multichain_explorer.src.providers.luna.luna_provider import LunaProvider
+
+
+@pytest.fixture
+def decoder() -> LunaMessageDecoder:
+    """Setup a message decoder with the default decoders"""
+    return LunaMessageDecoder()
+
+
+def make_tx(*messages) -> SimpleNamespace:
+    """Transaction info with the given messages, as built by the LCD client"""
+    return SimpleNamespace(txhash = "TXHASH", height = 100, tx = SimpleNamespace(body = SimpleNamespace(messages = list(messages))))
+
+
+def test_every_message_decoded(decoder: LunaMessageDecoder):
+    """Test whether the transfers of every message are decoded in order, skipping the messages that move no funds"""
+    transfers = decoder.decode([MsgWithdrawDelegatorReward("terra1delegator", "terravaloper1validator"),
+                                MsgSend("terra1a", "terra1b", Coins("1000uluna")),
+                                MsgExecuteContract("terra1a", "terra1contract", { "swap" : {} }, Coins("5uusd"))])
+
+    assert transfers == [Transfer("terra1a", "terra1b", "1000 (uluna)"),
+                         Transfer("terra1a", "terra1contract", "5 (uusd)")]
+
+
+def test_multi_send_outputs(decoder: LunaMessageDecoder):
+    """Test whether every output of a multi send is a transfer from its sender"""
+    transfers = decoder.decode([MsgMultiSend([MultiSendInput("terra1a", Coins("10uluna,2uusd"))],
+                                             [MultiSendOutput("terra1b", Coins("4uluna")), MultiSendOutput("terra1c", Coins("6uluna,2uusd"))])])
+
+    assert transfers == [Transfer("terra1a", "terra1b", "4 (uluna)"),
+                         Transfer("terra1a", "terra1c", "6 (uluna), 2 (uusd)")]
+
+
+def test_multi_send_several_senders(decoder: LunaMessageDecoder):
+    """Test whether the inputs and outputs of a multi send with several senders are transfers on their own"""
+    transfers = decoder.decode([MsgMultiSend([MultiSendInput("terra1a", Coins("1uluna")), MultiSendInput("terra1b", Coins("2uluna"))],
+                                             [MultiSendOutput("terra1c", Coins("3uluna"))])])
+
+    assert transfers == [Transfer("terra1a", "", "1 (uluna)"),
+                         Transfer("terra1b", "", "2 (uluna)"),
+                         Transfer("", "terra1c", "3 (uluna)")]
+
+
+def test_registered_decoder(decoder: LunaMessageDecoder):
+    """Test whether a registered decoder is used for its message class"""
+    decoder.register(MsgWithdrawDelegatorReward,
+                     lambda message: [Transfer(message.validator_address, message.delegator_address, "")])
+
+    transfers = decoder.decode([MsgWithdrawDelegatorReward("terra1delegator", "terravaloper1validator")])
+
+    assert transfers == [Transfer("terravaloper1validator", "terra1delegator", "")]
+
+
+def test_transaction_data_from_the_first_transfer():
+    """Test whether the transaction data keeps the first transfer as its from, to and value, and lists all of them"""
+    tx_data = LunaProvider().extractTxData(make_tx(MsgWithdrawDelegatorReward("terra1delegator", "terravaloper1validator"),
+                                                   MsgSend("terra1a", "terra1b", Coins("1uluna")),
+                                                   MsgSend("terra1b", "terra1c", Coins("2uluna"))))
+
+    assert (tx_data.id, tx_data.address_from, tx_data.address_to, tx_data.value, tx_data.block) == ("TXHASH", "terra1a", "terra1b", "1 (uluna)", 100)
+    assert len(tx_data.transfers) == 2
+
+
+def test_transaction_without_transfers():
+    """Test whether a transaction moving no funds has empty from, to and value"""
+    tx_data = LunaProvider().extractTxData(make_tx(MsgWithdrawDelegatorReward("terra1delegator", "terravaloper1validator")))
+
+    assert (tx_data.address_from, tx_data.address_to, tx_data.value, tx_data.transfers) == ("", "", "", ())
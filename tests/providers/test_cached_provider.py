@@ -0,0 +1,119 @@
+import pytest
+from hexbytes import HexBytes
+from web3.datastructures import AttributeDict
+from multichain_explorer.src.cache.sqlite_cache_backend import SqliteCacheBackend
+from multichain_explorer.src.models.blockchains import Blockchains
+from multichain_explorer.src.models.provider_options import ProviderOptions
+from multichain_explorer.src.models.provider_models.block import Block
+from multichain_explorer.src.models.provider_models.transaction import Transaction
+from multichain_explorer.src.providers.cached_provider import CachedProvider
+from multichain_explorer.src.providers.eth.eth_provider import EthProvider
+from multichain_explorer.src.validators.eth.eth_validator import EthValidator
+
+
+class FakeProvider():
+    """Serves blocks and transactions of a chain whose tip is at height 100"""
+
+    validator = EthValidator()
+
+    def __init__(self):
+        self.calls = []
+
+    def get_latest_block_number(self) -> int:
+        return 100
+
+    def get_block_by_id(self, block_id = 'latest', options = ProviderOptions()):
+        self.calls.append(("block", block_id))
+        return Block(id = int(block_id), miner = "-", difficulty = "-", timestamp = 0, hash = None, parent_hash = None)
+
+    def get_transaction_by_id(self, tx_id = 'latest', options = ProviderOptions()):
+        self.calls.append(("transaction", tx_id))
+        return Transaction(id = tx_id, address_from = "a", address_to = "b", value = 1, block = int(tx_id[-2:]))
+
+    def get_block_transactions(self, block_id, options = ProviderOptions()):
+        if block_id == 12:
+            raise ValueError("block not found")
+        return [Transaction(id = f"0x{block_id}{index}", address_from = "a", address_to = "b", value = 1, block = block_id)
+                for index in range(2)]
+
+
+@pytest.fixture
+def provider() -> CachedProvider:
+    """Setup a cached provider with a finality depth of 10 blocks"""
+    return CachedProvider(FakeProvider(), Blockchains.ETH, finality_depth = 10)
+
+
+def test_final_block_served_from_cache(provider: CachedProvider):
+    """Test whether a final block is fetched only once"""
+    assert provider.get_block_by_id("50") == provider.get_block_by_id("50")
+    assert provider.provider.calls == [("block", "50")]
+
+
+def test_tip_block_not_cached(provider: CachedProvider):
+    """Test whether a block within the finality depth is always fetched"""
+    provider.get_block_by_id("95")
+    provider.get_block_by_id("95")
+    assert provider.provider.calls == [("block", "95"), ("block", "95")]
+
+
+def test_raw_flag_is_part_of_the_key(provider: CachedProvider):
+    """Test whether raw and non raw data are cached separately"""
+    provider.get_block_by_id("50")
+    provider.get_block_by_id("50", ProviderOptions(raw = True))
+    assert len(provider.provider.calls) == 2
+
+
+@pytest.mark.parametrize("tx_id, expected_calls", [
+    ("0x50", 1),
+    ("0x99", 2),
+])
+def test_transaction_cached_when_final(provider: CachedProvider, tx_id: str, expected_calls: int):
+    """Test whether only the transactions of final blocks are cached"""
+    provider.get_transaction_by_id(tx_id)
+    provider.get_transaction_by_id(tx_id)
+    assert len(provider.provider.calls) == expected_calls
+
+
+def test_iter_blocks_in_order(provider: CachedProvider):
+    """Test whether iter_blocks yields the range in order, downwards when end < start"""
+    assert [block["id"] for block in provider.iter_blocks(10, 13)] == [10, 11, 12, 13]
+    assert [block["id"] for block in provider.iter_blocks(13, 11)] == [13, 12, 11]
+
+
+def test_iter_transactions_reports_failed_block(provider: CachedProvider):
+    """Test whether iter_transactions yields the blocks transactions in order, a failed block reported in its place"""
+    transactions = list(provider.iter_transactions(11, 13))
+
+    assert [transaction["id"] for transaction in transactions if "id" in transaction] == ["0x110", "0x111", "0x130", "0x131"]
+    assert transactions[2] == { "block" : 12, "error" : "block not found" }
+
+
+class FakeEth():
+    """Serves the web3 blocks and transactions of a chain whose tip is at height 100"""
+
+    block_number = 100
+
+    def get_block(self, block_id, full_transactions = False):
+        return AttributeDict({ "number" : int(block_id), "miner" : "0x" + "00" * 20, "difficulty" : 1, "timestamp" : 0,
+                               "hash" : HexBytes("11" * 32), "parentHash" : HexBytes("22" * 32) })
+
+    def get_transaction(self, tx_id):
+        return AttributeDict({ "hash" : HexBytes(tx_id), "from" : "a", "to" : "b", "value" : 1,
+                               "blockNumber" : 50, "blockHash" : HexBytes("11" * 32) })
+
+
+def test_raw_web3_data_cached(tmp_path, monkeypatch):
+    """Test whether the raw data of web3 blocks and transactions is stored by a pickling backend"""
+    eth_provider = EthProvider()
+    monkeypatch.setattr(eth_provider, "provider", AttributeDict({ "eth" : FakeEth() }))
+    backend = SqliteCacheBackend(str(tmp_path / "cache.db"))
+    provider = CachedProvider(eth_provider, Blockchains.ETH, backend = backend, finality_depth = 10)
+
+    raw = ProviderOptions(raw = True)
+    block = provider.get_block_by_id("50", raw)
+    transaction = provider.get_transaction_by_id("0x" + "33" * 32, raw)
+
+    assert provider.get_block_by_id("50", raw)["rawData"]["hash"] == block["rawData"]["hash"] == "0x" + "11" * 32
+    assert provider.get_transaction_by_id("0x" + "33" * 32, raw)["rawData"] == transaction["rawData"]
+    assert len(backend) == 2
+    backend.close()
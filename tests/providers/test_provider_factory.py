@@ -0,0 +1,31 @@
+import pytest
+from multichain_explorer.src.models.blockchains import Blockchains
+from multichain_explorer.src.providers.eth.eth_provider import EthProvider
+from multichain_explorer.src.providers.provider_factory import BlockchainProvider
+
+
+@pytest.fixture(autouse = True)
+def infura_url(monkeypatch):
+    """Setup the ETH provider settings and an empty provider pool"""
+    monkeypatch.setattr(EthProvider, "INFURA_URL", "http://localhost:8545")
+    yield
+    BlockchainProvider.close()
+
+
+def test_instance_is_pooled():
+    """Test whether the same instance is returned while the settings do not change"""
+    assert BlockchainProvider.get_instance(Blockchains.ETH) is BlockchainProvider.get_instance(Blockchains.ETH)
+
+
+def test_settings_change_creates_new_instance(monkeypatch):
+    """Test whether changing the provider settings replaces the pooled instance"""
+    instance = BlockchainProvider.get_instance(Blockchains.ETH)
+    monkeypatch.setattr(EthProvider, "INFURA_URL", "http://localhost:8546")
+
+    assert BlockchainProvider.get_instance(Blockchains.ETH) is not instance
+
+
+def test_reload_replaces_instance():
+    """Test whether reload creates a new instance with the same settings"""
+    instance = BlockchainProvider.get_instance(Blockchains.ETH)
+    assert BlockchainProvider.reload(Blockchains.ETH) is not instance
@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+from multichain_explorer.src.services.async_coinmarketcap_service import AsyncCoinMarketCapService
+from multichain_explorer.src.services.coinmarketcap_service import CoinMarketCapService
+
+
+class FakeAsyncFetchService():
+    """Returns a quote for every requested symbol and counts the calls"""
+
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.calls = []
+
+    async def fetch_json(self, endpoint: str, parameters, headers) -> dict:
+        self.calls.append(parameters['symbol'])
+        await asyncio.sleep(self.delay)
+        symbols = parameters['symbol'].split(",")
+        return { "data" : { symbol : { "name" : symbol.lower() } for symbol in symbols } }
+
+
+@pytest.fixture
+def service() -> AsyncCoinMarketCapService:
+    """Setup an async CoinMarketCap service backed by a fake fetch service and an empty cache"""
+    CoinMarketCapService._quotesCache.clear()
+    service = AsyncCoinMarketCapService()
+    service.fetchService = FakeAsyncFetchService(delay = 0.05)
+    return service
+
+
+def test_fetch_many_uses_a_single_call(service: AsyncCoinMarketCapService):
+    """Test whether all the chains are fetched in one request"""
+    quotes = asyncio.run(service.fetch_many(["BTC", "ETH"]))
+
+    assert quotes == { "BTC" : { "name" : "btc" }, "ETH" : { "name" : "eth" } }
+    assert service.fetchService.calls == ["ADA,ALGO,BTC,ETH,LUNA"]
+
+
+def test_fetch_quote_served_from_cache(service: AsyncCoinMarketCapService):
+    """Test whether the quotes prefetched for one chain serve the others, along with the sync service"""
+    asyncio.run(service.fetch_quote("ETH"))
+    asyncio.run(service.fetch_many(["BTC", "ALGO", "LUNA"]))
+
+    assert len(service.fetchService.calls) == 1
+    assert service.service.get_cached_quotes(["ADA"]) == { "ADA" : { "name" : "ada" } }
+
+
+def test_concurrent_callers_share_a_request(service: AsyncCoinMarketCapService):
+    """Test whether concurrent cache misses are de-duplicated into one request"""
+    async def fetch_all():
+        return await asyncio.gather(*[service.fetch_quote(symbol) for symbol in ["BTC", "ETH", "ADA", "ALGO", "LUNA"]])
+
+    assert [quote["name"] for quote in asyncio.run(fetch_all())] == ["btc", "eth", "ada", "algo", "luna"]
+    assert len(service.fetchService.calls) == 1
+
+
+def test_fetch_many_unknown_symbol(service: AsyncCoinMarketCapService):
+    """Test whether a symbol missing from the response raises a KeyError"""
+    async def fetch_json(endpoint, parameters, headers):
+        return { "data" : {} }
+    service.fetchService.fetch_json = fetch_json
+
+    with pytest.raises(KeyError):
+        asyncio.run(service.fetch_quote("ETH"))
+
+
+def test_services_share_a_request(service: AsyncCoinMarketCapService):
+    """Test whether the services of different providers missing the same quotes share one request"""
+    other = AsyncCoinMarketCapService()
+    other.fetchService = service.fetchService
+
+    async def fetch_all():
+        return await asyncio.gather(service.fetch_quote("BTC"), other.fetch_quote("ETH"))
+
+    assert [quote["name"] for quote in asyncio.run(fetch_all())] == ["btc", "eth"]
+    assert len(service.fetchService.calls) == 1
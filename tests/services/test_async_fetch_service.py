@@ -0,0 +1,106 @@
+import asyncio
+import json
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from multichain_explorer.src.services.async_fetch_service import AsyncFetchService
+from multichain_explorer.src.services.fetch_service import FetchService
+
+
+def create_app(calls: list) -> web.Application:
+    """Server echoing the requests, failing /unavailable once and answering 404 on /missing"""
+
+    async def echo(request: web.Request) -> web.Response:
+        calls.append(request.path)
+        body = await request.read()
+        return web.json_response({ "query" : dict(request.query), "body" : json.loads(body) if body else None })
+
+    async def unavailable(request: web.Request) -> web.Response:
+        calls.append(request.path)
+        if calls.count(request.path) == 1:
+            return web.Response(status = 503)
+        return web.json_response({ "attempt" : calls.count(request.path) })
+
+    async def missing(request: web.Request) -> web.Response:
+        calls.append(request.path)
+        return web.Response(status = 404)
+
+    app = web.Application()
+    app.router.add_route("*", "/echo", echo)
+    app.router.add_get("/unavailable", unavailable)
+    app.router.add_get("/missing", missing)
+    return app
+
+
+def serve(test):
+    """Run a test coroutine with a fresh fetch service and a local server, returning its result and the requested paths"""
+    calls = []
+
+    async def run():
+        service = AsyncFetchService()
+        async with TestServer(create_app(calls)) as server:
+            try:
+                return await test(service, str(server.make_url("")))
+            finally:
+                await service.close()
+
+    return asyncio.run(run()), calls
+
+
+@pytest.fixture(autouse = True)
+def no_backoff(monkeypatch):
+    """Retry at once"""
+    monkeypatch.setattr(FetchService, "BACKOFF_FACTOR", 0)
+
+
+def test_fetch_json():
+    """Test whether the JSON response is decoded and the parameters are sent"""
+    data, calls = serve(lambda service, url: service.fetch_json(f"{url}/echo", { "round" : "1" }))
+
+    assert data == { "query" : { "round" : "1" }, "body" : None }
+    assert calls == ["/echo"]
+
+
+def test_post_json():
+    """Test whether the payload is posted as JSON"""
+    data, _ = serve(lambda service, url: service.post_json(f"{url}/echo", [{ "id" : 1 }]))
+
+    assert data["body"] == [{ "id" : 1 }]
+
+
+def test_retries_unavailable_responses():
+    """Test whether a 5xx response is retried"""
+    data, calls = serve(lambda service, url: service.fetch_json(f"{url}/unavailable"))
+
+    assert data == { "attempt" : 2 }
+    assert calls == ["/unavailable", "/unavailable"]
+
+
+def test_raises_error_responses():
+    """Test whether a 4xx response is raised without retries"""
+    async def test(service: AsyncFetchService, url: str):
+        with pytest.raises(aiohttp.ClientResponseError) as err:
+            await service.fetch_json(f"{url}/missing")
+        return err.value.status
+
+    status, calls = serve(test)
+
+    assert status == 404
+    assert calls == ["/missing"]
+
+
+def test_session_per_event_loop():
+    """Test whether every event loop gets its own session, the ones of closed loops being dropped"""
+    service = AsyncFetchService()
+
+    async def get_session():
+        session = service.get_session()
+        assert service.get_session() is session
+        await session.close()
+
+    for _ in range(3):
+        asyncio.run(get_session())
+
+    assert len(service._sessions) == 1
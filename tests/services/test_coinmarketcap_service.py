@@ -0,0 +1,65 @@
+import threading
+import time
+
+import pytest
+from multichain_explorer.src.services.coinmarketcap_service import CoinMarketCapService
+
+
+class FakeFetchService():
+    """Returns a quote for every requested symbol and counts the calls"""
+
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.calls = []
+
+    def fetch_json(self, endpoint: str, parameters, headers) -> dict:
+        self.calls.append(parameters['symbol'])
+        time.sleep(self.delay)
+        symbols = parameters['symbol'].split(",")
+        return { "data" : { symbol : { "name" : symbol.lower() } for symbol in symbols } }
+
+
+@pytest.fixture
+def service() -> CoinMarketCapService:
+    """Setup a CoinMarketCap service backed by a fake fetch service and an empty cache"""
+    CoinMarketCapService._quotesCache.clear()
+    service = CoinMarketCapService()
+    service.fetchService = FakeFetchService(delay = 0.05)
+    return service
+
+
+def test_fetch_many_uses_a_single_call(service: CoinMarketCapService):
+    """Test whether all the chains are fetched in one request"""
+    quotes = service.fetch_many(["BTC", "ETH"])
+
+    assert quotes == { "BTC" : { "name" : "btc" }, "ETH" : { "name" : "eth" } }
+    assert service.fetchService.calls == ["ADA,ALGO,BTC,ETH,LUNA"]
+
+
+def test_fetch_quote_served_from_cache(service: CoinMarketCapService):
+    """Test whether the quotes prefetched for one chain serve the others"""
+    service.fetch_quote("ETH")
+    service.fetch_quote("ADA")
+    service.fetch_many(["BTC", "ALGO", "LUNA"])
+
+    assert len(service.fetchService.calls) == 1
+
+
+def test_concurrent_callers_share_a_request(service: CoinMarketCapService):
+    """Test whether concurrent cache misses are de-duplicated into one request"""
+    threads = [threading.Thread(target = service.fetch_quote, args = (symbol,))
+               for symbol in ["BTC", "ETH", "ADA", "ALGO", "LUNA"]]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(service.fetchService.calls) == 1
+
+
+def test_fetch_many_unknown_symbol(service: CoinMarketCapService):
+    """Test whether a symbol missing from the response raises a KeyError"""
+    service.fetchService.fetch_json = lambda endpoint, parameters, headers: { "data" : {} }
+
+    with pytest.raises(KeyError):
+        service.fetch_quote("ETH")
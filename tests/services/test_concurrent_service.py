@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from multichain_explorer.src.services.concurrent_service import ConcurrentService
+
+
+@pytest.fixture
+def service() -> ConcurrentService:
+    """Setup a concurrent service with 4 calls in flight"""
+    return ConcurrentService(max_concurrency = 4)
+
+
+def test_map_ordered_keeps_order(service: ConcurrentService):
+    """Test whether the results are returned in the order of the items, whatever the completion order"""
+    def slow_identity(item):
+        time.sleep(0.01 * (5 - item))
+        return item
+
+    assert service.map_ordered(slow_identity, range(5)) == [0, 1, 2, 3, 4]
+
+
+def test_map_ordered_reports_failures_in_place(service: ConcurrentService):
+    """Test whether a failed call is replaced by the on_error result without dropping the others"""
+    def fail_on_odd(item):
+        if item % 2:
+            raise ValueError(f"odd {item}")
+        return item
+
+    results = service.map_ordered(fail_on_odd,
+                                  range(4),
+                                  on_error = lambda item, err: { "id" : item, "error" : str(err) })
+
+    assert results == [0, { "id" : 1, "error" : "odd 1" }, 2, { "id" : 3, "error" : "odd 3" }]
+
+
+def test_map_ordered_raises_without_on_error(service: ConcurrentService):
+    """Test whether a failed call raises when no on_error handler is given"""
+    def fail(item):
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError):
+        service.map_ordered(fail, range(3))
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 3])
+def test_map_ordered_bounds_calls_in_flight(service: ConcurrentService, max_concurrency: int):
+    """Test whether no more than max_concurrency calls run at the same time"""
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+
+    def track(item):
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight -= 1
+        return item
+
+    service.map_ordered(track, range(10), max_concurrency = max_concurrency)
+
+    assert max_in_flight == max_concurrency
+
+
+def test_gather_ordered_keeps_order_and_reports_failures(service: ConcurrentService):
+    """Test whether coroutine results are ordered as the items and failures are reported in place"""
+    async def slow_fail_on_odd(item):
+        await asyncio.sleep(0.01 * (5 - item))
+        if item % 2:
+            raise ValueError(f"odd {item}")
+        return item
+
+    results = asyncio.run(service.gather_ordered(slow_fail_on_odd,
+                                                 range(4),
+                                                 on_error = lambda item, err: { "id" : item, "error" : str(err) }))
+
+    assert results == [0, { "id" : 1, "error" : "odd 1" }, 2, { "id" : 3, "error" : "odd 3" }]
+
+
+def test_iter_ordered_bounds_prefetch(service: ConcurrentService):
+    """Test whether no more than window items are fetched ahead of the consumer"""
+    lock = threading.Lock()
+    started = []
+
+    def track(item):
+        with lock:
+            started.append(item)
+        return item
+
+    results = service.iter_ordered(track, range(1000), window = 3)
+
+    assert next(results) == 0
+    time.sleep(0.05)
+    assert len(started) <= 4
+    assert list(results) == list(range(1, 1000))
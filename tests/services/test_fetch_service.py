@@ -0,0 +1,71 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from multichain_explorer.src.services.fetch_service import FetchService
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Answers JSON on /echo, an HTML 404 page on /missing and a 503 on /unavailable"""
+
+    def do_GET(self):
+        self.server.calls.append(self.path)
+        if self.path.startswith("/echo"):
+            self._answer(200, "application/json", json.dumps({ "path" : self.path }))
+        elif self.path == "/missing":
+            self._answer(404, "text/html", "<html><body>Not Found</body></html>")
+        else:
+            self._answer(503, "text/html", "<html><body>Service Unavailable</body></html>")
+
+    def _answer(self, status: int, content_type: str, body: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """Setup a local HTTP server recording the requested paths"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.calls = []
+    thread = threading.Thread(target = server.serve_forever, daemon = True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def service(monkeypatch) -> FetchService:
+    """Setup a fetch service retrying at once"""
+    monkeypatch.setattr(FetchService, "BACKOFF_FACTOR", 0)
+    service = FetchService()
+    yield service
+    service.close()
+
+
+def test_fetch_json(server, service: FetchService):
+    """Test whether the JSON response is decoded and the parameters are sent"""
+    url = f"http://127.0.0.1:{server.server_port}"
+
+    assert service.fetch_json(f"{url}/echo", { "round" : "1" }, {}) == { "path" : "/echo?round=1" }
+
+
+@pytest.mark.parametrize("path, status, calls", [
+    ("/missing", 404, 1),
+    ("/unavailable", 503, FetchService.MAX_RETRIES + 1),
+])
+def test_fetch_json_raises_error_responses(server, service: FetchService, path: str, status: int, calls: int):
+    """Test whether the error pages are raised as HTTPError, not decoded, once the retries are exhausted"""
+    with pytest.raises(requests.HTTPError) as error:
+        service.fetch_json(f"http://127.0.0.1:{server.server_port}{path}", None, {})
+
+    assert error.value.response.status_code == status
+    assert len(server.calls) == calls
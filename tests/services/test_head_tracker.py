@@ -0,0 +1,69 @@
+import time
+
+import pytest
+from multichain_explorer.src.models.blockchains import Blockchains
+from multichain_explorer.src.models.provider_options import ProviderOptions
+from multichain_explorer.src.services.head_tracker import HeadTracker
+
+
+class FakeProvider():
+    """Chain whose head moves forward on demand"""
+
+    headTracker = None
+
+    def __init__(self):
+        self.head = 100
+        self.head_reads = 0
+
+    def fetch_latest_block_number(self) -> int:
+        self.head_reads += 1
+        return self.head
+
+    def get_block_by_id(self, block_id = 'latest', options = ProviderOptions()):
+        return { "id" : block_id }
+
+
+@pytest.fixture
+def tracker():
+    """Setup a running head tracker polling every 10ms"""
+    tracker = HeadTracker(FakeProvider(), Blockchains.ETH, poll_interval = 0.01)
+    tracker.start()
+    yield tracker
+    tracker.stop()
+
+
+def test_latest_lookups_served_from_memory(tracker: HeadTracker):
+    """Test whether the latest block is read from the tracker, not from the chain"""
+    reads = tracker.provider.head_reads
+    for _ in range(100):
+        assert tracker.get_latest_block() == { "id" : 100 }
+    assert tracker.provider.head_reads - reads < 5
+    assert tracker.provider.headTracker is tracker
+
+
+def test_new_head_notifies_listeners(tracker: HeadTracker):
+    """Test whether a new head is picked up and sent to the listeners"""
+    heads = []
+    tracker.subscribe(lambda block_number, block: heads.append(block_number))
+    tracker.provider.head = 101
+    time.sleep(0.1)
+
+    assert tracker.get_latest_block_number() == 101
+    assert heads == [101]
+
+
+def test_stop_detaches_tracker(tracker: HeadTracker):
+    """Test whether the provider stops using a stopped tracker"""
+    tracker.stop()
+    assert tracker.provider.headTracker is None
+
+
+def test_failed_poll_logged(tracker: HeadTracker, caplog):
+    """Test whether a failed background poll is logged with its traceback, and polling goes on"""
+    def fetch_latest_block_number():
+        raise ConnectionError("node unreachable")
+    tracker.provider.fetch_latest_block_number = fetch_latest_block_number
+    time.sleep(0.05)
+
+    assert "Polling the ETH head failed" in caplog.text
+    assert any(record.exc_info is not None for record in caplog.records)
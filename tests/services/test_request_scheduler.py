@@ -0,0 +1,241 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from multichain_explorer.src.metrics.instrumentation import Instrumentation
+from multichain_explorer.src.metrics.prometheus_metrics_backend import PrometheusMetricsBackend
+from multichain_explorer.src.models.blockchains import Blockchains
+from multichain_explorer.src.models.request_priority import RequestPriority
+from multichain_explorer.src.services.concurrent_service import ConcurrentService
+from multichain_explorer.src.services.request_scheduler import RequestScheduler, ScheduledClient
+
+
+class ThrottledError(Exception):
+    """Error of a client answering 429, as requests HTTPError"""
+
+    def __init__(self, retry_after: str = None):
+        super().__init__("429 Too Many Requests")
+        self.status_code = 429
+        self.headers = { "Retry-After" : retry_after } if retry_after is not None else {}
+
+
+class FakeClient():
+    """Upstream client counting its calls"""
+
+    def __init__(self):
+        self.calls = []
+        self.indexer = None
+
+
+    def block(self, number: int) -> dict:
+        self.calls.append(number)
+        return { "number" : number }
+
+
+    @property
+    def block_number(self) -> int:
+        self.calls.append("block_number")
+        return 1
+
+
+@pytest.fixture
+def limits():
+    """Setup the scheduler limits of the tests, restored afterwards"""
+    limits = RequestScheduler.LIMITS
+    RequestScheduler.LIMITS = {}
+    yield RequestScheduler.LIMITS
+    RequestScheduler.LIMITS = limits
+
+
+def test_burst_then_rate():
+    """Test whether the burst is served at once and the following requests at the rate"""
+    scheduler = RequestScheduler("test", rate = 20, burst = 5)
+
+    start = time.monotonic()
+    for _ in range(5):
+        scheduler.acquire()
+    assert time.monotonic() - start < 0.05
+
+    for _ in range(4):
+        scheduler.acquire()
+    assert time.monotonic() - start == pytest.approx(0.2, abs = 0.08)
+
+
+def test_unlimited_upstream(limits: dict):
+    """Test whether upstreams without limits never wait"""
+    scheduler = RequestScheduler.get_scheduler("unlimited")
+
+    start = time.monotonic()
+    for _ in range(100):
+        scheduler.acquire()
+
+    assert time.monotonic() - start < 0.05
+
+
+def test_scheduler_recreated_on_new_limits(limits: dict):
+    """Test whether the shared scheduler of an upstream follows its LIMITS"""
+    limits["test"] = (10, 10)
+    scheduler = RequestScheduler.get_scheduler("test")
+    assert RequestScheduler.get_scheduler("test") is scheduler
+
+    limits["test"] = (5, 10)
+    assert RequestScheduler.get_scheduler("test").max_rate == 5
+
+
+def test_interactive_requests_go_first():
+    """Test whether the waiting interactive requests are served before the background ones"""
+    scheduler = RequestScheduler("test", rate = 20, burst = 1)
+    scheduler.acquire()
+    served = []
+
+    def request(name: str, priority: RequestPriority):
+        scheduler.acquire(priority)
+        served.append(name)
+
+    threads = [threading.Thread(target = request, args = (f"background-{i}", RequestPriority.background)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.01)
+    threads.append(threading.Thread(target = request, args = ("interactive", RequestPriority.interactive)))
+    threads[-1].start()
+    for thread in threads:
+        thread.join()
+
+    assert served[0] == "interactive"
+    assert sorted(served[1:]) == ["background-0", "background-1", "background-2"]
+
+
+def test_throttled_request_retried_after_retry_after():
+    """Test whether a 429 pauses the requests for its Retry-After, halves the rate and retries"""
+    scheduler = RequestScheduler("test", rate = 100, burst = 10)
+    answers = [ThrottledError(retry_after = "0.2"), "ok"]
+
+    def call():
+        answer = answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    start = time.monotonic()
+    assert scheduler.run(call) == "ok"
+    assert time.monotonic() - start >= 0.2
+    assert scheduler.rate < 100
+
+    for _ in range(100):
+        scheduler.succeeded()
+    assert scheduler.rate == 100
+
+
+def test_throttled_request_raised_after_max_retries():
+    """Test whether the 429 error is raised once the retries are exhausted"""
+    scheduler = RequestScheduler("test")
+    scheduler.MAX_RETRIES = 2
+    calls = []
+
+    def call():
+        calls.append(1)
+        raise ThrottledError(retry_after = "0")
+
+    with pytest.raises(ThrottledError):
+        scheduler.run(call)
+    assert len(calls) == 3
+
+
+def test_other_errors_not_retried():
+    """Test whether errors other than 429 are raised at once"""
+    scheduler = RequestScheduler("test")
+    calls = []
+
+    def call():
+        calls.append(1)
+        raise ValueError("not found")
+
+    with pytest.raises(ValueError):
+        scheduler.run(call)
+    assert len(calls) == 1
+
+
+def test_run_async_retries_throttled_requests():
+    """Test whether coroutine calls are retried on 429 as well"""
+    scheduler = RequestScheduler("test", rate = 100, burst = 1)
+    answers = [ThrottledError(retry_after = "0.05"), "ok"]
+
+    async def call():
+        answer = answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    assert asyncio.run(scheduler.run_async(call)) == "ok"
+
+
+def test_waiting_coroutines_hold_no_threads():
+    """Test whether coroutines waiting for a token sleep on the event loop, leaving the default executor free"""
+    scheduler = RequestScheduler("test", rate = 10, burst = 1)
+
+    async def wait_for_tokens():
+        waiters = [asyncio.ensure_future(scheduler.acquire_async()) for _ in range(50)]
+        await asyncio.sleep(0.01)
+        done = await asyncio.wait_for(asyncio.to_thread(lambda: "done"), 0.5)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions = True)
+        return done
+
+    assert asyncio.run(wait_for_tokens()) == "done"
+    assert scheduler._waiting == []
+
+
+def test_cancelled_coroutine_takes_no_token():
+    """Test whether a coroutine cancelled while waiting leaves the queue without taking a token"""
+    scheduler = RequestScheduler("test", rate = 10, burst = 1)
+    scheduler.acquire()
+
+    async def cancel_waiter():
+        waiter = asyncio.ensure_future(scheduler.acquire_async())
+        await asyncio.sleep(0.02)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions = True)
+        await asyncio.sleep(0.1)
+
+    asyncio.run(cancel_waiter())
+    assert scheduler._waiting == []
+    start = time.monotonic()
+    scheduler.acquire()
+    assert time.monotonic() - start < 0.05
+
+
+def test_priority_propagated_to_concurrent_calls():
+    """Test whether the calls run by the ConcurrentService keep the priority of the caller"""
+    with RequestScheduler.prioritize(RequestPriority.background):
+        priorities = ConcurrentService(max_concurrency = 4).map_ordered(lambda item: RequestScheduler.get_priority(), range(4))
+
+    assert priorities == [RequestPriority.background] * 4
+    assert RequestScheduler.get_priority() == RequestPriority.interactive
+
+
+def test_scheduled_client_takes_a_token_per_call(limits: dict):
+    """Test whether the client methods, properties and sub-clients go through the scheduler of their upstream"""
+    limits["test"] = (1, 2)
+    limits["test-indexer"] = (1, 1)
+    client = ScheduledClient(FakeClient(), "test")
+    client.indexer = ScheduledClient(FakeClient(), "test-indexer")
+
+    assert client.block(1) == { "number" : 1 }
+    assert client.block_number == 1
+    assert client.indexer.block(2) == { "number" : 2 }
+
+    assert RequestScheduler.get_scheduler("test")._tokens < 1
+    assert RequestScheduler.get_scheduler("test-indexer")._tokens < 1
+
+
+def test_scheduled_client_stacks_with_instrumentation(limits: dict):
+    """Test whether an instrumented scheduled client is both rate limited and recorded"""
+    limits["test"] = (1, 1)
+    backend = PrometheusMetricsBackend()
+    client = Instrumentation(backend, Blockchains.ETH).wrap_client(ScheduledClient(FakeClient(), "test"))
+
+    assert client.block(1) == { "number" : 1 }
+    assert RequestScheduler.get_scheduler("test")._tokens < 1
+    assert 'endpoint="block"' in backend.export()
@@ -0,0 +1,107 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+from multichain_explorer.src.models.provider_options import ProviderOptions
+from multichain_explorer.src.models.provider_models.block import Block
+from multichain_explorer.src.models.provider_models.transaction import Transaction
+from multichain_explorer.src.services.concurrent_service import ConcurrentService
+from multichain_explorer.src.services.rolling_window import RollingWindow
+
+
+class FakeChain():
+    """Chain of blocks holding two transactions each, whose tip can be replaced by a fork"""
+
+    headTracker = None
+    rollingWindow = None
+    concurrentService = ConcurrentService()
+
+    def __init__(self, head: int):
+        self.head = head
+        self.fork = "a"
+        self.fork_height = head + 1
+        self.block_calls = []
+
+    def _hash(self, height: int) -> str:
+        return f"{self.fork if height >= self.fork_height else 'a'}{height}"
+
+    def fetch_latest_block_number(self) -> int:
+        return self.head
+
+    def get_block_by_id(self, block_id = 'latest', options = ProviderOptions()):
+        self.block_calls.append(block_id)
+        return Block(id = block_id, miner = "-", difficulty = "-", timestamp = 0, hash = self._hash(block_id), parent_hash = self._hash(block_id - 1))
+
+    def get_block_transactions(self, block_id, options = ProviderOptions()):
+        return [Transaction(id = f"{self._hash(block_id)}-{i}", address_from = "a", address_to = "b", value = 1, block = block_id) for i in range(2)]
+
+
+@pytest.fixture
+def window() -> RollingWindow:
+    """Setup a window of 5 blocks and 4 transactions over a chain at height 100"""
+    window = RollingWindow(FakeChain(100), size = 5, max_transactions = 4)
+    window.start()
+    return window
+
+
+def test_new_head_fetches_missing_heights_only(window: RollingWindow):
+    """Test whether only the new blocks are fetched once the window is filled"""
+    assert [block["id"] for block in window.get_blocks(5)] == [100, 99, 98, 97, 96]
+    window.provider.block_calls.clear()
+    window.provider.head = 102
+
+    assert [block["id"] for block in window.get_blocks(3)] == [102, 101, 100]
+    assert sorted(window.provider.block_calls) == [101, 102]
+    assert [transaction["id"] for transaction in window.get_transactions(4)] == ["a101-0", "a101-1", "a102-0", "a102-1"]
+
+
+def test_reorg_evicts_replaced_blocks(window: RollingWindow):
+    """Test whether blocks replaced by a fork are detected by parent hash and fetched again"""
+    window.get_blocks(5)
+    window.provider.fork = "b"
+    window.provider.fork_height = 99
+    window.provider.head = 101
+
+    assert [block["hash"] for block in window.get_blocks(5)] == ["b101", "b100", "b99", "a98", "a97"]
+    assert [transaction["id"] for transaction in window.get_transactions(2)] == ["b101-0", "b101-1"]
+
+
+def test_request_larger_than_window(window: RollingWindow):
+    """Test whether requests that do not fit in the window are left to the provider"""
+    assert window.get_blocks(6) is None
+    assert window.get_transactions(5) is None
+    assert window.get_blocks(2, ProviderOptions(raw = True)) is None
+
+
+def test_failed_update_logged(window: RollingWindow, caplog):
+    """Test whether a failed update is logged and the calls are left to the provider"""
+    def fetch_latest_block_number():
+        raise ConnectionError("node unreachable")
+    window.provider.fetch_latest_block_number = fetch_latest_block_number
+
+    assert window.get_blocks(2) is None
+    assert "Updating the rolling window failed" in caplog.text
+
+
+def test_readers_not_blocked_by_update(window: RollingWindow):
+    """Test whether the window is read while an update waits for the upstream, and the update swapped in afterwards"""
+    window.get_blocks(5)
+    # Kept up to date by a head tracker, the readers do not update the window
+    window.provider.headTracker = SimpleNamespace()
+    fetching, release = threading.Event(), threading.Event()
+    get_block_by_id = window.provider.get_block_by_id
+    def slow_get_block_by_id(block_id, options = ProviderOptions()):
+        fetching.set()
+        release.wait()
+        return get_block_by_id(block_id, options)
+    window.provider.get_block_by_id = slow_get_block_by_id
+
+    update = threading.Thread(target = window.update, args = (101,))
+    update.start()
+    fetching.wait()
+    assert [block["id"] for block in window.get_blocks(2)] == [100, 99]
+
+    release.set()
+    update.join()
+    assert [block["id"] for block in window.get_blocks(2)] == [101, 100]
+    assert [transaction["id"] for transaction in window.get_transactions(4)] == ["a100-0", "a100-1", "a101-0", "a101-1"]
@@ -0,0 +1,44 @@
+import pytest
+from benchmarks.run_benchmarks import FakeUpstreams, OPERATIONS, percentile, run_benchmarks
+from multichain_explorer.src.models.blockchains import Blockchains
+from multichain_explorer.src.providers.provider_factory import BlockchainProvider
+
+
+@pytest.fixture
+def upstreams() -> FakeUpstreams:
+    """Setup the recorded backends of every provider, without latency"""
+    with FakeUpstreams(latency = 0, txs_per_block = 3) as upstreams:
+        yield upstreams
+
+
+@pytest.mark.parametrize("blockchain", Blockchains.get_available_blockchains())
+def test_providers_run_offline(upstreams: FakeUpstreams, blockchain: Blockchains):
+    """Test whether every provider is fully served by the recorded backends"""
+    provider = BlockchainProvider.get_instance(blockchain)
+
+    blocks = provider.get_blocks(3)
+    transactions = provider.get_transactions(3)
+
+    assert len(blocks) == 3
+    assert all("error" not in block for block in blocks)
+    assert blocks[0]["parentHash"] is not None
+    assert len(transactions) == 3
+    assert provider.get_summary()["price"] > 0
+    assert upstreams.get_requests() > 0
+
+
+def test_run_benchmarks_reports_every_operation():
+    """Test whether every operation is measured at every concurrency level without errors"""
+    results = run_benchmarks(blockchains = [Blockchains.ETH], concurrency = [1, 2], requests = 3, latency = 0,
+                             num_blocks = 2, num_tx = 2, txs_per_block = 3)
+
+    assert [(result["operation"], result["concurrency"]) for result in results] == \
+           [(operation, concurrency) for operation in OPERATIONS for concurrency in (1, 2)]
+    assert all(result["errors"] == 0 for result in results)
+    assert all(result["p50"] <= result["p99"] for result in results)
+
+
+@pytest.mark.parametrize("percent, expected", [(50, 5), (99, 10), (0, 1)])
+def test_percentile(percent: float, expected: int):
+    """Test the nearest rank percentiles"""
+    assert percentile(list(range(10, 0, -1)), percent) == expected
@@ -0,0 +1,164 @@
+import time
+
+import pytest
+import requests
+from multichain_explorer.src.models.blockchains import Blockchains
+from multichain_explorer.src.multichain_explorer import MultichainExplorer
+from multichain_explorer.src.providers.not_found_error import NotFoundError
+
+
+class FakeProvider():
+    """Answers every query after a delay, or fails them all when broken"""
+
+    def __init__(self, delay: float = 0, broken: bool = False):
+        self.delay = delay
+        self.broken = broken
+
+    def _answer(self, data):
+        time.sleep(self.delay)
+        if self.broken:
+            raise ConnectionError("upstream down")
+        return data
+
+    def get_summary(self):
+        return self._answer({ "name" : "fake" })
+
+    def get_blocks(self, num_blocks, options):
+        return self._answer(list(range(num_blocks)))
+
+    def get_transactions(self, num_tx, options):
+        return self._answer(list(range(num_tx)))
+
+
+@pytest.fixture
+def explorer() -> MultichainExplorer:
+    """Setup an explorer where ETH is healthy, BTC is down and ADA is slower than the deadline"""
+    providers = {
+        Blockchains.ETH : FakeProvider(delay = 0.05),
+        Blockchains.BTC : FakeProvider(broken = True),
+        Blockchains.ADA : FakeProvider(delay = 1)
+    }
+    return MultichainExplorer(list(providers), providers.get, deadline = 0.3)
+
+
+def test_overview_runs_queries_in_parallel(explorer: MultichainExplorer):
+    """Test whether the overview takes as long as the deadline, not the sum of the calls"""
+    start = time.perf_counter()
+    overview = explorer.overview(num_blocks = 2, num_tx = 3)
+
+    assert time.perf_counter() - start < 0.6
+    assert overview["ETH"]["summary"] == { "name" : "fake" }
+    assert overview["ETH"]["blocks"] == [0, 1]
+    assert overview["ETH"]["transactions"] == [0, 1, 2]
+    assert overview["ETH"]["errors"] == {}
+    assert set(overview["ETH"]["timings"]) == { "summary", "blocks", "transactions" }
+
+
+def test_overview_reports_errors_per_chain(explorer: MultichainExplorer):
+    """Test whether failed and late chains are reported without hiding the others"""
+    overview = explorer.overview()
+
+    assert overview["BTC"]["blocks"] is None
+    assert overview["BTC"]["errors"]["blocks"] == "upstream down"
+    assert overview["ADA"]["summary"] is None
+    assert "Deadline" in overview["ADA"]["errors"]["summary"]
+    assert overview["ADA"]["timings"] == {}
+
+
+class FakeSearchProvider():
+    """Finds the transactions of its own chain, misses everything else"""
+
+    def __init__(self, transactions: dict, delay: float = 0):
+        self.transactions = transactions
+        self.delay = delay
+        self.calls = 0
+
+    def get_transaction_by_id(self, tx_id = 'latest', options = None):
+        self.calls += 1
+        time.sleep(self.delay)
+        if tx_id not in self.transactions:
+            raise NotFoundError("transaction not found")
+        return self.transactions[tx_id]
+
+
+TX_ID = "1c97dc954f0825ae93a92e0b4808b7304e1fd4d12f712e80fe247566e269e90a"
+
+
+@pytest.fixture
+def search_explorer() -> MultichainExplorer:
+    """Setup an explorer where the transaction is found on BTC and LUNA, LUNA being slower"""
+    providers = {
+        Blockchains.BTC : FakeSearchProvider({ TX_ID : { "id" : TX_ID, "chain" : "BTC" } }, delay = 0.01),
+        Blockchains.ADA : FakeSearchProvider({}),
+        Blockchains.LUNA : FakeSearchProvider({ TX_ID : { "id" : TX_ID, "chain" : "LUNA" } }, delay = 0.2)
+    }
+    return MultichainExplorer(list(providers), providers.get)
+
+
+def test_search_returns_first_hit(search_explorer: MultichainExplorer):
+    """Test whether the first hit is returned without waiting for the slower chains"""
+    start = time.perf_counter()
+    hits = search_explorer.search(TX_ID)
+
+    assert time.perf_counter() - start < 0.15
+    assert hits == [{ "blockchain" : "BTC", "type" : "transaction", "data" : { "id" : TX_ID, "chain" : "BTC" } }]
+
+
+def test_search_returns_all_hits(search_explorer: MultichainExplorer):
+    """Test whether every hit is returned in the order of the chains"""
+    hits = search_explorer.search(TX_ID, all_hits = True)
+
+    assert [hit["blockchain"] for hit in hits] == ["BTC", "LUNA"]
+
+
+def test_search_caches_misses(search_explorer: MultichainExplorer):
+    """Test whether a chain that found nothing is not looked up again"""
+    search_explorer.search(TX_ID, all_hits = True)
+    search_explorer.search(TX_ID, all_hits = True)
+
+    assert search_explorer.provider_factory(Blockchains.ADA).calls == 1
+    assert search_explorer.provider_factory(Blockchains.BTC).calls == 2
+
+
+def test_search_unknown_text(search_explorer: MultichainExplorer):
+    """Test whether a text matching no signature returns no hits"""
+    assert search_explorer.search("not a resource") == []
+
+
+class FailingSearchProvider():
+    """Fails every lookup with a connection error"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_transaction_by_id(self, tx_id = 'latest', options = None):
+        self.calls += 1
+        raise requests.exceptions.ConnectionError("connection reset")
+
+
+def test_search_does_not_cache_failures():
+    """Test whether a chain whose lookup failed is looked up again on the next search"""
+    provider = FailingSearchProvider()
+    explorer = MultichainExplorer([Blockchains.BTC], lambda blockchain: provider)
+
+    assert explorer.search(TX_ID) == []
+    assert explorer.search(TX_ID) == []
+    assert provider.calls == 2
+
+
+class RateLimitedSearchProvider(FailingSearchProvider):
+    """Fails every lookup with the ValueError web3 raises for a JSON-RPC error"""
+
+    def get_transaction_by_id(self, tx_id = 'latest', options = None):
+        self.calls += 1
+        raise ValueError({ "code" : -32005, "message" : "daily request count exceeded, request rate limited" })
+
+
+def test_search_does_not_cache_rpc_errors():
+    """Test whether a JSON-RPC error is not taken for a resource that does not exist"""
+    provider = RateLimitedSearchProvider()
+    explorer = MultichainExplorer([Blockchains.ETH], lambda blockchain: provider)
+
+    assert explorer.search("0x" + TX_ID) == []
+    assert explorer.search("0x" + TX_ID) == []
+    assert provider.calls == 2
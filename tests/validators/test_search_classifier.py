@@ -0,0 +1,52 @@
+import re
+
+import pytest
+from multichain_explorer.src.models.blockchains import Blockchains
+from multichain_explorer.src.models.resource_types import Resource
+from multichain_explorer.src.validators.btc.btc_validator import BtcValidator
+from multichain_explorer.src.validators.search_classifier import SearchClassifier
+from multichain_explorer.src.validators.validator import ValidatorInterface
+
+
+@pytest.fixture(scope = "module")
+def classifier() -> SearchClassifier:
+    """Setup a classifier for all the chains"""
+    return SearchClassifier()
+
+
+@pytest.mark.parametrize("text, expected_candidates", [
+    ("14534022", [(blockchain, Resource.block) for blockchain in Blockchains]),
+    ("0x56Eddb7aa87536c09CCc2793473599fD21A8b17F", [(Blockchains.ETH, Resource.address)]),
+    ("0x1c97dc954f0825ae93a92e0b4808b7304e1fd4d12f712e80fe247566e269e90a", [(Blockchains.ETH, Resource.transaction)]),
+    ("1c97dc954f0825ae93a92e0b4808b7304e1fd4d12f712e80fe247566e269e90a", [(Blockchains.BTC, Resource.transaction),
+                                                                          (Blockchains.ADA, Resource.transaction),
+                                                                          (Blockchains.LUNA, Resource.transaction)]),
+    ("1A1zP1eP5QGefi2DMPTfTL5SLmv7DivfNa", [(Blockchains.BTC, Resource.address)]),
+    ("bc1qar0srrr7xfkvy5l643lydnw9re59gtzzwf5mdq", [(Blockchains.BTC, Resource.address)]),
+    ("terra1dcegyrekltswvyy0xy69ydgxn9x8x32zdtapd8", [(Blockchains.LUNA, Resource.address)]),
+    ("VCMJKWOY5P5P7SKMZFFOCEROPJCZOTIJMNIYNUCKH7LRO45JMJP6UYBIJA", [(Blockchains.ALGO, Resource.address)]),
+    (" 123 ", [(blockchain, Resource.block) for blockchain in Blockchains]),
+    ("", []),
+    ("0x123", []),
+    ("not a resource", [])
+])
+def test_classify(classifier: SearchClassifier, text: str, expected_candidates: list):
+    """Test whether the classifier finds every chain and resource a text could be"""
+    assert classifier.classify(text) == expected_candidates
+
+
+
+class NumericTransactionValidator(BtcValidator):
+    """Validator of a chain whose transaction ids are 8 digit numbers, without length and prefix metadata"""
+
+    transactionRegex = re.compile(r"^[0-9]{8}$")
+    transactionLength = ValidatorInterface.transactionLength
+
+
+def test_classify_in_validators_order():
+    """Test whether the candidates follow the validators order, and the validators without metadata are classified"""
+    classifier = SearchClassifier({ Blockchains.ETH : NumericTransactionValidator(), Blockchains.BTC : BtcValidator() })
+
+    assert classifier.classify("12345678") == [(Blockchains.ETH, Resource.block), (Blockchains.ETH, Resource.transaction),
+                                               (Blockchains.BTC, Resource.block)]
+    assert classifier.classify("123") == [(Blockchains.ETH, Resource.block), (Blockchains.BTC, Resource.block)]